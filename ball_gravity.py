@@ -1,17 +1,206 @@
 from abc import abstractmethod
+from collections import deque
 from copy import deepcopy
+import argparse
+import json
 import math
 import random
+from time import perf_counter
 from tkinter import ttk, Tk
 from typing import overload 
-from vect2d import Vect2D
+from vect2d import Vect2D, Vect2DView
+from collisions import CollisionDetector
 from PIL import Image, ImageTk, ImageDraw
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 # Mathématique:
     # rad * 180/PI = degrés
     # degré * PI/180 = rad 
     
 
+SOFTENING = 100 ** 2
+"""Terme d'adoucissement ajouté au carré de la distance dans l'attraction entre deux balles"""
+
+GRAVITY_MODES = ("exact", "barnes-hut")
+"""Les calculs de l'attraction entre balles : somme exacte sur toutes les paires, ou arbre de Barnes–Hut"""
+
+
+class GravityTree():
+    """Arbre de Barnes–Hut des balles d'un tick : chaque noeud couvre un carré et garde la masse totale et le centre
+    de masse des balles qu'il contient. pull() additionne l'attraction des balles proches une à une et celle des
+    groupes éloignés (taille du noeud / distance < theta) comme celle d'une seule balle au centre de masse, ce qui
+    ramène le calcul de tout le champ de O(N²) à O(N log N). theta = 0 redonne la somme exacte.
+    Les feuilles copient la masse et la position des balles à la construction, comme les centres de masse des
+    noeuds : Ball.tick déplace les balles une à une pendant le tick, et pull() ne mélange pas deux instants.
+    pull_all() fait le même parcours pour un tableau de positions, niveau par niveau, en passes NumPy.
+
+    >>> balls = [Ball(radius=5, density=10, position=Vect2D(x, y), speed=Vect2D(0, 0)) for x, y in ((0, 0), (300, 0), (310, 10), (320, 0))]
+    >>> tree = GravityTree(balls)
+    >>> exact = balls[0].pull_of(balls)
+    >>> round(tree.pull(balls[0].position, theta=0).x, 6) == round(exact.x, 6)
+    True
+    >>> abs(tree.pull(balls[0].position, theta=0.5).x - exact.x) / exact.x < 0.01
+    True
+    >>> balls[1].position = Vect2D(100, 0)
+    >>> round(tree.pull(balls[0].position, theta=0).x, 6) == round(exact.x, 6)
+    True
+    >>> positions = np.array([[0, 0], [300, 0], [50, 80]])
+    >>> pulls = [tree.pull(Vect2D(x, y), theta=0.5).as_tuple for x, y in positions.tolist()]
+    >>> np.allclose(tree.pull_all(positions, theta=0.5), pulls, rtol=1e-12, atol=0)
+    True
+    """
+    class __Node():
+        __slots__ = ('x_min', 'y_min', 'size', 'depth', 'masse', 'center_x', 'center_y', 'children', 'balls')
+
+        def __init__(self, x_min, y_min, size, depth):
+            self.x_min, self.y_min, self.size = x_min, y_min, size
+            self.depth = depth
+            self.masse = 0.0
+            self.center_x = 0.0
+            self.center_y = 0.0
+            self.children = None
+            self.balls = []
+
+        def contains(self, x, y):
+            return self.x_min <= x <= self.x_min + self.size and self.y_min <= y <= self.y_min + self.size
+
+        def child_for(self, x, y):
+            half = self.size / 2
+            return self.children[(2 if y >= self.y_min + half else 0) + (1 if x >= self.x_min + half else 0)]
+
+    def __init__(self, balls, max_depth=24):
+        self.__max_depth = max_depth
+        self.__root = None
+        self.__arrays = None
+        if balls:
+            x_min = min(ball.position.x for ball in balls)
+            y_min = min(ball.position.y for ball in balls)
+            size = max(max(ball.position.x for ball in balls) - x_min, max(ball.position.y for ball in balls) - y_min, 1.0)
+            self.__root = GravityTree.__Node(x_min, y_min, size, 0)
+            for ball in balls:
+                self.__insert((ball.masse, ball.position.x, ball.position.y))
+            self.__summarize(self.__root)
+
+    def __insert(self, body):
+        _, x, y = body
+        node = self.__root
+        while node.children:
+            node = node.child_for(x, y)
+        node.balls.append(body)
+        while len(node.balls) > 1 and node.depth < self.__max_depth:
+            half = node.size / 2
+            depth = node.depth + 1
+            node.children = [GravityTree.__Node(node.x_min, node.y_min, half, depth),
+                             GravityTree.__Node(node.x_min + half, node.y_min, half, depth),
+                             GravityTree.__Node(node.x_min, node.y_min + half, half, depth),
+                             GravityTree.__Node(node.x_min + half, node.y_min + half, half, depth)]
+            balls, node.balls = node.balls, []
+            for other in balls:
+                node.child_for(other[1], other[2]).balls.append(other)
+            node = node.child_for(x, y)
+
+    def __summarize(self, node):
+        if node.children:
+            for child in node.children:
+                self.__summarize(child)
+            parts = [(child.masse, child.center_x, child.center_y) for child in node.children]
+        else:
+            parts = node.balls
+        node.masse = sum(masse for masse, _, _ in parts)
+        if node.masse:
+            node.center_x = sum(masse * x for masse, x, _ in parts) / node.masse
+            node.center_y = sum(masse * y for masse, _, y in parts) / node.masse
+
+    def pull(self, position:Vect2D, theta=0.5) -> Vect2D:
+        """Retourne l'accélération que toutes les balles de l'arbre donnent à une position"""
+        x, y = position.x, position.y
+        pull_x = pull_y = 0.0
+        theta_squared = theta * theta
+        stack = [self.__root] if self.__root is not None else []
+        while stack:
+            node = stack.pop()
+            if not node.masse:
+                continue
+            if node.children is None:
+                for masse, ball_x, ball_y in node.balls:
+                    dx = ball_x - x
+                    dy = ball_y - y
+                    factor = masse / (dx * dx + dy * dy + SOFTENING) ** 1.5
+                    pull_x += dx * factor
+                    pull_y += dy * factor
+                continue
+            dx = node.center_x - x
+            dy = node.center_y - y
+            distance_squared = dx * dx + dy * dy
+            if node.size * node.size < theta_squared * distance_squared and not node.contains(x, y):
+                factor = node.masse / (distance_squared + SOFTENING) ** 1.5
+                pull_x += dx * factor
+                pull_y += dy * factor
+            else:
+                stack.extend(node.children)
+        return Vect2D(pull_x, pull_y)
+
+    def pull_all(self, positions, theta=0.5):
+        """Retourne le tableau (N, 2) des accélérations que l'arbre donne à un tableau (N, 2) de positions"""
+        positions = np.asarray(positions, dtype=float)
+        count = len(positions)
+        pulls = np.zeros((count, 2))
+        if self.__root is None or not count:
+            return pulls
+        masse, center, x_min, y_min, size, first_child, ball_start, ball_stop, balls = self.__flatten()
+        queries = np.arange(count)
+        nodes = np.zeros(count, dtype=int)
+        while len(queries):
+            keep = masse[nodes] != 0
+            queries, nodes = queries[keep], nodes[keep]
+            x, y = positions[queries, 0], positions[queries, 1]
+            leaf = first_child[nodes] < 0
+            delta = center[nodes] - positions[queries]
+            distance_squared = (delta ** 2).sum(axis=1)
+            inside = (x_min[nodes] <= x) & (x <= x_min[nodes] + size[nodes]) & (y_min[nodes] <= y) & (y <= y_min[nodes] + size[nodes])
+            far = ~leaf & (size[nodes] ** 2 < theta * theta * distance_squared) & ~inside
+            self.__accumulate(pulls, queries[far], delta[far], masse[nodes[far]] / np.power(distance_squared[far] + SOFTENING, 1.5))
+            leaf_queries, leaf_nodes = queries[leaf], nodes[leaf]
+            sizes = ball_stop[leaf_nodes] - ball_start[leaf_nodes]
+            rows = np.repeat(ball_start[leaf_nodes] - np.cumsum(sizes) + sizes, sizes) + np.arange(sizes.sum())
+            leaf_queries = np.repeat(leaf_queries, sizes)
+            delta = balls[rows, 1:] - positions[leaf_queries]
+            self.__accumulate(pulls, leaf_queries, delta, balls[rows, 0] / np.power((delta ** 2).sum(axis=1) + SOFTENING, 1.5))
+            opened = ~leaf & ~far
+            queries = np.repeat(queries[opened], 4)
+            nodes = (first_child[nodes[opened], None] + np.arange(4)).reshape(-1)
+        return pulls
+
+    @staticmethod
+    def __accumulate(pulls, queries, delta, factor):
+        for axis in (0, 1):
+            pulls[:, axis] += np.bincount(queries, weights=delta[:, axis] * factor, minlength=len(pulls))
+
+    def __flatten(self):
+        """Retourne l'arbre en tableaux, noeuds en largeur d'abord (les quatre enfants d'un noeud se suivent); construit une seule fois"""
+        if self.__arrays is None:
+            nodes = [self.__root]
+            first_child = []
+            for node in nodes:
+                first_child.append(len(nodes) if node.children else -1)
+                if node.children:
+                    nodes.extend(node.children)
+            ball_stop = np.cumsum([len(node.balls) for node in nodes])
+            self.__arrays = (np.array([node.masse for node in nodes]),
+                             np.array([(node.center_x, node.center_y) for node in nodes]),
+                             np.array([node.x_min for node in nodes]),
+                             np.array([node.y_min for node in nodes]),
+                             np.array([node.size for node in nodes]),
+                             np.array(first_child),
+                             ball_stop - [len(node.balls) for node in nodes],
+                             ball_stop,
+                             np.array([body for node in nodes for body in node.balls], dtype=float).reshape(-1, 3))
+        return self.__arrays
+
+
 class Updatable():
 
     @abstractmethod
@@ -61,22 +250,60 @@ class GravityMagnet(Gravitational, Updatable):
         return self.masse * self.__direction
 
 class Trail(Updatable):
-    def __init__(self, length=15):
+    """Traînées de toutes les balles d'un Game dans un tampon circulaire préalloué de forme (balles, longueur, 2).
+    Chaque mise à jour écrit la position de toutes les balles dans la colonne du curseur puis avance le curseur :
+    ni pop(0) ni Vect2D par point, et une longueur de centaines de points ne coûte rien de plus par tick.
+    draw() dessine tous les points d'une balle en un seul appel à draw.point.
+    Sans numpy, chaque balle garde ses points dans une deque(maxlen=length), qui oublie d'elle-même les plus anciens.
+
+    >>> trail = Trail(2, length=3)
+    >>> for step in range(4):
+    ...     trail.update_trail([(step, 0), (step, 10)])
+    >>> trail.points(0).tolist()
+    [[1.0, 0.0], [2.0, 0.0], [3.0, 0.0]]
+    >>> trail.points(1)[-1].tolist()
+    [3.0, 10.0]
+    """
+    def __init__(self, count, length=15):
         self.__length = length
-        self.__points = ([])
-        
-    def tick(self, ball):
-        self.update_trail(ball)
-        
-    def update_trail(self, ball):
-        if len(self.__points) == self.__length:
-            self.__points.pop(0)
-        
-        self.__points.append(Vect2D(ball.position.x, ball.position.y))
+        self.__points = np.zeros((count, length, 2)) if np is not None else [deque(maxlen=length) for _ in range(count)]
+        self.__cursor = 0
+        self.__count = 0
+
+    def tick(self, positions):
+        self.update_trail(positions)
+
+    def update_trail(self, positions):
+        """Ajoute la position de chaque balle, un tableau (balles, 2), en écrasant les points les plus anciens"""
+        if np is None:
+            for points, position in zip(self.__points, positions):
+                points.append((position[0], position[1]))
+        else:
+            self.__points[:, self.__cursor] = positions
+            self.__cursor = (self.__cursor + 1) % self.__length
+        self.__count = min(self.__count + 1, self.__length)
+
+    def points(self, row):
+        """Retourne les points de la traînée d'une balle, du plus ancien au plus récent"""
+        if np is None:
+            return list(self.__points[row])
+        if self.__count < self.__length:
+            return self.__points[row, :self.__count]
+        return np.concatenate((self.__points[row, self.__cursor:], self.__points[row, :self.__cursor]))
+
+    def draw(self, draw, row, fill_color):
+        if np is None:
+            draw.point(list(self.__points[row]), fill_color)
+        else:
+            draw.point(self.__points[row, :self.__count].ravel().tolist(), fill_color)
 
     @property
-    def points(self):
-        return self.__points
+    def length(self):
+        return self.__length
+
+    @property
+    def count(self):
+        return self.__count
     
 
 class Ball(Updatable, Gravitational):
@@ -92,7 +319,6 @@ class Ball(Updatable, Gravitational):
         self.__acceleration = acceleration
         self.__bounce = bounce
         self.__friction = friction
-        self.__trail = Trail();
 
     def move(self, time):
         self.__position.x += self.__speed.x + 0.5 * self.__acceleration.x * time **2
@@ -134,6 +360,9 @@ class Ball(Updatable, Gravitational):
             self.pushed_by(game.hand_of_god)
             
         if game.gravity_field_active:
+            if game.gravity_tree is not None:
+                self.pulled_by_tree(game.gravity_tree, game.theta)
+            else:
                 self.pulled_by(game.balls)
                 
         # if acceleration == Vect2D(0, 0):
@@ -147,10 +376,21 @@ class Ball(Updatable, Gravitational):
     def pulled_by(self, balls):
         for ball in balls:
             if ball is not self:
-                self.__acceleration += ball.masse * (ball.position - self.position) / ((ball.position - self.position).length_squared + 100 ** 2) ** 1.5            
+                self.__acceleration += ball.masse * (ball.position - self.position) / ((ball.position - self.position).length_squared + SOFTENING) ** 1.5            
+
+    def pulled_by_tree(self, tree, theta=0.5):
+        self.__acceleration += tree.pull(self.position, theta)
+
+    def pull_of(self, balls) -> Vect2D:
+        """Retourne l'accélération exacte que les autres balles donnent à cette balle, sans la modifier"""
+        pull = Vect2D()
+        for ball in balls:
+            if ball is not self:
+                pull += ball.masse * (ball.position - self.position) / ((ball.position - self.position).length_squared + SOFTENING) ** 1.5
+        return pull
 
     def pushed_by(self, hand_of_god):
-        self.__acceleration += -10000000 * (hand_of_god - self.position) / ((hand_of_god - self.position).length_squared + 100 ** 2) ** 1.5
+        self.__acceleration += -10000000 * (hand_of_god - self.position) / ((hand_of_god - self.position).length_squared + SOFTENING) ** 1.5
         print(self.__acceleration) 
         pass  
     
@@ -163,6 +403,26 @@ class Ball(Updatable, Gravitational):
     def position(self):
         return self.__position
 
+    @position.setter
+    def position(self, position):
+        self.__position = position
+
+    @property
+    def speed(self):
+        return self.__speed
+
+    @speed.setter
+    def speed(self, speed):
+        self.__speed = speed
+
+    @property
+    def bounce_factor(self):
+        return self.__bounce
+
+    @property
+    def friction(self):
+        return self.__friction
+
     @property
     def radius(self):
         return self.__radius
@@ -178,15 +438,121 @@ class Ball(Updatable, Gravitational):
     @property
     def density(self):
         return self.__density
-    
-    @property
-    def trail(self):
-        return self.__trail
         
+class BallStore():
+    """Stockage en tableaux NumPy de l'état de toutes les balles d'un Game : position, vitesse, masse, rayon,
+    rebond et friction. La position et la vitesse de chaque balle deviennent des Vect2DView sur sa ligne, donc
+    le dessin et les traînées lisent les tableaux sans copie. step() fait un tick complet en quelques passes
+    vectorisées avec les mêmes formules que Ball.tick : aimant, main de Dieu, gravité adoucie, move puis bounce.
+    La gravité exacte est calculée par blocs de lignes pour que le tableau des paires (bloc, N, 2) reste sous
+    block_bytes octets; avec Barnes–Hut, GravityTree.pull_all() parcourt l'arbre pour toutes les balles à la fois.
+    Contrairement à Ball.tick, toutes les balles sont attirées par les positions du début du tick au lieu de voir
+    les balles précédentes déjà déplacées. Les puissances sont celles de NumPy, qui peuvent différer d'un ulp de
+    celles des floats de Python : les résultats égalent ceux de Ball.tick à l'arrondi près.
+
+    >>> balls = [Ball(radius=5, density=10, position=Vect2D(x, 50), speed=Vect2D(1, 0)) for x in (20, 60)]
+    >>> store = BallStore(balls)
+    >>> store.step(0.01, Vect2D(100, 100), Vect2D(0, 0), Vect2D(-1, -1), gravity_field_active=False)
+    >>> store.position.tolist()
+    [[21.0, 50.0], [61.0, 50.0]]
+    >>> print(balls[1].position)
+    (6.10E+01, 5.00E+01)
+    >>> hand_of_god = Vect2D(40, 30)
+    >>> store.step(0.01, Vect2D(100, 100), Vect2D(0, 0), hand_of_god, gravity_field_active=False)
+    >>> pushes = [-10000000 * (hand_of_god - position) / ((hand_of_god - position).length_squared + SOFTENING) ** 1.5 for position in (Vect2D(21, 50), Vect2D(61, 50))]
+    >>> np.allclose(store.speed, [(1 + push.x * 0.01, push.y * 0.01) for push in pushes], rtol=1e-12, atol=0)
+    True
+    """
+    def __init__(self, balls, block_bytes=2 ** 24):
+        if np is None:
+            raise ImportError("the ball store requires numpy")
+        count = len(balls)
+        self.__balls = list(balls)
+        self.__block_bytes = block_bytes
+        self.__position = np.zeros((count, 2))
+        self.__speed = np.zeros((count, 2))
+        self.__masse = np.array([ball.masse for ball in balls], dtype=float)
+        self.__radius = np.array([ball.radius for ball in balls], dtype=float)
+        self.__bounce = np.array([ball.bounce_factor for ball in balls], dtype=float)
+        self.__friction = np.array([ball.friction for ball in balls], dtype=float)
+        for row, ball in enumerate(self.__balls):
+            self.__position[row] = (ball.position.x, ball.position.y)
+            self.__speed[row] = (ball.speed.x, ball.speed.y)
+            ball.position = Vect2DView(self.__position, row)
+            ball.speed = Vect2DView(self.__speed, row)
+
+    def __len__(self):
+        return len(self.__balls)
+
+    def step(self, time, game_dimension:Vect2D, acceleration:Vect2D, hand_of_god:Vect2D, gravity_field_active:bool, tree=None, theta=0.5):
+        """Fait avancer toutes les balles d'un tick; tree remplace la somme exacte de la gravité par Barnes–Hut"""
+        accelerations = np.empty_like(self.__position)
+        accelerations[:] = (acceleration.x, acceleration.y)
+        if not hand_of_god == Vect2D(-1, -1):
+            delta = np.array((hand_of_god.x, hand_of_god.y)) - self.__position
+            accelerations += -10000000 * delta / np.power((delta ** 2).sum(axis=1) + SOFTENING, 1.5)[:, None]
+        if gravity_field_active:
+            if tree is not None:
+                accelerations += tree.pull_all(self.__position, theta)
+            else:
+                self.__add_gravity(accelerations)
+        self.__position += self.__speed + 0.5 * accelerations * time ** 2
+        self.__speed += accelerations * time
+        self.__bounce_axis(0, game_dimension.x)
+        self.__bounce_axis(1, game_dimension.y)
+
+    def __add_gravity(self, accelerations):
+        count = len(self.__balls)
+        block = max(1, self.__block_bytes // (count * 8 * 4))
+        for start in range(0, count, block):
+            stop = min(count, start + block)
+            delta = self.__position[None, :, :] - self.__position[start:stop, None, :]
+            factor = self.__masse[None, :] / ((delta ** 2).sum(axis=2) + SOFTENING) ** 1.5
+            accelerations[start:stop] += np.einsum('ij,ijk->ik', factor, delta)
+
+    def __bounce_axis(self, axis, border):
+        other = 1 - axis
+        position = self.__position[:, axis]
+        low = position <= self.__radius
+        high = ~low & (position >= border - self.__radius)
+        for hit, wall in ((low, self.__radius), (high, border - self.__radius)):
+            if hit.any():
+                self.__speed[hit, axis] = -self.__speed[hit, axis] * self.__bounce[hit]
+                self.__speed[hit, other] *= self.__friction[hit]
+                position[hit] = 2.0 * wall[hit] - position[hit]
+
+    @property
+    def balls(self):
+        return self.__balls
+
+    @property
+    def position(self):
+        """Retourne le tableau (N, 2) des positions"""
+        return self.__position
+
+    @property
+    def speed(self):
+        """Retourne le tableau (N, 2) des vitesses"""
+        return self.__speed
+
+    @property
+    def masse(self):
+        return self.__masse
+
+    @property
+    def radius(self):
+        return self.__radius
+
+
 class Game(Updatable):
 
-    def __init__(self, size, nb_balls=90):
+    def __init__(self, size, nb_balls=90, gravity="exact", theta=0.5, arrays=False, trail_length=15, collisions=False):
         super().__init__()
+        if gravity not in GRAVITY_MODES:
+            raise ValueError("unknown gravity mode: {}".format(gravity))
+        self.__gravity = gravity
+        self.__theta = theta
+        self.__gravity_tree = None
         self.__gravity_magnet = GravityMagnet()
         self.__size = size
         self.__nb_balls = nb_balls
@@ -196,10 +562,19 @@ class Game(Updatable):
         for _ in range(self.__nb_balls):
             self.__balls.append(Ball(radius=random.randrange(5,50), fill_color=(random.randint(0,255),random.randint(0,255), random.randint(0,255)), border_color=(random.randint(0,255),random.randint(0,255), random.randint(0,255)), density=50, position=Vect2D(random.randrange(0,self.__size.x),random.randrange(0,self.__size.y)), speed=Vect2D(random.randrange(-10,10),random.randrange(-10,10)), acceleration=Vect2D(0,0), bounce=0.95, friction=0.95))
             #self.__balls.append(Ball())
+        self.__store = BallStore(self.__balls) if arrays else None
+        self.__trail = Trail(len(self.__balls), trail_length) if trail_length else None
+        self.__collisions = CollisionDetector() if collisions else None
 
     def tick(self):
-        for ball in self.__balls:
-            ball.tick(0.01, self.__size, self.gravity_magnet.pulled_by(), self)
+        self.__gravity_tree = GravityTree(self.__balls) if self.__gravity_field_active and self.__gravity == "barnes-hut" else None
+        if self.__store is not None:
+            self.__store.step(0.01, self.__size, self.gravity_magnet.pulled_by(), self.__hand_of_god, self.__gravity_field_active, self.__gravity_tree, self.__theta)
+        else:
+            for ball in self.__balls:
+                ball.tick(0.01, self.__size, self.gravity_magnet.pulled_by(), self)
+        if self.__collisions is not None:
+            self.__collisions.resolve(self.__balls)
                     
 
     def toggle_gravity_field(self, event):
@@ -208,6 +583,30 @@ class Game(Updatable):
         else:
             self.__gravity_field_active = True
             
+    def record_trail(self):
+        """Ajoute la position actuelle de chaque balle à sa traînée"""
+        if self.__trail is not None:
+            self.__trail.tick(self.__store.position if self.__store is not None else [(ball.position.x, ball.position.y) for ball in self.__balls])
+
+    def gravity_report(self, theta=None) -> dict:
+        """Compare l'attraction de Barnes–Hut à la somme exacte pour toutes les balles, aux positions actuelles :
+        erreurs relatives moyenne et maximale, et durée de chaque calcul en millisecondes"""
+        theta = self.__theta if theta is None else theta
+        start = perf_counter()
+        exact = [ball.pull_of(self.__balls) for ball in self.__balls]
+        exact_time = perf_counter() - start
+        start = perf_counter()
+        tree = GravityTree(self.__balls)
+        approximate = [tree.pull(ball.position, theta) for ball in self.__balls]
+        tree_time = perf_counter() - start
+        errors = [(approximate_pull - exact_pull).length / exact_pull.length for exact_pull, approximate_pull in zip(exact, approximate) if exact_pull.length]
+        return {"balls": len(self.__balls),
+                "theta": theta,
+                "mean_relative_error": sum(errors) / len(errors) if errors else 0.0,
+                "max_relative_error": max(errors, default=0.0),
+                "exact_ms": exact_time * 1000,
+                "barnes_hut_ms": tree_time * 1000}
+
     def move_hand_of_god(self, event):
         self.__hand_of_god.x = event.x
         self.__hand_of_god.y = event.y
@@ -216,6 +615,30 @@ class Game(Updatable):
     def gravity_field_active(self):
         return self.__gravity_field_active
 
+    @property
+    def gravity(self):
+        return self.__gravity
+
+    @property
+    def theta(self):
+        return self.__theta
+
+    @property
+    def gravity_tree(self):
+        return self.__gravity_tree
+
+    @property
+    def store(self):
+        return self.__store
+
+    @property
+    def trail(self):
+        return self.__trail
+
+    @property
+    def collisions(self):
+        return self.__collisions
+
     @property
     def gravity_magnet(self):
         return self.__gravity_magnet
@@ -230,7 +653,7 @@ class Game(Updatable):
 
 class Application(Tk, Updatable):
     
-    def __init__(self, width=500, height=500):
+    def __init__(self, width=500, height=500, nb_balls=90, gravity="exact", theta=0.5, arrays=False, trail_length=15, collisions=False):
         super().__init__()
 
         self.width = width
@@ -243,7 +666,7 @@ class Application(Tk, Updatable):
         self.w.grid(column=0, row=0)
         
         
-        self.g = Game(Vect2D(width, height))
+        self.g = Game(Vect2D(width, height), nb_balls, gravity, theta, arrays, trail_length, collisions)
         
         self.columnconfigure(0, weight=1)
         self.rowconfigure(0, weight=1)
@@ -277,19 +700,33 @@ class Application(Tk, Updatable):
         i = Image.new(mode='RGB', size=(self.width, self.height), color=(0,0,0))
         draw = ImageDraw.Draw(i)
 
-        for ball in self.g.balls:
+        self.g.record_trail()
+        for row, ball in enumerate(self.g.balls):
             draw.ellipse([(ball.position.x - ball.radius, ball.position.y - ball.radius), (ball.position.x + ball.radius, ball.position.y + ball.radius)], ball.fill_color, ball.border_color)
-            ball.trail.tick(ball)
-            for point in ball.trail.points:
-                draw.point((point.x, point.y), ball.fill_color)
+            if self.g.trail is not None:
+                self.g.trail.draw(draw, row, ball.fill_color)
        
         self.tki = ImageTk.PhotoImage(i)
         self.w["image"] = self.tki
 
-def main():
-    
-    app = Application(1000,1000)
-    app.mainloop()
+def main(args:list=None):
+    parser = argparse.ArgumentParser(prog="ball_gravity", description="Balles soumises à la gravité. Sans commande, ouvre la fenêtre.")
+    parser.add_argument("--balls", type=int, default=90)
+    parser.add_argument("--gravity", choices=GRAVITY_MODES, default="exact", help="attraction entre balles : somme exacte ou arbre de Barnes–Hut")
+    parser.add_argument("--theta", type=float, default=0.5, help="angle d'ouverture de Barnes–Hut, 0 pour la somme exacte")
+    parser.add_argument("--arrays", action="store_true", help="stocke les balles dans des tableaux NumPy et calcule chaque tick en passes vectorisées")
+    parser.add_argument("--trail-length", type=int, default=15, help="nombre de points de la traînée de chaque balle, 0 pour aucune")
+    parser.add_argument("--collisions", action="store_true", help="sépare et fait rebondir les balles qui se chevauchent")
+    commands = parser.add_subparsers(dest="command")
+    commands.add_parser("report", help="compare Barnes–Hut à la somme exacte et affiche les erreurs et les durées en JSON")
+    arguments = parser.parse_args(args)
+
+    if arguments.command == "report":
+        game = Game(Vect2D(1000, 1000), arguments.balls, arguments.gravity, arguments.theta)
+        print(json.dumps(game.gravity_report(), indent=4))
+    else:
+        app = Application(1000, 1000, arguments.balls, arguments.gravity, arguments.theta, arguments.arrays, arguments.trail_length, arguments.collisions)
+        app.mainloop()
     
 if __name__ == '__main__':
     main()
\ No newline at end of file
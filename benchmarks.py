@@ -0,0 +1,308 @@
+"""
+Mesures de performance de la simulation de boids.
+
+Exemples:
+    python benchmarks.py steering
+    python benchmarks.py suite --ticks 20 --output results.json
+    python benchmarks.py suite --scenarios "Cohesion" --scales 1000 --output results.json --baseline baseline.json
+    python benchmarks.py compare results.json baseline.json --threshold 0.1
+"""
+import argparse
+import json
+import math
+import platform
+import sys
+import time
+import tracemalloc
+
+from boids import Eye, FlockStore, HeadlessRunner, Movable, Piloted, RGBAColor, Utils
+from vect2d import Vect2D
+
+
+PHASES = ("perception", "steering", "integration", "render")
+"""Les phases mesurées par la suite : ce que voient les yeux, le calcul des forces, le déplacement et le dessin"""
+
+PHASE_METHODS = {
+    "perception": [(Eye, "look"), (FlockStore, "look")],
+    "steering": [(Piloted, "accumulate_steering")],
+    "integration": [(Movable, "move"), (FlockStore, "integrate")],
+}
+"""Les méthodes dont la durée est attribuée à chaque phase de la simulation"""
+
+
+def double_evaluation_steering(self, steering_behaviors):
+    """
+    Référence : l'accumulation d'origine, qui évalue chaque comportement deux fois (une pour x, une pour y)
+    et limite la force en passant par les coordonnées polaires.
+    """
+    for steering_behavior in steering_behaviors:
+        self.steering_force.set(self.steering_force.x + steering_behavior.behave(origin_entity=self).x, self.steering_force.y + steering_behavior.behave(origin_entity=self).y)
+    length = self.steering_force.length
+    self.steering_force.set_polar(length=length if length < self.max_steering_force else self.max_steering_force, orientation=self.steering_force.orientation)
+
+
+def time_ticks(scenario:str, ticks:int, seed:int=0, time_step:float=0.1, size:Vect2D=Vect2D(1000, 500)) -> float:
+    """
+    Retourne la durée moyenne d'un tick, en secondes, du scénario sur le nombre de ticks donné.
+    """
+    runner = HeadlessRunner(scenario, ticks, seed=seed, time_step=time_step, size=size)
+    runner.simulation.tick(time_step)
+    runner.run()
+    return runner.elapsed / ticks
+
+
+def steering_benchmark(scenario:str="Seek, Flee or Wander", ticks:int=200, seed:int=0) -> dict:
+    """
+    Compare le temps par tick de l'accumulation de direction à évaluation unique avec celui de
+    l'accumulation d'origine à double évaluation.
+    """
+    single = time_ticks(scenario, ticks, seed)
+    accumulate_steering = Piloted.accumulate_steering
+    Piloted.accumulate_steering = double_evaluation_steering
+    try:
+        double = time_ticks(scenario, ticks, seed)
+    finally:
+        Piloted.accumulate_steering = accumulate_steering
+    return {"scenario": scenario, "ticks": ticks, "single_evaluation_ms": single * 1000, "double_evaluation_ms": double * 1000, "speedup": double / single if single else math.inf}
+
+
+class PhaseTimer():
+    """
+    Chronomètre les phases de la simulation en remplaçant, le temps d'un `with`, les méthodes de
+    PHASE_METHODS par des versions chronométrées. Hors du `with`, la simulation n'est pas ralentie.
+
+    Exemple:
+        >>> runner = HeadlessRunner("Cohesion", ticks=2, seed=0)
+        >>> with PhaseTimer() as timer:
+        ...     _ = runner.run()
+        >>> timer.totals["perception"] > 0 and timer.totals["integration"] > 0
+        True
+        >>> Eye.look is PhaseTimer.original(Eye, "look")
+        True
+    """
+    __originals = {}
+
+    def __init__(self):
+        self.__totals = {phase: 0.0 for phase in PHASES}
+        self.__patched = []
+
+    @classmethod
+    def original(cls, owner:type, name:str):
+        """Retourne la méthode d'origine, même pendant qu'elle est chronométrée"""
+        return cls.__originals.get((owner, name), getattr(owner, name))
+
+    def __timed(self, phase:str, method):
+        totals = self.__totals
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                totals[phase] += time.perf_counter() - start
+        return timed
+
+    def __enter__(self):
+        for phase, methods in PHASE_METHODS.items():
+            for owner, name in methods:
+                method = PhaseTimer.original(owner, name)
+                PhaseTimer.__originals[(owner, name)] = method
+                setattr(owner, name, self.__timed(phase, method))
+                self.__patched.append((owner, name))
+        return self
+
+    def __exit__(self, *exception):
+        for owner, name in self.__patched:
+            setattr(owner, name, PhaseTimer.__originals.pop((owner, name)))
+        self.__patched.clear()
+        return False
+
+    def add(self, phase:str, seconds:float) -> None:
+        """Ajoute une durée mesurée ailleurs, comme le rendu, à une phase"""
+        self.__totals[phase] += seconds
+
+    @property
+    def totals(self):
+        """Retourne la durée totale de chaque phase, en secondes"""
+        return self.__totals
+
+
+def open_view(size:Vect2D):
+    """
+    Retourne une ViewWindow, dans sa vue par défaut, d'une fenêtre Tk cachée : la phase render mesure le vrai
+    ViewWindow.update_view (fond, couches, sélection et PhotoImage). Retourne None sans tkinter, sans Pillow
+    ou sans écran, et la phase render n'est alors pas mesurée.
+    """
+    try:
+        import tkinter
+        from boids_gui import ViewWindow
+    except ImportError:
+        return None
+    try:
+        root = tkinter.Tk()
+    except tkinter.TclError:
+        return None
+    root.withdraw()
+    return ViewWindow(size=size, fill_color=RGBAColor(0, 0, 0))
+
+
+def run_case(scenario:str, boid_count:int, ticks:int, seed:int, time_step:float, size:Vect2D, spatial_index:str, flock_store:bool) -> dict:
+    """
+    Mesure un scénario en trois exécutions avec le même seed, pour qu'aucune mesure ne fausse les autres :
+    sans instrumentation pour les ticks par seconde, avec PhaseTimer pour la durée de chaque phase par tick,
+    puis avec tracemalloc pour la mémoire maximale.
+    """
+    runner = HeadlessRunner(scenario, ticks, boid_count, seed, time_step, size, spatial_index, flock_store)
+    ticks_per_second = runner.run()
+
+    runner = HeadlessRunner(scenario, ticks, boid_count, seed, time_step, size, spatial_index, flock_store)
+    view = open_view(size)
+    with PhaseTimer() as timer:
+        start = time.perf_counter()
+        for _ in range(ticks):
+            runner.simulation.tick(time_step)
+            if view is not None:
+                render_start = time.perf_counter()
+                view.update_view(runner.simulation)
+                timer.add("render", time.perf_counter() - render_start)
+        elapsed = time.perf_counter() - start
+    if view is not None:
+        view.winfo_toplevel().destroy()
+
+    tracemalloc.start()
+    HeadlessRunner(scenario, ticks, boid_count, seed, time_step, size, spatial_index, flock_store).run()
+    peak_memory = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    phases = {phase: timer.totals[phase] * 1000 / ticks for phase in PHASES}
+    if view is None:
+        phases["render"] = None
+    phases["other"] = max(0.0, elapsed * 1000 / ticks - sum(value for value in phases.values() if value is not None))
+    return {"scenario": scenario,
+            "boids": boid_count,
+            "sprites": len(runner.simulation.sprites),
+            "ticks": ticks,
+            "ticks_per_second": ticks_per_second,
+            "phases_ms_per_tick": phases,
+            "peak_memory_bytes": peak_memory}
+
+
+def case_name(scenario:str, boid_count:int) -> str:
+    """Retourne le nom d'un cas de la suite, par exemple "Cohesion" ou "Cohesion @ 5000" """
+    return scenario if boid_count is None else "{} @ {}".format(scenario, boid_count)
+
+
+def run_suite(scenarios:list, scales:list, ticks:int=20, seed:int=0, time_step:float=0.1, size:Vect2D=Vect2D(1000, 500), spatial_index:str="grid", flock_store:bool=False, log=None) -> dict:
+    """
+    Exécute chaque scénario avec son nombre d'entités d'origine, puis avec chacun des nombres de `scales`.
+    Retourne les résultats, indexés par nom de cas, avec les paramètres de l'exécution.
+    """
+    results = {}
+    for boid_count in [None] + list(scales):
+        for scenario in scenarios:
+            name = case_name(scenario, boid_count)
+            results[name] = run_case(scenario, boid_count, ticks, seed, time_step, size, spatial_index, flock_store)
+            if log is not None:
+                log("{:<40} {:>10.1f} ticks/s".format(name, results[name]["ticks_per_second"]))
+    return {"settings": {"ticks": ticks,
+                         "seed": seed,
+                         "time_step": time_step,
+                         "size": [size.x, size.y],
+                         "spatial_index": spatial_index,
+                         "flock_store": flock_store,
+                         "python": platform.python_version(),
+                         "platform": platform.platform()},
+            "results": results}
+
+
+def compare(results:dict, baseline:dict, threshold:float=0.1, min_phase_ms:float=0.05) -> list:
+    """
+    Retourne les régressions de `results` par rapport à `baseline` : un cas dont les ticks par seconde
+    baissent, ou dont une phase ou la mémoire maximale augmente, de plus de `threshold` (0.1 = 10 %).
+    Les phases plus courtes que `min_phase_ms` dans les deux exécutions sont ignorées, elles sont surtout du bruit.
+
+    Exemple:
+        >>> baseline = {"results": {"Cohesion": {"ticks_per_second": 100.0, "phases_ms_per_tick": {"steering": 4.0}, "peak_memory_bytes": 1000}}}
+        >>> results = {"results": {"Cohesion": {"ticks_per_second": 80.0, "phases_ms_per_tick": {"steering": 4.2}, "peak_memory_bytes": 1000}}}
+        >>> [regression["metric"] for regression in compare(results, baseline)]
+        ['ticks_per_second']
+    """
+    regressions = []
+    for name, result in results["results"].items():
+        reference = baseline["results"].get(name)
+        if reference is None:
+            continue
+        if result["ticks_per_second"] < reference["ticks_per_second"] * (1 - threshold):
+            regressions.append({"case": name, "metric": "ticks_per_second", "baseline": reference["ticks_per_second"], "value": result["ticks_per_second"]})
+        for phase, value in result["phases_ms_per_tick"].items():
+            reference_value = reference["phases_ms_per_tick"].get(phase)
+            if value is None or reference_value is None or max(value, reference_value) < min_phase_ms:
+                continue
+            if value > reference_value * (1 + threshold):
+                regressions.append({"case": name, "metric": phase + "_ms_per_tick", "baseline": reference_value, "value": value})
+        if result["peak_memory_bytes"] > reference["peak_memory_bytes"] * (1 + threshold):
+            regressions.append({"case": name, "metric": "peak_memory_bytes", "baseline": reference["peak_memory_bytes"], "value": result["peak_memory_bytes"]})
+    return regressions
+
+
+def print_regressions(regressions:list) -> None:
+    if not regressions:
+        print("no regression")
+    for regression in regressions:
+        print("REGRESSION {case}: {metric} {baseline:.3f} -> {value:.3f}".format(**regression))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mesures de performance de la simulation de boids")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    steering = commands.add_parser("steering", help="accumulation de direction à évaluation unique contre double évaluation")
+    steering.add_argument("--scenario", default="Seek, Flee or Wander")
+    steering.add_argument("--ticks", type=int, default=200)
+    steering.add_argument("--seed", type=int, default=0)
+
+    suite = commands.add_parser("suite", help="tous les scénarios de scenarios.txt, puis à plus grande échelle")
+    suite.add_argument("--scenarios", nargs="*", default=None, help="les scénarios à mesurer, tous ceux de scenarios.txt par défaut")
+    suite.add_argument("--scales", type=int, nargs="*", default=[1000, 5000, 20000], help="les nombres d'entités des variantes à grande échelle")
+    suite.add_argument("--ticks", type=int, default=20)
+    suite.add_argument("--seed", type=int, default=0)
+    suite.add_argument("--time-step", type=float, default=0.1)
+    suite.add_argument("--spatial-index", choices=["grid", "quadtree"], default="grid")
+    suite.add_argument("--flock-store", action="store_true")
+    suite.add_argument("--output", default="benchmark_results.json")
+    suite.add_argument("--baseline", default=None, help="résultats de référence auxquels comparer cette exécution")
+    suite.add_argument("--threshold", type=float, default=0.1)
+
+    comparison = commands.add_parser("compare", help="compare des résultats à des résultats de référence")
+    comparison.add_argument("results")
+    comparison.add_argument("baseline")
+    comparison.add_argument("--threshold", type=float, default=0.1)
+    arguments = parser.parse_args()
+
+    if arguments.command == "steering":
+        result = steering_benchmark(arguments.scenario, arguments.ticks, arguments.seed)
+        print(f"{result['scenario']} ({result['ticks']} ticks)")
+        print(f"  single evaluation : {result['single_evaluation_ms']:.3f} ms/tick")
+        print(f"  double evaluation : {result['double_evaluation_ms']:.3f} ms/tick")
+        print(f"  speedup           : {result['speedup']:.2f}x")
+
+    elif arguments.command == "suite":
+        scenarios = arguments.scenarios if arguments.scenarios else [line.replace("\n", "") for line in Utils.readfile("scenarios.txt") if line.strip()]
+        results = run_suite(scenarios, arguments.scales, arguments.ticks, arguments.seed, arguments.time_step, spatial_index=arguments.spatial_index, flock_store=arguments.flock_store, log=print)
+        with open(arguments.output, "w") as file:
+            json.dump(results, file, indent=4)
+        print("results written to " + arguments.output)
+        if arguments.baseline:
+            with open(arguments.baseline) as file:
+                regressions = compare(results, json.load(file), arguments.threshold)
+            print_regressions(regressions)
+            sys.exit(1 if regressions else 0)
+
+    elif arguments.command == "compare":
+        with open(arguments.results) as results_file, open(arguments.baseline) as baseline_file:
+            regressions = compare(json.load(results_file), json.load(baseline_file), arguments.threshold)
+        print_regressions(regressions)
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,10 +1,20 @@
+import argparse
+import json
+import queue
 import random
+import threading
+from collections import deque
+from concurrent.futures import Future
+from functools import lru_cache
+from time import perf_counter
 from abc import abstractmethod
-import tkinter as tk
-from tkinter import Tk, ttk
-from PIL import Image, ImageDraw, ImageTk
-from vect2d import Vect2D
+from vect2d import Vect2D, Vect2DView
+from collisions import CollisionDetector
 import math
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 #  __    __  .___________. __   __       __  .___________. __   _______     _______.
 # |  |  |  | |           ||  | |  |     |  | |           ||  | |   ____|   /       |
@@ -83,6 +93,594 @@ class RGBAColor():
         self.__a = random.randint(0, 255)
 
 
+class SpatialIndex():
+    """
+    This class is the common interface of the spatial indexes used to speed up the neighbor queries of the eyes.
+    It is an abstract class. The sprites notify their index when they move (update) and the eyes ask it for
+    the sprites close to them (query). A query returns a superset of the sprites an eye can see, in the order
+    of the sprites list, which keeps Eye.look exact.
+    """
+    def __init__(self):
+        self.__max_radius = 0
+        self.__sprite_count = 0
+
+    @property
+    def max_radius(self):
+        """max_radius is a property that returns the largest radius of the indexed sprites."""
+        return self.__max_radius
+
+    @property
+    def is_built(self):
+        """is_built is a property that returns True if the index contains sprites and can answer queries."""
+        return len(self) > 0
+
+    @abstractmethod
+    def __len__(self):
+        pass
+
+    def is_synced_with(self, sprites:list) -> bool:
+        """is_synced_with() returns True if the index was last rebuilt from a list of the same length."""
+        return len(sprites) == self.__sprite_count
+
+    def rebuild(self, sprites:list) -> None:
+        """
+        rebuild() returns None and indexes every sprite of the list from scratch.
+        Nothing is indexed when no sprite has eyes, since nobody will query the index.
+        """
+        self.clear()
+        self.__sprite_count = len(sprites)
+        ranges = sorted(eye.range for sprite in sprites if hasattr(sprite, 'eyes') for eye in sprite.eyes)
+        if not ranges:
+            return
+        self.adapt_to_range(ranges[len(ranges) // 2])
+        for order, sprite in enumerate(sprites):
+            self.insert(sprite, order)
+
+    def adapt_to_range(self, typical_range:float) -> None:
+        """adapt_to_range() returns None and lets the index tune itself for the median eye range."""
+        pass
+
+    def fit_radius(self, radius:float) -> None:
+        """fit_radius() returns None and grows the query margin so that a sprite of this radius is never missed."""
+        self.__max_radius = max(self.__max_radius, radius)
+
+    def clear(self) -> None:
+        """clear() returns None and empties the index."""
+        self.__max_radius = 0
+        self.__sprite_count = 0
+
+    def query_reach(self, distance:float) -> float:
+        """query_reach() returns how far from the eye a sprite can be indexed and still be seen."""
+        # one extra pixel absorbs the rounding of Eye.is_in_range
+        return distance + self.__max_radius + 1
+
+    @abstractmethod
+    def insert(self, sprite:type['Entity'], order:int) -> None:
+        pass
+
+    @abstractmethod
+    def remove(self, sprite:type['Entity']) -> None:
+        pass
+
+    @abstractmethod
+    def update(self, sprite:type['Entity']) -> None:
+        pass
+
+    def update_all(self, sprites:list) -> None:
+        """update_all() returns None and updates every sprite of the list, after they all moved."""
+        for sprite in sprites:
+            self.update(sprite)
+
+    @abstractmethod
+    def query(self, position:Vect2D, distance:float) -> list:
+        pass
+
+
+class SpatialGrid(SpatialIndex):
+    """
+    This class is a uniform spatial hash grid. It is a child class of the SpatialIndex class.
+    The cell size is the median eye range, so a typical query only visits the few cells touched by its range,
+    while the rare long-range eyes (a predator's) visit more, smaller cells instead of making every cell huge.
+    A sprite only changes bucket when it crosses a cell boundary.
+    """
+    def __init__(self, cell_size:float=100):
+        SpatialIndex.__init__(self)
+        self.__cell_size = cell_size
+        self.__cells = {}
+        self.__locations = {}
+
+    @property
+    def cell_size(self):
+        """cell_size is a property that returns the width and height of a cell of the grid."""
+        return self.__cell_size
+
+    def __len__(self):
+        return len(self.__locations)
+
+    def cell_of(self, x:float, y:float) -> tuple[int, int]:
+        """cell_of() returns the (column, row) of the cell containing the point (x, y)."""
+        return (math.floor(x / self.__cell_size), math.floor(y / self.__cell_size))
+
+    def adapt_to_range(self, typical_range:float) -> None:
+        """adapt_to_range() returns None and sizes the cells from the median eye range."""
+        self.__cell_size = max(typical_range, 1)
+
+    def insert(self, sprite:type['Entity'], order:int) -> None:
+        """insert() returns None and adds a sprite to the grid. order is the index of the sprite in the sprites list."""
+        cell = self.cell_of(sprite.position.x, sprite.position.y)
+        self.__cells.setdefault(cell, {})[sprite] = order
+        self.__locations[sprite] = (cell, order)
+        self.fit_radius(sprite.radius)
+        sprite.spatial_index = self
+
+    def remove(self, sprite:type['Entity']) -> None:
+        """remove() returns None and removes a sprite from the grid."""
+        cell, _ = self.__locations.pop(sprite)
+        bucket = self.__cells[cell]
+        del bucket[sprite]
+        if not bucket:
+            del self.__cells[cell]
+        sprite.spatial_index = None
+
+    def update(self, sprite:type['Entity']) -> None:
+        """update() returns None and moves a sprite to its new bucket if it crossed a cell boundary."""
+        cell = (math.floor(sprite.position.x / self.__cell_size), math.floor(sprite.position.y / self.__cell_size))
+        old_cell, order = self.__locations[sprite]
+        if cell != old_cell:
+            bucket = self.__cells[old_cell]
+            del bucket[sprite]
+            if not bucket:
+                del self.__cells[old_cell]
+            self.__cells.setdefault(cell, {})[sprite] = order
+            self.__locations[sprite] = (cell, order)
+
+    def clear(self) -> None:
+        """clear() returns None and empties the grid."""
+        SpatialIndex.clear(self)
+        for sprite in self.__locations:
+            sprite.spatial_index = None
+        self.__cells = {}
+        self.__locations = {}
+
+    def query(self, position:Vect2D, distance:float) -> list:
+        """query() returns the sprites whose cell is touched by the circle of radius distance around position."""
+        reach = self.query_reach(distance)
+        min_col, min_row = self.cell_of(position.x - reach, position.y - reach)
+        max_col, max_row = self.cell_of(position.x + reach, position.y + reach)
+        candidates = []
+        if (max_col - min_col + 1) * (max_row - min_row + 1) > len(self.__cells):
+            for (col, row), bucket in self.__cells.items():
+                if min_col <= col <= max_col and min_row <= row <= max_row:
+                    candidates.extend(bucket.items())
+        else:
+            for col in range(min_col, max_col + 1):
+                for row in range(min_row, max_row + 1):
+                    bucket = self.__cells.get((col, row))
+                    if bucket:
+                        candidates.extend(bucket.items())
+        candidates.sort(key=lambda entry: entry[1])
+        return [sprite for sprite, _ in candidates]
+
+
+class QuadTree(SpatialIndex):
+    """
+    This class is an adaptive quadtree. It is a child class of the SpatialIndex class.
+    The root covers the simulation and a node splits in four when it holds more than capacity sprites,
+    so dense clumps get small nodes while empty areas stay coarse. Sprites outside the simulation are
+    kept aside and returned by every query. A sprite only changes node when it leaves its node.
+    The range is pruned here, the cone test is left to Eye.sees.
+    """
+    class __Node():
+        __slots__ = ('x_min', 'y_min', 'x_max', 'y_max', 'depth', 'parent', 'children', 'sprites', 'count')
+
+        def __init__(self, x_min, y_min, x_max, y_max, depth, parent):
+            self.x_min, self.y_min, self.x_max, self.y_max = x_min, y_min, x_max, y_max
+            self.depth = depth
+            self.parent = parent
+            self.children = None
+            self.sprites = {}
+            self.count = 0
+
+        def contains(self, x, y):
+            return self.x_min <= x < self.x_max and self.y_min <= y < self.y_max
+
+    def __init__(self, size:Vect2D, capacity:int=8, max_depth:int=10):
+        SpatialIndex.__init__(self)
+        self.__size = size
+        self.__capacity = capacity
+        self.__max_depth = max_depth
+        self.__root = QuadTree.__Node(0, 0, size.x, size.y, 0, None)
+        self.__outside = {}
+        self.__locations = {}
+
+    @property
+    def capacity(self):
+        """capacity is a property that returns the number of sprites a node holds before splitting."""
+        return self.__capacity
+
+    def __len__(self):
+        return len(self.__locations)
+
+    def insert(self, sprite:type['Entity'], order:int) -> None:
+        """insert() returns None and adds a sprite to the tree. order is the index of the sprite in the sprites list."""
+        self.__place(sprite, order)
+        self.fit_radius(sprite.radius)
+        sprite.spatial_index = self
+
+    def remove(self, sprite:type['Entity']) -> None:
+        """remove() returns None and removes a sprite from the tree."""
+        self.__unplace(sprite)
+        sprite.spatial_index = None
+
+    def update(self, sprite:type['Entity']) -> None:
+        """update() returns None and moves a sprite to another node if it left its node."""
+        node, order = self.__locations[sprite]
+        if node is not None and node.contains(sprite.position.x, sprite.position.y):
+            return
+        self.__unplace(sprite)
+        self.__place(sprite, order)
+
+    def update_all(self, sprites:list) -> None:
+        """
+        update_all() returns None and updates every sprite of the list, after they all moved.
+        Every sprite that left its node is taken out before any is put back, so a node that splits while they are
+        put back only holds sprites that are inside it; one update() at a time could split a node around sprites
+        that already moved out of it.
+        """
+        moved = []
+        for sprite in sprites:
+            node, order = self.__locations[sprite]
+            if node is None or not node.contains(sprite.position.x, sprite.position.y):
+                self.__unplace(sprite)
+                moved.append((sprite, order))
+        for sprite, order in moved:
+            self.__place(sprite, order)
+
+    def clear(self) -> None:
+        """clear() returns None and empties the tree."""
+        SpatialIndex.clear(self)
+        for sprite in self.__locations:
+            sprite.spatial_index = None
+        self.__root = QuadTree.__Node(0, 0, self.__size.x, self.__size.y, 0, None)
+        self.__outside = {}
+        self.__locations = {}
+
+    def query(self, position:Vect2D, distance:float) -> list:
+        """query() returns the sprites of the leaves touched by the circle of radius distance around position."""
+        reach = self.query_reach(distance)
+        reach_squared = reach * reach
+        candidates = list(self.__outside.items())
+        stack = [self.__root]
+        while stack:
+            node = stack.pop()
+            if node.count == 0:
+                continue
+            closest_x = min(max(position.x, node.x_min), node.x_max)
+            closest_y = min(max(position.y, node.y_min), node.y_max)
+            if (position.x - closest_x) ** 2 + (position.y - closest_y) ** 2 > reach_squared:
+                continue
+            if node.children:
+                stack.extend(node.children)
+            else:
+                candidates.extend(node.sprites.items())
+        candidates.sort(key=lambda entry: entry[1])
+        return [sprite for sprite, _ in candidates]
+
+    def __place(self, sprite, order):
+        x, y = sprite.position.x, sprite.position.y
+        node = self.__root
+        if not node.contains(x, y):
+            self.__outside[sprite] = order
+            self.__locations[sprite] = (None, order)
+            return
+        node.count += 1
+        while node.children:
+            node = next(child for child in node.children if child.contains(x, y))
+            node.count += 1
+        node.sprites[sprite] = order
+        self.__locations[sprite] = (node, order)
+        if len(node.sprites) > self.__capacity and node.depth < self.__max_depth:
+            self.__split(node)
+
+    def __unplace(self, sprite):
+        node, _ = self.__locations.pop(sprite)
+        if node is None:
+            del self.__outside[sprite]
+            return
+        del node.sprites[sprite]
+        while node is not None:
+            node.count -= 1
+            if node.children and node.count <= self.__capacity // 2:
+                self.__merge(node)
+            node = node.parent
+
+    def __split(self, node):
+        x_mid = (node.x_min + node.x_max) / 2
+        y_mid = (node.y_min + node.y_max) / 2
+        depth = node.depth + 1
+        node.children = [QuadTree.__Node(node.x_min, node.y_min, x_mid, y_mid, depth, node),
+                         QuadTree.__Node(x_mid, node.y_min, node.x_max, y_mid, depth, node),
+                         QuadTree.__Node(node.x_min, y_mid, x_mid, node.y_max, depth, node),
+                         QuadTree.__Node(x_mid, y_mid, node.x_max, node.y_max, depth, node)]
+        sprites, node.sprites = node.sprites, {}
+        for sprite, order in sprites.items():
+            child = next(child for child in node.children if child.contains(sprite.position.x, sprite.position.y))
+            child.sprites[sprite] = order
+            child.count += 1
+            self.__locations[sprite] = (child, order)
+        for child in node.children:
+            if len(child.sprites) > self.__capacity and child.depth < self.__max_depth:
+                self.__split(child)
+
+    def __merge(self, node):
+        stack = list(node.children)
+        while stack:
+            child = stack.pop()
+            if child.children:
+                stack.extend(child.children)
+            for sprite, order in child.sprites.items():
+                node.sprites[sprite] = order
+                self.__locations[sprite] = (node, order)
+        node.children = None
+
+
+class Profiler():
+    """
+    This class is an opt-in profiler of the simulation hot paths. It is off unless enable() is called.
+    enable() swaps in timed versions of Brain.process, Eye.look, FlockStore.look and of the behave() method of
+    every SteeringBehavior subclass (and Simulation.tick), so a disabled profiler costs nothing. Other code, like
+    ViewWindow.update_view, reports its own sections with record() or lap() when Profiler.active() is not None.
+    Times are inclusive (Brain.process contains the Eye.look and behave() calls it makes) and are aggregated per
+    tick: end_tick() closes the current tick and the statistics are averaged over the last `window` ticks.
+    A tick is whatever the caller closes: HeadlessRunner closes one per simulation step, App one per rendered
+    frame, which holds any number of steps (the calls of Simulation.tick).
+
+    Example:
+        >>> profiler = Profiler(window=10)
+        >>> profiler.enable()
+        >>> profiler is Profiler.active()
+        True
+        >>> BorderRepulsion(sim_dim=Vect2D(100, 100)).behave(DynamicCircle()) is not None
+        True
+        >>> profiler.end_tick()
+        >>> profiler.disable()
+        >>> [(name, calls) for name, milliseconds, calls in profiler.top()]
+        [('BorderRepulsion.behave', 1.0)]
+        >>> Profiler.active() is None
+        True
+    """
+    __active = None
+    __originals = {}
+
+    def __init__(self, window:int=100):
+        self.__window = window
+        self.__current = {}
+        self.__history = deque()
+        self.__sums = {}
+        self.__lap_start = perf_counter()
+
+    @classmethod
+    def active(cls):
+        """active() returns the enabled profiler, or None."""
+        return cls.__active
+
+    @staticmethod
+    def instrumented_methods() -> list:
+        """instrumented_methods() returns the (class, method name) pairs that enable() times."""
+        methods = [(Simulation, "tick"), (Brain, "process"), (Eye, "look"), (FlockStore, "look"), (CollisionDetector, "resolve")]
+        behavior_classes = list(SteeringBehavior.__subclasses__())
+        while behavior_classes:
+            behavior_class = behavior_classes.pop(0)
+            if "behave" in behavior_class.__dict__:
+                methods.append((behavior_class, "behave"))
+            behavior_classes.extend(behavior_class.__subclasses__())
+        return methods
+
+    def enable(self) -> None:
+        """enable() returns None, times the instrumented methods and makes this profiler the active one."""
+        if Profiler.__active is not None:
+            Profiler.__active.disable()
+        for owner, name in Profiler.instrumented_methods():
+            method = owner.__dict__[name]
+            Profiler.__originals[(owner, name)] = method
+            setattr(owner, name, self.__timed(owner.__name__ + "." + name, method))
+        Profiler.__active = self
+
+    def disable(self) -> None:
+        """disable() returns None and restores the original methods."""
+        if Profiler.__active is self:
+            for (owner, name), method in Profiler.__originals.items():
+                setattr(owner, name, method)
+            Profiler.__originals.clear()
+            Profiler.__active = None
+
+    def __timed(self, key:str, method):
+        def timed(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self.record(key, perf_counter() - start)
+        return timed
+
+    def record(self, key:str, seconds:float, calls:int=1) -> None:
+        """record() returns None and adds a duration and a call count to the current tick."""
+        entry = self.__current.get(key)
+        if entry is None:
+            self.__current[key] = [seconds, calls]
+        else:
+            entry[0] += seconds
+            entry[1] += calls
+
+    def start_lap(self) -> None:
+        """start_lap() returns None and starts timing a sequence of sections measured with lap()."""
+        self.__lap_start = perf_counter()
+
+    def lap(self, key:str) -> None:
+        """lap() returns None and records the time since the previous lap() or start_lap() under key."""
+        now = perf_counter()
+        self.record(key, now - self.__lap_start)
+        self.__lap_start = now
+
+    def end_tick(self) -> None:
+        """end_tick() returns None, closes the current tick and drops the ticks older than the window."""
+        tick = self.__current
+        self.__current = {}
+        self.__history.append(tick)
+        for key, (seconds, calls) in tick.items():
+            total = self.__sums.setdefault(key, [0.0, 0])
+            total[0] += seconds
+            total[1] += calls
+        if len(self.__history) > self.__window:
+            for key, (seconds, calls) in self.__history.popleft().items():
+                total = self.__sums[key]
+                total[0] -= seconds
+                total[1] -= calls
+
+    def statistics(self) -> dict:
+        """statistics() returns, for each key, the milliseconds and calls per tick averaged over the window."""
+        tick_count = len(self.__history)
+        if not tick_count:
+            return {}
+        return {key: {"ms_per_tick": seconds * 1000 / tick_count, "calls_per_tick": calls / tick_count} for key, (seconds, calls) in self.__sums.items() if calls}
+
+    def top(self, count:int=None) -> list:
+        """top() returns the (key, ms per tick, calls per tick) of the most expensive keys, most expensive first."""
+        ranking = sorted(((key, values["ms_per_tick"], values["calls_per_tick"]) for key, values in self.statistics().items()), key=lambda entry: entry[1], reverse=True)
+        return ranking if count is None else ranking[:count]
+
+    def table(self, count:int=None) -> str:
+        """table() returns the top() costs as a text table."""
+        lines = ["{:<32} {:>12} {:>14}".format("name", "ms/tick", "calls/tick")]
+        for key, milliseconds, calls in self.top(count):
+            lines.append("{:<32} {:>12.3f} {:>14.1f}".format(key, milliseconds, calls))
+        return "\n".join(lines)
+
+    def to_json(self) -> str:
+        """to_json() returns the statistics() and the number of ticks they cover as a JSON string."""
+        return json.dumps({"ticks": len(self.__history), "window": self.__window, "statistics": self.statistics()}, indent=4)
+
+    @property
+    def window(self):
+        """window is a property that returns the number of ticks the statistics are averaged over."""
+        return self.__window
+
+
+class FixedStepScheduler():
+    """
+    This class paces the simulation with a fixed time step, independently of the rendering rate.
+    The wall-clock time elapsed between advance() calls is accumulated and spent in whole steps of 1 / target_hz
+    seconds. At most max_catch_up steps run per call: the rest of a larger backlog is dropped, so a slow frame
+    cannot make the next one slower. frame_due() lets at most target_fps frames per second through and skips the
+    frames the loop was too late to render. sim_hz and fps are the rates measured over the last `window` seconds.
+    Every step advances the simulation by step_time, whatever target_hz: the steering forces are applied once per
+    step, so a shorter step would change the behaviors, and target_hz sets how fast the simulation runs instead.
+
+    Example:
+        >>> scheduler = FixedStepScheduler(target_hz=100, target_fps=50, max_catch_up=5, start=0.0)
+        >>> scheduler.advance(0.035)
+        3
+        >>> scheduler.frame_due(0.035), scheduler.frame_due(0.039), scheduler.frame_due(0.041)
+        (True, False, True)
+        >>> scheduler.advance(1.0)
+        5
+        >>> scheduler.dropped_steps
+        92
+        >>> scheduler.frame_due(1.0), scheduler.skipped_frames
+        (True, 47)
+        >>> scheduler.advance(2.0, running=False), scheduler.frame_due(2.0)
+        (0, True)
+        >>> round(scheduler.delay(2.0), 3)
+        0.01
+        >>> scheduler.step_time
+        0.1
+    """
+    def __init__(self, target_hz:float=100.0, target_fps:float=60.0, max_catch_up:int=5, window:float=1.0, start:float=None, step_time:float=0.1):
+        self.__step_period = 1.0 / target_hz
+        self.__step_time = step_time
+        self.__frame_period = 1.0 / target_fps
+        self.__max_catch_up = max_catch_up
+        self.__window = window
+        self.__start = perf_counter() if start is None else start
+        self.__last = self.__start
+        self.__accumulator = 0.0
+        self.__next_frame = self.__start
+        self.__steps = deque()
+        self.__step_count = 0
+        self.__frames = deque()
+        self.__dropped_steps = 0
+        self.__skipped_frames = 0
+
+    def advance(self, now:float, running:bool=True) -> int:
+        """advance() returns the number of simulation steps to run for the time elapsed since the previous call."""
+        self.__accumulator += now - self.__last
+        self.__last = now
+        if not running:
+            self.__accumulator = 0.0
+            return 0
+        steps = int(self.__accumulator / self.__step_period)
+        self.__accumulator -= steps * self.__step_period
+        if steps > self.__max_catch_up:
+            self.__dropped_steps += steps - self.__max_catch_up
+            steps = self.__max_catch_up
+        if steps:
+            self.__steps.append((now, steps))
+            self.__step_count += steps
+        self.__forget(now)
+        return steps
+
+    def frame_due(self, now:float) -> bool:
+        """frame_due() returns True when a frame should be rendered now, counting the frames skipped since the last one."""
+        if now < self.__next_frame:
+            return False
+        late_frames = int((now - self.__next_frame) / self.__frame_period)
+        self.__skipped_frames += late_frames
+        self.__next_frame += (late_frames + 1) * self.__frame_period
+        self.__frames.append(now)
+        self.__forget(now)
+        return True
+
+    def delay(self, now:float) -> float:
+        """delay() returns the seconds to wait before the next simulation step or frame is due."""
+        next_step = self.__step_period - self.__accumulator - (now - self.__last)
+        return max(0.0, min(next_step, self.__next_frame - now))
+
+    def __forget(self, now:float) -> None:
+        horizon = now - self.__window
+        while self.__steps and self.__steps[0][0] <= horizon:
+            self.__step_count -= self.__steps.popleft()[1]
+        while self.__frames and self.__frames[0] <= horizon:
+            self.__frames.popleft()
+
+    def __measured_span(self) -> float:
+        return min(self.__window, self.__last - self.__start) or 1.0
+
+    @property
+    def sim_hz(self):
+        """sim_hz is a property that returns the simulation steps run per second over the window."""
+        return self.__step_count / self.__measured_span()
+
+    @property
+    def fps(self):
+        """fps is a property that returns the frames rendered per second over the window."""
+        return len(self.__frames) / self.__measured_span()
+
+    @property
+    def step_time(self):
+        """step_time is a property that returns the simulated time of a step, the time passed to Simulation.tick."""
+        return self.__step_time
+
+    @property
+    def dropped_steps(self):
+        """dropped_steps is a property that returns the number of steps dropped by the catch-up cap."""
+        return self.__dropped_steps
+
+    @property
+    def skipped_frames(self):
+        """skipped_frames is a property that returns the number of frames skipped because the loop was late."""
+        return self.__skipped_frames
+
+
 #      _______.___________. _______  _______ .______       __  .__   __.   _______    .______    _______  __    __       ___   ____    ____  __    ______   .______          _______.
 #     /       |           ||   ____||   ____||   _  \     |  | |  \ |  |  /  _____|   |   _  \  |   ____||  |  |  |     /   \  \   \  /   / |  |  /  __  \  |   _  \        /       |
 #    |   (----`---|  |----`|  |__   |  |__   |  |_)  |    |  | |   \|  | |  |  __     |  |_)  | |  |__   |  |__|  |    /  ^  \  \   \/   /  |  | |  |  |  | |  |_)  |      |   (----`
@@ -137,6 +735,14 @@ class SteeringBehavior():
         """remove_target_entity() returns None and removes a target entity from the steering behavior object."""
         self.__target_entities.remove(target_entity)
 
+    def retarget(self, target_entities):
+        """
+        retarget() returns None and points a reused steering behavior object to new target entities.
+        It resets what the behavior accumulates during a tick, so a reused object behaves like a new one.
+        """
+        self.__target_entities = target_entities
+        self.__resulting_direction.set(0, 0)
+
 
 class Seek(SteeringBehavior):
     """
@@ -333,13 +939,11 @@ class BorderRepulsion(SteeringBehavior):
 
 class EntityRepulsion(SteeringBehavior):
     def __init__(self, target_entities:list[type['Entity']|type['Vect2D']], attraction_repulsion_force:int=2000000000):
-        SteeringBehavior.__init__(self, attraction_repulsion_force=attraction_repulsion_force)
-    
-        self.__target_entities = target_entities
+        SteeringBehavior.__init__(self, target_entities, attraction_repulsion_force=attraction_repulsion_force)
 
     def behave(self, origin_entity:type['Entity']) -> Vect2D:
         force = self.attraction_repulsion_force
-        for target_entity in self.__target_entities:
+        for target_entity in self.target_entities:
             if target_entity is not origin_entity:
                 if isinstance(target_entity, Entity):
                     orientation = (origin_entity.position - target_entity.position).normalized
@@ -396,6 +1000,11 @@ class Alignment(SteeringBehavior):
         self.__origin_entity = None
         
         self.__sum_of_forces = Vect2D()
+
+    def retarget(self, target_entities):
+        super().retarget(target_entities)
+        self.__origin_entity = None
+        self.__sum_of_forces.set(0, 0)
         
     def behave(self, origin_entity: type['Entity'] = None) -> Vect2D:
         if not self.__origin_entity:
@@ -511,6 +1120,9 @@ class Movable():
         self.speed.clamp_x(-self.max_speed, self.max_speed)
         self.speed.clamp_y(-self.max_speed, self.max_speed)
 
+        if self.spatial_index is not None:
+            self.spatial_index.update(self)
+
     @property
     def max_speed(self):
         return self.__max_speed
@@ -518,6 +1130,8 @@ class Movable():
     @max_speed.setter
     def max_speed(self, max_speed):
         self.__max_speed = max_speed
+        if self.flock is not None:
+            self.flock.max_speed[self.flock_row] = max_speed
 
     @property
     def original_max_speed(self):
@@ -535,6 +1149,10 @@ class Movable():
     def speed(self, speed):
         self.__speed = speed
 
+    @acceleration.setter
+    def acceleration(self, acceleration):
+        self.__acceleration = acceleration
+
 
 class Piloted():
     '''
@@ -574,10 +1192,25 @@ class Piloted():
         '''
 
         
-        if self.__steering_behaviors is not None:
-            for steering_behavior in self.__steering_behaviors:
-                self.steering_force.set(self.steering_force.x + steering_behavior.behave(origin_entity=self).x, self.steering_force.y + steering_behavior.behave(origin_entity=self).y)
-        self.steering_force.set_polar(length= Utils.clamp_max(self.steering_force.length, self.__max_steering_force), orientation=self.steering_force.orientation)
+        self.accumulate_steering(self.__steering_behaviors if self.__steering_behaviors is not None else ())
+
+    def accumulate_steering(self, steering_behaviors:list[SteeringBehavior]) -> None:
+        '''   Adds the force of each steering behavior, evaluated once, to the steering force and
+              clamps the result to the max steering force without going through polar coordinates.
+        '''
+        steering_force = self.steering_force
+        x = steering_force.x
+        y = steering_force.y
+        for steering_behavior in steering_behaviors:
+            force = steering_behavior.behave(origin_entity=self)
+            x += force.x
+            y += force.y
+        length_squared = x * x + y * y
+        if length_squared > self.__max_steering_force * self.__max_steering_force:
+            scale = self.__max_steering_force / math.sqrt(length_squared)
+            x *= scale
+            y *= scale
+        steering_force.set(x, y)
 
     @property
     def max_steering_force(self):
@@ -616,6 +1249,67 @@ class Updatable():
 # |  |     |  |  |  | |  |\/|  | |   ___/  |  |  |  | |  . `  | |   __|  |  . `  |     |  |        \   \    
 # |  `----.|  `--'  | |  |  |  | |  |      |  `--'  | |  |\   | |  |____ |  |\   |     |  |    .----)   |   
 #  \______| \______/  |__|  |__| | _|       \______/  |__| \__| |_______||__| \__|     |__|    |_______/    
+class BehaviorDispatchTable():
+    """
+    Table de répartition compilée à partir d'un dictionnaire de patterns de comportement de `Brain`.
+
+    Les patterns "single" et "grouping" sont gardés dans l'ordre du dictionnaire. Les entités vues sont
+    réparties en une seule passe, par type, dans un groupe par pattern, au lieu de comparer le nom de
+    classe de chaque entité à chaque clé. Le type d'une entité est associé à son pattern (par le nom de
+    sa classe, comme avant) la première fois qu'il est rencontré.
+
+    Les tables sont partagées : deux dictionnaires de patterns au contenu identique, par exemple celui
+    que les scénarios Alignment et Follow Biggest Boid Seen donnent à leurs 50 entités, donnent la même table.
+    Seules les MAX_COMPILED_TABLES tables utilisées le plus récemment sont gardées, les scénarios successifs
+    n'accumulent donc pas les tables de leurs patterns.
+    Un dictionnaire modifié après coup doit être redonné à `Brain.behavior_patterns` pour être recompilé.
+
+    Exemple:
+        >>> patterns = {"Circle": {"Behavior": EntityRepulsion, "Target_type": "single"}, "No_target": {"Behavior": Wander, "Target_type": "none"}}
+        >>> table = BehaviorDispatchTable.compile(patterns)
+        >>> table is BehaviorDispatchTable.compile(dict(patterns))
+        True
+        >>> obstacle = Circle(position=Vect2D(0, 0))
+        >>> table.bucket([obstacle, Simulation()]) == [[obstacle]]
+        True
+    """
+    MAX_COMPILED_TABLES = 128
+
+    def __init__(self, behavior_patterns:dict):
+        self.__patterns = [(key, values["Behavior"], values["Target_type"]) for key, values in behavior_patterns.items() if values["Target_type"] in ("single", "grouping")]
+        self.__slot_by_name = {key: slot for slot, (key, _, _) in enumerate(self.__patterns)}
+        self.__slot_by_type = {}
+
+    @classmethod
+    def compile(cls, behavior_patterns:dict) -> 'BehaviorDispatchTable':
+        """Retourne la table compilée des patterns de comportement, partagée entre les dictionnaires de même contenu"""
+        return cls.__compile(tuple((key, values["Behavior"], values["Target_type"]) for key, values in behavior_patterns.items()))
+
+    @staticmethod
+    @lru_cache(maxsize=MAX_COMPILED_TABLES)
+    def __compile(signature:tuple) -> 'BehaviorDispatchTable':
+        return BehaviorDispatchTable({key: {"Behavior": behavior, "Target_type": target_type} for key, behavior, target_type in signature})
+
+    @property
+    def patterns(self):
+        """Retourne les patterns (clé, comportement, type de cible) qui ont une cible, dans l'ordre du dictionnaire"""
+        return self.__patterns
+
+    def bucket(self, seen_entities:list) -> list:
+        """Retourne, pour chaque pattern, la liste des entités vues qui lui correspondent, dans l'ordre où elles ont été vues"""
+        groups = [[] for _ in self.__patterns]
+        slot_by_type = self.__slot_by_type
+        for seen_entity in seen_entities:
+            entity_type = type(seen_entity)
+            if entity_type in slot_by_type:
+                slot = slot_by_type[entity_type]
+            else:
+                slot = slot_by_type[entity_type] = self.__slot_by_name.get(entity_type.__name__)
+            if slot is not None:
+                groups[slot].append(seen_entity)
+        return groups
+
+
 class Brain():
     """
     Commentée par Andrzej Wisniowski
@@ -646,9 +1340,11 @@ class Brain():
     - `Brain.__owner` : l'entité propriétaire
     - `Brain.__environment` : l'environnement dans lequel évolue l'entité
     - `Brain.__behavior_patterns` : la liste des patterns de comportement
+    - `Brain.__dispatch_table` : les patterns de comportement compilés par `BehaviorDispatchTable`
     - `Brain.__seen_entities` : la liste des entités vues par le cerveau
     - `Brain.__active_behaviors` : la liste des comportements actifs
     - `Brain.__permanent_patterns` : la liste des patterns de comportement permanents
+    - `Brain.__behavior_pool` : les comportements réutilisés d'un tick à l'autre au lieu d'être recréés
 
     Exemple d'utilisation :
         >>> brain = Brain(SentientCircle(), Simulation())
@@ -685,6 +1381,10 @@ class Brain():
             Si aucun pattern n'est passé en paramètre, les patterns par défaut sont utilisés.
             """
         else: self.__behavior_patterns = behavior_patterns
+        self.__dispatch_table = BehaviorDispatchTable.compile(self.__behavior_patterns)
+        """
+        Les patterns de comportement compilés en table indexée par type d'entité
+        """
         self.__permanent_patterns = [BorderRepulsion(sim_dim=environment.size)]
         """
         La liste des patterns de comportement permanents
@@ -695,42 +1395,66 @@ class Brain():
         La liste des entités vues par le cerveau
         
         """
-        self.__active_behaviors = self.__permanent_patterns
+        self.__active_behaviors = list(self.__permanent_patterns)
         """
         La liste des comportements actifs
         """
+        self.__behavior_pool = {}
+        """
+        Les comportements réutilisés d'un tick à l'autre, une liste par clé de pattern.
+        Pour une clé "single", le i-ème comportement de la liste sert la i-ème entité vue de ce type.
+        """
 
-    def process(self) -> None:
+    def process(self, seen_entities_by_eye:dict=None) -> None:
         """
         Traite les informations collectées par les capteurs du propriétaire, et applique les patterns de comportement correspondants.
+
+        Args:
+            seen_entities_by_eye (dict, optional): les entités vues par chaque oeil, déjà calculées pour tout le monde (voir `FlockStore.look`). Si None, chaque oeil regarde lui-même. Defaults to None.
         """
         self.__seen_entities = []
-        self.__active_behaviors = []
+        self.__active_behaviors.clear()
         self.__active_behaviors.extend(self.__permanent_patterns)
         for eye in self.__owner.eyes:
-            self.__seen_entities = eye.look(self.__environment)
+            if seen_entities_by_eye is None:
+                self.__seen_entities = eye.look(self.__environment)
+            else:
+                self.__seen_entities = seen_entities_by_eye[eye]
 
         if self.__seen_entities:
-            for key in self.__behavior_patterns:
-                values = self.__behavior_patterns[key]
-                if values["Target_type"] == "single":
-                    for seen_entity in self.__seen_entities:
-                        if seen_entity.__class__.__name__ == key:
-                            behavior = self.__behavior_patterns[seen_entity.__class__.__name__]["Behavior"]
-                            self.__active_behaviors.append(behavior([seen_entity]))
-                elif values["Target_type"] == "grouping":
-                    target_group = []
-                    behavior = values["Behavior"]
-                    for seen_entity in self.__seen_entities:
-                        if seen_entity.__class__.__name__ == key:
-                            target_group.append(seen_entity)
-                    if target_group:
-                        self.__active_behaviors.append(behavior(target_group))
+            target_groups = self.__dispatch_table.bucket(self.__seen_entities)
+            for (key, behavior, target_type), target_group in zip(self.__dispatch_table.patterns, target_groups):
+                if not target_group:
+                    continue
+                if target_type == "single":
+                    for count, seen_entity in enumerate(target_group):
+                        self.__active_behaviors.append(self.__pooled_behavior(key, count, behavior, [seen_entity]))
+                else:
+                    self.__active_behaviors.append(self.__pooled_behavior(key, 0, behavior, target_group))
         else: 
             behavior = self.__behavior_patterns["No_target"]["Behavior"]
-            self.__active_behaviors.append(behavior())
+            self.__active_behaviors.append(self.__pooled_behavior("No_target", 0, behavior))
         self.behave()
 
+    def __pooled_behavior(self, key:str, index:int, behavior_class:type, target_entities:list=None) -> SteeringBehavior:
+        """
+        Retourne le comportement réutilisable numéro `index` de la clé `key`, redirigé vers `target_entities`.
+        Le comportement n'est créé que la première fois ou si le pattern a changé de classe de comportement.
+        Sans cible (pattern "none"), le comportement garde son état d'un tick à l'autre (cercle de Wander, angle de PseudoWander).
+        """
+        pool = self.__behavior_pool.setdefault(key, [])
+        if index < len(pool) and type(pool[index]) is behavior_class:
+            behavior = pool[index]
+            if target_entities is not None:
+                behavior.retarget(target_entities)
+            return behavior
+        behavior = behavior_class() if target_entities is None else behavior_class(target_entities)
+        if index < len(pool):
+            pool[index] = behavior
+        else:
+            pool.append(behavior)
+        return behavior
+
     def draw_line_to_seen_entities(self, draw) -> None:
         """
         Dessine une ligne entre le propriétaire et les entités vues par le cerveau, et surligne l'entité propriétaire avec un halo bleu.
@@ -744,10 +1468,7 @@ class Brain():
         """
         Applique les comportements actifs sur l'entité propriétaire.
         """
-        for behavior in self.__active_behaviors:
-                self.__owner.steering_force.set(self.__owner.steering_force.x + behavior.behave(origin_entity=self.__owner).x, self.__owner.steering_force.y + behavior.behave(origin_entity=self.__owner).y)
-
-        self.__owner.steering_force.set_polar(length= Utils.clamp_max(self.__owner.steering_force.length, self.__owner.max_steering_force), orientation=self.__owner.steering_force.orientation)     
+        self.__owner.accumulate_steering(self.__active_behaviors)
 
     @property
     def active_behaviors(self):
@@ -776,6 +1497,8 @@ class Brain():
         Définit la liste des patterns de comportement.
         """
         self.__behavior_patterns = value
+        self.__dispatch_table = BehaviorDispatchTable.compile(value)
+        self.__behavior_pool = {}
 
 
 class Eye(Drawable):
@@ -784,12 +1507,11 @@ class Eye(Drawable):
         Drawable.__init__(self, border_color=RGBAColor(), border_width=1, fill_color=None, position=self.__owner.position, size=Vect2D(range, range))
         self.__fov = fov
         self.__range = range
-        if vector is None:
-            self.__vector = owner.speed
+        self.__vector = vector
 
     def look(self, simulation):
         seen_sprites = []
-        for sprite in simulation.sprites:
+        for sprite in simulation.sprites_near(self.__owner.position, self.__range):
             if sprite is not self.__owner and self.sees(sprite):
                 seen_sprites.append(sprite)
         return seen_sprites
@@ -800,7 +1522,7 @@ class Eye(Drawable):
     def is_in_fov(self, target:Vect2D)->bool:
         distance_to_target = target.position - self.__owner.position
         if distance_to_target.is_defined:
-            return self.__vector.angle_between_degrees(distance_to_target) <= self.__fov
+            return self.vector.angle_between_degrees(distance_to_target) <= self.__fov
         else:
             return True
         
@@ -813,11 +1535,15 @@ class Eye(Drawable):
                 self.__owner.position.y - self.__range,
                 self.__owner.position.x + self.__range,
                 self.__owner.position.y + self.__range],
-                start=self.__vector.orientation_degrees - self.__fov,
-                end=self.__vector.orientation_degrees + self.__fov,
+                start=self.vector.orientation_degrees - self.__fov,
+                end=self.vector.orientation_degrees + self.__fov,
                 width=self.border_width,
                 outline=self.border_color)
 
+    @property
+    def owner(self):
+        return self.__owner
+
     @property
     def fov(self):
         return self.__fov
@@ -826,6 +1552,11 @@ class Eye(Drawable):
     def range(self):
         return self.__range
 
+    @property
+    def vector(self):
+        """La direction du regard, la vitesse du propriétaire si aucun vecteur n'a été donné"""
+        return self.__owner.speed if self.__vector is None else self.__vector
+
     @property
     def position(self):
         return self.__position
@@ -903,6 +1634,10 @@ class Entity(Drawable, Updatable):
         #get a random name from the list
         self.__name = random.choice(self.__available_names)
 
+        self.__spatial_index = None
+        self.__flock = None
+        self.__flock_row = None
+
     @abstractmethod
     def draw(self):
         pass
@@ -915,6 +1650,26 @@ class Entity(Drawable, Updatable):
     def name(self):
         return self.__name
 
+    @property
+    def spatial_index(self):
+        return self.__spatial_index
+
+    @spatial_index.setter
+    def spatial_index(self, spatial_index):
+        self.__spatial_index = spatial_index
+
+    @property
+    def flock(self):
+        return self.__flock
+
+    @property
+    def flock_row(self):
+        return self.__flock_row
+
+    def bind_to_flock(self, flock, row):
+        self.__flock = flock
+        self.__flock_row = row
+
 
 class Circle(Entity):
     def __init__(self, border_color = RGBAColor(randomize=True), border_width = 5, fill_color = RGBAColor(0,0,0,255),  position=Vect2D(random.randrange(0,1000),random.randrange(0,500)), radius:int=50):
@@ -929,6 +1684,10 @@ class Circle(Entity):
     @radius.setter
     def radius(self, radius):
         self.__radius = radius
+        if self.spatial_index is not None:
+            self.spatial_index.fit_radius(radius)
+        if self.flock is not None:
+            self.flock.radius[self.flock_row] = radius
 
     def draw(self, draw):
         self.fill_color
@@ -1006,7 +1765,7 @@ class DynamicCircle(Circle, Movable, Piloted):
         Piloted.__init__(self, max_steering_force, steering_force, steering_behaviors)
         
         
-    def draw(self, draw:ImageDraw):
+    def draw(self, draw:'ImageDraw.ImageDraw'):
         """Methode generique de dessin d'un cercle dynamique
 
         Args:
@@ -1014,7 +1773,7 @@ class DynamicCircle(Circle, Movable, Piloted):
         """
         Circle.draw(self, draw)
 
-    def draw_circle_speed(self, draw:ImageDraw):
+    def draw_circle_speed(self, draw:'ImageDraw.ImageDraw'):
         """Methode de dessin de la vitesse du cercle dynamique
 
         Args:
@@ -1022,14 +1781,22 @@ class DynamicCircle(Circle, Movable, Piloted):
         """
         draw.line([self.position.x, self.position.y, self.position.x + self.speed.x, self.position.y + self.speed.y], fill="red", width=5)
         
-    def draw_circle_steering_force(self, draw:ImageDraw):
+    def draw_circle_steering_force(self, draw:'ImageDraw.ImageDraw'):
         """Methode de dessin de la force de déplacement du cercle dynamique
 
         Args:
             draw (ImageDraw): Objwet necessaire pour dessiner sur une image
         """
         draw.line([self.position.x, self.position.y, self.position.x + self.steering_force.x * 10, self.position.y + self.steering_force.y * 10], fill="darkgoldenrod", width=5)
-        for steering_behavior in self.steering_behaviors:
+        self.draw_steering_overlays(draw)
+
+    def draw_steering_overlays(self, draw:'ImageDraw.ImageDraw'):
+        """Methode de dessin des comportements de déplacement du cercle dynamique (cercle de Wander, centre de gravité...)
+
+        Args:
+            draw (ImageDraw): Objet necessaire pour dessiner sur une image
+        """
+        for steering_behavior in self.steering_behaviors or ():
             if hasattr(steering_behavior, "draw"):
                     steering_behavior.draw(draw)
             
@@ -1070,11 +1837,20 @@ class SentientCircle(DynamicCircle):
             eye.draw(draw)    
         self.__brain.draw_line_to_seen_entities(draw)
 
-    def draw_circle_steering_force(self, draw):
-        draw.line([self.position.x, self.position.y, self.position.x + self.steering_force.x * 10, self.position.y + self.steering_force.y * 10], fill="darkgoldenrod", width=5)
+    def draw_steering_overlays(self, draw):
         for steering_behavior in self.__brain.active_behaviors:
             if hasattr(steering_behavior, "draw"):
                     steering_behavior.draw(draw)
+
+    @property
+    def fov_reach(self):
+        """Retourne la distance à la position dans laquelle draw_fov dessine : portée des yeux, lignes vers les entités vues et halo"""
+        reach = self.radius * 1.25
+        for eye in self.__eyes:
+            reach = max(reach, eye.range)
+        for seen_entity in self.__brain.seen_entities:
+            reach = max(reach, self.position.distance_from(seen_entity.position))
+        return reach + 3
                     
     @property
     def eyes(self):
@@ -1126,6 +1902,196 @@ class PreyCircle(SentientCircle):
         self.eyes = [Eye(self, fov = 95, range = 100)]
 
 
+class FlockStore():
+    """
+    Stockage en tableaux (struct-of-arrays) de l'état de toutes les entités d'une simulation.
+
+    Chaque entité reçoit une ligne dans des tableaux NumPy contigus (position, speed, acceleration,
+    steering_force, radius, max_speed) et ses vecteurs deviennent des `Vect2DView` sur cette ligne.
+    Le code scalaire (comportements, Brain, GUI) continue de fonctionner sur les vues, pendant que les
+    moteurs vectorisés travaillent directement sur les tableaux. Le rayon et la vitesse maximale sont
+    recopiés dans les tableaux par leurs mutateurs.
+
+    Les entités qui ne bougent pas (les obstacles `Circle`) n'ont que leur position et leur rayon dans
+    les tableaux, `is_movable` les distingue.
+
+    Exemple:
+        >>> sprites = [DynamicCircle(position=Vect2D(10, 20), speed=Vect2D(1, 2), radius=5), Circle(position=Vect2D(30, 40), radius=8)]
+        >>> flock = FlockStore(sprites)
+        >>> flock.position.tolist()
+        [[10.0, 20.0], [30.0, 40.0]]
+        >>> sprites[0].position.set(11, 21)
+        >>> flock.position[0].tolist()
+        [11.0, 21.0]
+        >>> flock.speed[0, 0] = 3
+        >>> print(sprites[0].speed.x)
+        3.0
+        >>> sprites[1].radius = 9
+        >>> flock.radius.tolist(), flock.is_movable.tolist()
+        ([5.0, 9.0], [True, False])
+    """
+    def __init__(self, sprites:list):
+        if np is None:
+            raise ImportError("the flock store requires numpy")
+        count = len(sprites)
+        self.__sprites = list(sprites)
+        self.__position = np.zeros((count, 2))
+        self.__speed = np.zeros((count, 2))
+        self.__acceleration = np.zeros((count, 2))
+        self.__steering_force = np.zeros((count, 2))
+        self.__radius = np.zeros(count)
+        self.__max_speed = np.zeros(count)
+        self.__is_movable = np.zeros(count, dtype=bool)
+        for row, sprite in enumerate(self.__sprites):
+            self.__bind(sprite, row)
+
+    def __bind(self, sprite, row):
+        self.__position[row] = (sprite.position.x, sprite.position.y)
+        sprite.position = Vect2DView(self.__position, row)
+        self.__radius[row] = sprite.radius
+        if isinstance(sprite, Movable):
+            self.__is_movable[row] = True
+            self.__speed[row] = (sprite.speed.x, sprite.speed.y)
+            self.__acceleration[row] = (sprite.acceleration.x, sprite.acceleration.y)
+            self.__max_speed[row] = sprite.max_speed
+            sprite.speed = Vect2DView(self.__speed, row)
+            sprite.acceleration = Vect2DView(self.__acceleration, row)
+        if isinstance(sprite, Piloted):
+            self.__steering_force[row] = (sprite.steering_force.x, sprite.steering_force.y)
+            sprite.steering_force = Vect2DView(self.__steering_force, row)
+        sprite.bind_to_flock(self, row)
+
+    def __len__(self):
+        return len(self.__sprites)
+
+    def integrate(self, time:float) -> None:
+        """
+        Déplace d'un coup toutes les entités mobiles, avec exactement les mêmes calculs que `Movable.move` :
+        même terme d'accélération, puis la force de direction ajoutée à la vitesse, bornée composante par
+        composante à `max_speed`. Les bornes reproduisent `min` et `max` de Python, y compris pour NaN.
+
+        Exemple: 1000 ticks comparés bit pour bit avec `Movable.move`
+            >>> rng = random.Random(7)
+            >>> states = [(rng.uniform(0, 1000), rng.uniform(0, 500), rng.uniform(-50, 50), rng.uniform(-50, 50), rng.uniform(-1, 1), rng.uniform(-1, 1), rng.choice([5, 50, 100])) for _ in range(100)]
+            >>> def make_flock():
+            ...     return [DynamicCircle(position=Vect2D(x, y), speed=Vect2D(vx, vy), acceleration=Vect2D(ax, ay), max_speed=max_speed, steering_force=Vect2D()) for x, y, vx, vy, ax, ay, max_speed in states]
+            >>> scalar, batch = make_flock(), make_flock()
+            >>> flock = FlockStore(batch)
+            >>> for _ in range(1000):
+            ...     forces = [(rng.uniform(-20, 20), rng.uniform(-20, 20)) for _ in states]
+            ...     for sprite, (force_x, force_y) in zip(scalar, forces):
+            ...         sprite.steering_force.set(force_x, force_y)
+            ...         sprite.move(0.1)
+            ...     flock.steering_force[:] = forces
+            ...     flock.integrate(0.1)
+            >>> all((a.position.x, a.position.y, a.speed.x, a.speed.y) == (b.position.x, b.position.y, b.speed.x, b.speed.y) for a, b in zip(scalar, batch))
+            True
+        """
+        if self.__is_movable.all():
+            rows = slice(None)
+        else:
+            rows = self.__is_movable
+        position = self.__position[rows]
+        speed = self.__speed[rows]
+        max_speed = self.__max_speed[rows][:, np.newaxis]
+        self.__position[rows] = position + speed * time + self.__acceleration[rows] * 0.5 ** 2 * time
+        speed = speed + self.__steering_force[rows]
+        speed = np.where(max_speed < speed, max_speed, speed)
+        self.__speed[rows] = np.where(speed > -max_speed, speed, -max_speed)
+
+    def look(self, eyes:list) -> dict:
+        """
+        Calcule d'un coup ce que voit chaque oeil et retourne un dictionnaire oeil -> liste des entités vues,
+        dans l'ordre des lignes, comme `Eye.look`. Les yeux doivent appartenir à des entités du FlockStore.
+
+        La portée est comparée au carré (distance² <= (range + radius)²) et le champ de vision compare le
+        produit scalaire avec cos(fov) au lieu d'appeler `acos`. Les observateurs sont traités par blocs
+        pour borner la mémoire des matrices observateurs x cibles.
+
+        Exemple:
+            >>> sprites = [SentientCircle(position=Vect2D(0, 0), speed=Vect2D(1, 0), radius=5, environment=Simulation()) for _ in range(3)]
+            >>> sprites[1].position.set(50, 10)
+            >>> sprites[2].position.set(-50, 0)
+            >>> flock = FlockStore(sprites)
+            >>> seen = flock.look([sprites[0].eyes[0]])
+            >>> seen[sprites[0].eyes[0]] == [sprites[1]]
+            True
+        """
+        seen_entities_by_eye = {}
+        if not eyes:
+            return seen_entities_by_eye
+        rows = np.array([eye.owner.flock_row for eye in eyes])
+        vectors = np.array([(eye.vector.x, eye.vector.y) for eye in eyes])
+        fov = np.array([eye.fov for eye in eyes], dtype=float)
+        reach = np.array([eye.range for eye in eyes], dtype=float)
+        cos_fov = np.cos(np.radians(fov))
+        is_fov_full = fov >= 180
+        is_fov_empty = fov < 0
+        vector_length_squared = vectors[:, 0] ** 2 + vectors[:, 1] ** 2
+        block = max(1, 2 ** 20 // len(self.__sprites))
+        for start in range(0, len(eyes), block):
+            block_rows = slice(start, start + block)
+            offset = self.__position[np.newaxis, :, :] - self.__position[rows[block_rows], np.newaxis, :]
+            offset_x = offset[:, :, 0]
+            offset_y = offset[:, :, 1]
+            distance_squared = offset_x * offset_x + offset_y * offset_y
+            reach_with_radius = reach[block_rows, np.newaxis] + self.__radius[np.newaxis, :]
+            is_in_range = distance_squared <= reach_with_radius * reach_with_radius
+            dot = vectors[block_rows, 0, np.newaxis] * offset_x + vectors[block_rows, 1, np.newaxis] * offset_y
+            is_in_cone = dot >= cos_fov[block_rows, np.newaxis] * np.sqrt(vector_length_squared[block_rows, np.newaxis] * distance_squared)
+            is_in_cone = (is_in_cone | is_fov_full[block_rows, np.newaxis]) & ~is_fov_empty[block_rows, np.newaxis]
+            is_on_observer = (offset_x == 0) & (offset_y == 0)
+            sees = is_in_range & (is_in_cone | is_on_observer)
+            sees[np.arange(sees.shape[0]), rows[block_rows]] = False
+            for eye, visible in zip(eyes[block_rows], sees):
+                seen_entities_by_eye[eye] = [self.__sprites[row] for row in np.flatnonzero(visible).tolist()]
+        return seen_entities_by_eye
+
+    def covers(self, sprites:list) -> bool:
+        """Retourne True si chaque sprite de la liste a sa ligne dans le stockage, dans le même ordre"""
+        return len(sprites) == len(self.__sprites) and all(sprite is stored for sprite, stored in zip(sprites, self.__sprites))
+
+    @property
+    def sprites(self):
+        """Retourne les entités, dans l'ordre des lignes"""
+        return self.__sprites
+
+    @property
+    def position(self):
+        """Retourne le tableau (N, 2) des positions"""
+        return self.__position
+
+    @property
+    def speed(self):
+        """Retourne le tableau (N, 2) des vitesses"""
+        return self.__speed
+
+    @property
+    def acceleration(self):
+        """Retourne le tableau (N, 2) des accélérations"""
+        return self.__acceleration
+
+    @property
+    def steering_force(self):
+        """Retourne le tableau (N, 2) des forces de direction"""
+        return self.__steering_force
+
+    @property
+    def radius(self):
+        """Retourne le tableau (N,) des rayons"""
+        return self.__radius
+
+    @property
+    def max_speed(self):
+        """Retourne le tableau (N,) des vitesses maximales"""
+        return self.__max_speed
+
+    @property
+    def is_movable(self):
+        """Retourne le masque (N,) des entités qui se déplacent"""
+        return self.__is_movable
+
+
 class Simulation(Updatable):
     """ 
         Commentée par Alexis Provost
@@ -1141,6 +2107,10 @@ class Simulation(Updatable):
             - :param is_running: bool, True si la simulation est en cours, False sinon
             - :param seed: int, le seed pour la génération aléatoire
             - :param selected_entity: Entity, l'entité sélectionnée par le click de la souris
+            - :param spatial_index: str, l'index spatial utilisé par les yeux, "grid" (grille uniforme) ou "quadtree" (arbre adaptatif pour les groupes denses)
+            - :param flock_store: bool, True pour stocker l'état des entités dans un FlockStore (tableaux NumPy), False sinon.
+              Les entités bougent alors toutes avant de toutes regarder (voir __tick_flock)
+            - :param collisions: bool, True pour séparer et faire rebondir les sprites qui se chevauchent à la fin de chaque tick
         
         Exemples: Créé une simulation et l'initialise un scénario
         >>> sim = Simulation()
@@ -1148,23 +2118,35 @@ class Simulation(Updatable):
         >>> print(len(sim.sprites))
         256
     """
-    def __init__(self, size=Vect2D(100,100)):
+    def __init__(self, size=Vect2D(100,100), spatial_index:str="grid", flock_store:bool=False, collisions:bool=False):
         self.__size = size
         self.__sprites = []
         self.__mouse_pos = Vect2D(-1, -1)
         self.__is_running = True
         self.__seed = 0
         self.__selected_entity = None
+        self.__use_flock_store = flock_store
+        self.__flock = None
+        self.__collisions = CollisionDetector() if collisions else None
+        self.__generation = 0
+        match spatial_index:
+            case "grid":
+                self.__spatial_index = SpatialGrid()
+            case "quadtree":
+                self.__spatial_index = QuadTree(size)
+            case _:
+                raise ValueError("unknown spatial index: {}".format(spatial_index))
         
         self.initialize_scenario()
 
-    def initialize_scenario(self, key:str="Red chasing Green"): 
+    def initialize_scenario(self, key:str="Red chasing Green", boid_count:int=None): 
+        """Crée les sprites du scénario; `boid_count` remplace le nombre d'entités mobiles du scénario s'il est donné"""
         key = key.replace("\n", "")
         nb_balls = 0
                 
         match key:
             case 'Seek, Flee or Wander':
-                nb_balls = 250
+                nb_balls = 250 if boid_count is None else boid_count
                 for i in range(nb_balls):
                     self.__sprites.append(DynamicCircle(    border_color=RGBAColor(randomize=True),
                                                             border_width=5,
@@ -1188,7 +2170,7 @@ class Simulation(Updatable):
                     sprite.fill_color = RGBAColor(0, 128, 0, 255) if type(random_steering_behavior) is Flee else RGBAColor(128, 0, 0, 255) if type(random_steering_behavior) is Seek else RGBAColor(0, 0, 128, 255)
 
             case 'Seek or Flee Mouse':
-                nb_balls = 20
+                nb_balls = 20 if boid_count is None else boid_count
                 for i in range(nb_balls):
                     random_steering_behavior = random.choice([Seek([self.__mouse_pos]), Flee([self.__mouse_pos])])
 
@@ -1205,7 +2187,7 @@ class Simulation(Updatable):
                                                             steering_behaviors=[Wander(), random_steering_behavior, BorderRepulsion(sim_dim=self.__size)]))
 
             case 'Follow the leader':
-                nb_balls = 20
+                nb_balls = 20 if boid_count is None else boid_count
                 for i in range(nb_balls):
                     self.__sprites.append(DynamicCircle(position=Vect2D(random.randrange(0, int(self.width)),random.randrange(0, int(self.height))),
                                                         speed=Vect2D(random.randrange(-50,50),random.randrange(-50,50)),
@@ -1226,7 +2208,7 @@ class Simulation(Updatable):
                     else: sprite.radius = nb_balls * 2
                     
             case 'Cohesion':
-                nb_balls = 50
+                nb_balls = 50 if boid_count is None else boid_count
                 for i in range(nb_balls):
                                 self.__sprites.append(SentientCircle(border_color=RGBAColor(randomize=True),
                                                             border_width=5,
@@ -1242,7 +2224,7 @@ class Simulation(Updatable):
                                                             ))
         
             case 'Alignment':
-                nb_balls = 50
+                nb_balls = 50 if boid_count is None else boid_count
 
                 behavior_patterns =  {  "DynamicCircle": { "Behavior": Evade, "Target_type" : "single" }, 
                                         "SentientCircle": { "Behavior": Alignment, "Target_type" : "grouping" },
@@ -1269,7 +2251,7 @@ class Simulation(Updatable):
 
 
             case 'Follow Biggest Boid Seen':
-                nb_balls = 50
+                nb_balls = 50 if boid_count is None else boid_count
 
                 behavior_patterns =  {  "DynamicCircle": { "Behavior": Evade, "Target_type" : "single" }, 
                                         "SentientCircle": { "Behavior": FollowBiggestBoidSeen, "Target_type" : "grouping" },
@@ -1296,12 +2278,13 @@ class Simulation(Updatable):
 
                 for sprite in self.__sprites:
                     sprite.brain.behavior_patterns = behavior_patterns
-                    sprite.eye.fov = eye_fov
-                    sprite.eye.range = eye_range
+                    for eye in sprite.eyes:
+                        eye.fov = eye_fov
+                        eye.range = eye_range
 
             case "Rise of Sentience":
-                nb_sentients = 10
-                nb_dumbs = 10
+                nb_sentients = 10 if boid_count is None else boid_count - boid_count // 2
+                nb_dumbs = 10 if boid_count is None else boid_count // 2
                 for i in range(nb_sentients):
                     self.__sprites.append(SentientCircle(border_color=RGBAColor(randomize=True),
                             border_width=5,
@@ -1333,7 +2316,7 @@ class Simulation(Updatable):
             case 'Predator Chasing Prey': # Default
                 nb_obstacles = 0
                 nb_predators = 1
-                nb_preys = 50
+                nb_preys = 50 if boid_count is None else boid_count
                 for _ in range(nb_predators):
                     self.__sprites.append(PredatorCircle(position=Vect2D(random.randrange(0, int(self.width)),random.randrange(0, int(self.height))),
                                                         speed=Vect2D(random.randrange(-50,50),random.randrange(-50,50)),
@@ -1365,7 +2348,7 @@ class Simulation(Updatable):
             
             case 'Avoid Obstacles':
                 nb_obstacles = 20
-                nb_sentient_circles = 10
+                nb_sentient_circles = 10 if boid_count is None else boid_count
                         
                 for _ in range(nb_obstacles):
                     self.__sprites.append(Circle(   position=Vect2D(random.randrange(0, int(self.width)),random.randrange(0, int(self.height))),
@@ -1387,7 +2370,7 @@ class Simulation(Updatable):
 
 
             case 'Red chasing Green': # Default
-                nb_balls = 6
+                nb_balls = 6 if boid_count is None else boid_count
                 for i in range(nb_balls):
                     self.__sprites.append(DynamicCircle(position=Vect2D(random.randrange(0, int(self.width)),random.randrange(0, int(self.height))),
                                                         speed=Vect2D(random.randrange(-50,50),random.randrange(-50,50)),
@@ -1405,17 +2388,100 @@ class Simulation(Updatable):
                     if i%2 == 0 and i != len(self.__sprites) - 1:
                         self.__sprites[i].steering_behaviors.append(Evade([self.__sprites[i+1]]))
 
+        if self.__use_flock_store:
+            self.__flock = FlockStore(self.__sprites)
+        self.__spatial_index.rebuild(self.__sprites)
+        self.__generation += 1
+
     def tick(self, time):
         """Fait bouger les Entities, est appelée par la fonction update() de la classe App"""
         if self.__sprites:
-            for sprite in self.__sprites:
-                sprite.tick(time)
+            if not self.__spatial_index.is_synced_with(self.__sprites):
+                self.__spatial_index.rebuild(self.__sprites)
+            if self.__flock is not None and self.__flock.covers(self.__sprites):
+                self.__tick_flock(time)
+            else:
+                for sprite in self.__sprites:
+                    sprite.tick(time)
+            if self.__collisions is not None:
+                self.__resolve_collisions()
 
-    def reset(self, key:str="Red chasing Green"):
+    def __resolve_collisions(self):
+        """
+        Sépare les sprites qui se chevauchent et remet à jour l'index spatial de ceux qui ont bougé.
+        Tous les sprites déplacés sont remis à jour d'un coup : un sprite poussé dans un noeud du QuadTree peut le
+        faire se diviser alors qu'un autre sprite de ce noeud vient d'en sortir.
+
+        Exemple:
+            >>> simulation = Simulation(size=Vect2D(100, 100), spatial_index="quadtree", collisions=True)
+            >>> simulation.sprites.clear()
+            >>> positions = [(51, 40), (54, 40), (48, 20), (45, 20), (5, 5), (15, 5), (25, 5), (35, 5), (5, 45), (15, 45), (90, 90)]
+            >>> simulation.sprites.extend(DynamicCircle(position=Vect2D(x, y), radius=4, speed=Vect2D(0, 0), steering_behaviors=[]) for x, y in positions)
+            >>> simulation.sprites[-1].eyes = [Eye(simulation.sprites[-1])]
+            >>> simulation.tick(0.1)
+            >>> print(*(sprite.position for sprite in simulation.sprites[:4]))
+            (4.85E+01, 4.00E+01) (5.65E+01, 4.00E+01) (5.05E+01, 2.00E+01) (4.25E+01, 2.00E+01)
+            >>> len(simulation.sprites_near(Vect2D(50, 50), 100))
+            11
+        """
+        bodies = [sprite for sprite in self.__sprites if hasattr(sprite, "radius")]
+        moved = {bodies[index] for pair in self.__collisions.resolve(bodies) for index in pair}
+        self.__spatial_index.update_all([sprite for sprite in self.__sprites if sprite in moved and sprite.spatial_index is not None and isinstance(sprite, Movable)])
+
+    def __tick_flock(self, time):
+        """
+        tick() par phases quand tous les sprites sont dans le FlockStore : toutes les entités s'orientent,
+        le FlockStore les déplace toutes d'un coup, calcule d'un coup ce que voit chaque oeil, puis les
+        entités intelligentes décident.
+        Contrairement à la boucle sprite par sprite, chaque entité voit toutes les autres au même instant.
+        C'est voulu : la mise à jour simultanée ne dépend plus de l'ordre des sprites. Les positions d'un tick
+        ne dépendent que des vitesses du tick précédent, donc l'écart avec la boucle sprite par sprite est
+        borné : d'un tick à l'autre, les vitesses diffèrent d'au plus deux fois la force de direction maximale.
+        Sans entité qui regarde les autres, les deux boucles donnent exactement le même résultat.
+
+        Exemples:
+            >>> def run(key, flock_store, ticks, boid_count=None, spatial_index="grid"):
+            ...     random.seed(3)
+            ...     simulation = Simulation(size=Vect2D(1000, 500), spatial_index=spatial_index, flock_store=flock_store)
+            ...     simulation.reset(key, boid_count)
+            ...     for _ in range(ticks):
+            ...         simulation.tick(0.1)
+            ...     return simulation
+            >>> def states(simulation):
+            ...     return [(sprite.position.as_tuple, sprite.speed.as_tuple if isinstance(sprite, Movable) else None) for sprite in simulation.sprites]
+            >>> states(run("Seek or Flee Mouse", True, 200)) == states(run("Seek or Flee Mouse", False, 200))
+            True
+            >>> scalar, phased = run("Predator Chasing Prey", False, 2, 30), run("Predator Chasing Prey", True, 2, 30)
+            >>> all(a.position == b.position for a, b in zip(scalar.sprites, phased.sprites))
+            True
+            >>> all(abs(a.speed.x - b.speed.x) <= 2 * a.max_steering_force and abs(a.speed.y - b.speed.y) <= 2 * a.max_steering_force for a, b in zip(scalar.sprites, phased.sprites) if isinstance(a, Movable))
+            True
+
+            Le QuadTree suit les entités déplacées toutes d'un coup
+            >>> len(run("Predator Chasing Prey", True, 40, 100, "quadtree").sprites)
+            101
+        """
+        for sprite in self.__sprites:
+            if isinstance(sprite, Piloted):
+                sprite.steer()
+        self.__flock.integrate(time)
+        self.__spatial_index.update_all([sprite for sprite in self.__sprites if sprite.spatial_index is not None and isinstance(sprite, Movable)])
+        sentients = [sprite for sprite in self.__sprites if isinstance(sprite, SentientCircle)]
+        seen_entities_by_eye = self.__flock.look([eye for sprite in sentients for eye in sprite.eyes])
+        for sprite in sentients:
+            sprite.brain.process(seen_entities_by_eye)
+
+    def sprites_near(self, position:Vect2D, distance:float) -> list:
+        """Retourne les sprites pouvant se trouver à moins de `distance` de `position`, dans l'ordre de la liste des sprites"""
+        if self.__spatial_index.is_built:
+            return self.__spatial_index.query(position, distance)
+        return self.__sprites
+
+    def reset(self, key:str="Red chasing Green", boid_count:int=None):
         """Remet la simulation à zéro"""
         self.__is_running = True
         self.__sprites = []
-        self.initialize_scenario(key)
+        self.initialize_scenario(key, boid_count)
 
     def move_mouse(self, event):
         """Met à jour la position de la souris"""
@@ -1426,7 +2492,8 @@ class Simulation(Updatable):
         self.__mouse_pos.set(-1, -1)
         
         for sprite in self.__sprites:
-            sprite.steering_force = Vect2D(0,0)
+            if isinstance(sprite, Piloted):
+                sprite.steering_force.set(0, 0)
 
     def mouse_entered(self, event):
         """Gère l'entrée de la souris dans la fenêtre"""
@@ -1457,6 +2524,21 @@ class Simulation(Updatable):
     def sprites(self):
         """Retourne la liste des sprites"""
         return self.__sprites
+
+    @property
+    def flock(self):
+        """Retourne le FlockStore des sprites, None s'il n'est pas activé"""
+        return self.__flock
+
+    @property
+    def generation(self):
+        """Retourne le nombre de scénarios chargés : il change quand les sprites sont remplacés, pas à chaque tick"""
+        return self.__generation
+
+    @property
+    def collisions(self):
+        """Retourne le CollisionDetector des sprites, None si les collisions ne sont pas activées"""
+        return self.__collisions
     
     @property
     def mouse_pos(self):
@@ -1484,495 +2566,531 @@ class Simulation(Updatable):
         return self.__is_running
 
 
-#   _______  __    __   __ 
-#  /  _____||  |  |  | |  |
-# |  |  __  |  |  |  | |  |
-# |  | |_ | |  |  |  | |  |
-# |  |__| | |  `--'  | |  |
-#  \______|  \______/  |__|
 
-class GUI(ttk.Frame, Drawable):
-    def __init__(self, border_color=None, border_width=None, fill_color=None, position=None, size:Vect2D=None):
-        ttk.Frame.__init__(self, root=None, text=None)
-        Drawable.__init__(self, border_color,  border_width, fill_color, position, size)
-        self.__main_panel = ControlBar()
-        self.__view_window = ViewWindow(size=Vect2D(size.x, size.y), fill_color=fill_color)
-        self.__main_panel.grid(row=0, column=1)
-        self.__view_window.grid(row=0, column=1, rowspan=4, sticky="ns")
+#  __________   ___  _______   ______  __    __  .___________. __    ______   .__   __.
+# |   ____\  \ /  / |   ____| /      ||  |  |  | |           ||  |  /  __  \  |  \ |  |
+# |  |__   \  V  /  |  |__   |  ,----'|  |  |  | `---|  |----`|  | |  |  |  | |   \|  |
+# |   __|   >   <   |   __|  |  |     |  |  |  |     |  |     |  | |  |  |  | |  . `  |
+# |  |____ /  .  \  |  |____ |  `----.|  `--'  |     |  |     |  | |  `--'  | |  |\   |
+# |_______/__/ \__\ |_______| \______| \______/      |__|     |__|  \______/  |__| \__|
 
-    @property
-    def main_panel(self):
-        return self.__main_panel
+class HeadlessRunner():
+    """
+        La classe HeadlessRunner fait tourner une Simulation sans interface graphique, aussi vite que possible.
+        Elle n'importe ni tkinter ni PIL : c'est elle qu'on utilise pour les traitements en lot et les mesures
+        de performance sur un serveur sans écran.
 
-    @property
-    def view_window(self):
-        return self.__view_window
+        Args:
+            - :param scenario: str, le nom du scénario (voir scenarios.txt)
+            - :param ticks: int, le nombre de ticks à exécuter
+            - :param boid_count: int, le nombre d'entités mobiles du scénario, None pour garder celui du scénario
+            - :param seed: int, le seed pour la génération aléatoire
+            - :param time_step: float, le pas de temps passé à Simulation.tick
+            - :param size: Vect2D, la taille de la simulation
+            - :param spatial_index: str, l'index spatial de la Simulation, "grid" ou "quadtree"
+            - :param flock_store: bool, True pour que la Simulation utilise un FlockStore
+            - :param collisions: bool, True pour que la Simulation sépare les sprites qui se chevauchent
+
+        Exemples:
+        >>> runner = HeadlessRunner("Predator Chasing Prey", ticks=5, boid_count=20)
+        >>> print(len(runner.simulation.sprites))
+        21
+        >>> runner.run() > 0
+        True
+        >>> print(runner.ticks_done)
+        5
+    """
+    def __init__(self, scenario:str="Red chasing Green", ticks:int=1000, boid_count:int=None, seed:int=0, time_step:float=0.1, size:Vect2D=Vect2D(1000, 500), spatial_index:str="grid", flock_store:bool=False, collisions:bool=False):
+        self.__scenario = scenario
+        self.__ticks = ticks
+        self.__time_step = time_step
+        self.__ticks_done = 0
+        self.__elapsed = 0.0
+        random.seed(seed)
+        self.__simulation = Simulation(size=size, spatial_index=spatial_index, flock_store=flock_store, collisions=collisions)
+        self.__simulation.reset(scenario, boid_count)
+
+    def run(self) -> float:
+        """Exécute tous les ticks et retourne le nombre de ticks par seconde; ferme un tick du Profiler actif après chacun"""
+        profiler = Profiler.active()
+        start = perf_counter()
+        if profiler is None:
+            for _ in range(self.__ticks):
+                self.__simulation.tick(self.__time_step)
+        else:
+            for _ in range(self.__ticks):
+                self.__simulation.tick(self.__time_step)
+                profiler.end_tick()
+        self.__elapsed = perf_counter() - start
+        self.__ticks_done = self.__ticks
+        return self.ticks_per_second
 
+    def report(self) -> str:
+        """Retourne le résumé de la dernière exécution, avec le nombre moyen de contacts par tick si les collisions sont activées"""
+        report = "{}: {} ticks, {} sprites, {:.3f} s, {:.1f} ticks/s".format(self.__scenario, self.__ticks_done, len(self.__simulation.sprites), self.__elapsed, self.ticks_per_second)
+        if self.__simulation.collisions is not None:
+            report += ", {:.1f} contacts/tick".format(self.__simulation.collisions.contacts_per_tick)
+        return report
 
-class ControlBar(ttk.Frame):
-    def __init__(self):
-        ttk.Frame.__init__(self)
-        self.__control_panel = StartStopPanel("Controls")
-        self.__param_panel = ParamPanel("Scenarios")
-        self.__visual_param_panel = VisualParamPanel("Visual Parameters")
-        self.__Info_panel = InfoPanel("Selected Entity Informations")
-        self.__control_panel.grid(row=0, column=0, sticky="N")
-        self.__param_panel.grid(row=1, column=0, sticky="N")
-        self.__visual_param_panel.grid(row=2, column=0, sticky="N")
-        self.__Info_panel.grid(row=3, column=0, sticky="N")
-
-    @property
-    def param_panel(self):
-        return self.__param_panel
-    
     @property
-    def control_panel(self):
-        return self.__control_panel
-    
-    @property
-    def visual_param_panel(self):
-        return self.__visual_param_panel
-    
+    def simulation(self):
+        """Retourne la simulation exécutée"""
+        return self.__simulation
+
     @property
-    def info_panel(self):
-        return self.__Info_panel
+    def ticks_done(self):
+        """Retourne le nombre de ticks exécutés"""
+        return self.__ticks_done
 
+    @property
+    def elapsed(self):
+        """Retourne la durée de la dernière exécution, en secondes"""
+        return self.__elapsed
 
-class StartStopPanel(ttk.LabelFrame):
-    def __init__(self, text): 
-        ttk.LabelFrame.__init__(self, root=None, text=text)
-        self.__start_stop_button = ttk.Button(self, text="Stop", width = 40)
-        self.__next_button = ttk.Button(self, text="Next Step", state="disabled", width = 40)
-        self.__reset_button = ttk.Button(self, text="Reset", width = 40)
-        self.__start_stop_button.grid(row=0, column=0)
-        self.__next_button.grid(row=1, column=0)
-        self.__reset_button.grid(row=2, column=0)
-        
     @property
-    def start_stop_button(self):
-        return self.__start_stop_button
-    
+    def ticks_per_second(self):
+        """Retourne le nombre de ticks par seconde de la dernière exécution"""
+        return self.__ticks_done / self.__elapsed if self.__elapsed else 0.0
+
+
+class DrawRecorder():
+    """
+        La classe DrawRecorder remplace un ImageDraw : elle enregistre les appels de dessin (ellipse, line, pieslice...)
+        au lieu de les exécuter, pour qu'ils soient rejoués plus tard, sur un autre thread, par replay().
+
+        Exemples:
+        >>> recorder = DrawRecorder()
+        >>> recorder.line([0, 0, 10, 10], fill="red", width=5)
+        >>> recorder.calls
+        (('line', ([0, 0, 10, 10],), {'fill': 'red', 'width': 5}),)
+    """
+    def __init__(self):
+        self.__calls = []
+
+    def __getattr__(self, name):
+        def record(*args, **kwargs):
+            self.__calls.append((name, args, kwargs))
+        return record
+
+    @staticmethod
+    def replay(draw, calls:tuple) -> None:
+        """Rejoue des appels enregistrés sur un ImageDraw"""
+        for name, args, kwargs in calls:
+            getattr(draw, name)(*args, **kwargs)
+
     @property
-    def next_button(self):
-        return self.__next_button
-    
+    def calls(self):
+        """Retourne les appels enregistrés, dans l'ordre"""
+        return tuple(self.__calls)
+
+
+class SpriteSnapshot():
+    """
+        La classe SpriteSnapshot est la copie figée d'un cercle à un tick donné : position, rayon et couleurs.
+        Elle se dessine comme le cercle (draw) sans jamais lire l'objet vivant, que le thread de simulation modifie.
+
+        Exemples:
+        >>> snapshot = SpriteSnapshot.capture(Circle(position=Vect2D(10, 20), radius=5))
+        >>> print(snapshot.position.x, snapshot.position.y, snapshot.radius)
+        10.0 20.0 5
+        >>> hasattr(snapshot, "draw_circle_speed")
+        False
+    """
+    __slots__ = ("__name", "__position", "__radius", "__fill_color", "__border_color", "__border_width")
+
+    def __init__(self, sprite):
+        self.__name = sprite.name
+        self.__position = Vect2D(sprite.position.x, sprite.position.y)
+        self.__radius = sprite.radius
+        self.__fill_color = sprite.fill_color
+        self.__border_color = sprite.border_color
+        self.__border_width = sprite.border_width
+
+    @staticmethod
+    def capture(sprite, fov:bool=False, steering:bool=False) -> 'SpriteSnapshot':
+        """Retourne la copie d'un sprite, de la classe qui a ses capacités de dessin; fov et steering enregistrent aussi ses superpositions"""
+        if hasattr(sprite, "draw_fov"):
+            return SentientSpriteSnapshot(sprite, fov, steering)
+        if hasattr(sprite, "draw_circle_speed"):
+            return DynamicSpriteSnapshot(sprite, steering)
+        return SpriteSnapshot(sprite)
+
+    def draw(self, draw:'ImageDraw.ImageDraw'):
+        """Dessine le corps du cercle, comme Circle.draw"""
+        draw.ellipse([self.__position.x - self.__radius, self.__position.y - self.__radius, self.__position.x + self.__radius, self.__position.y + self.__radius], fill=self.__fill_color, width=self.__border_width, outline=self.__border_color)
+
     @property
-    def reset_button(self):
-        return self.__reset_button
+    def name(self):
+        return self.__name
 
+    @property
+    def position(self):
+        return self.__position
 
-class InfoPanel(ttk.LabelFrame):
-    def __init__(self, text):
-        ttk.LabelFrame.__init__(self, root=None, text=text)
-        self.__info_label = tk.Text(self, width=30, height=20)
-        self.__set_text("Click on a boid to show the infomations about it")
-        self.__info_label.grid(row=0, column=0)
-        
-        self.__info_entity = None
-        self.__info_string = ""
+    @property
+    def radius(self):
+        return self.__radius
 
     @property
-    def info_label(self):
-        return self.__info_label
-    
-    def __set_text(self, text):
-        self.__info_label.config(state=tk.NORMAL)
-        self.__info_label.delete(1.0, tk.END)
-        self.__info_label.insert(tk.END, text)
-        self.__info_label.config(state=tk.DISABLED)
-        
+    def fill_color(self):
+        return self.__fill_color
+
     @property
-    def info_entity(self):
-        return self.__info_entity
-    
+    def border_color(self):
+        return self.__border_color
+
     @property
-    def info_string(self):
-        return self.__info_string
-
-    def update(self):
-        if self.__info_entity is not None and not type(self.__info_entity) is Circle:
-            self.__info_string = "Name: " + self.__info_entity.name + "\n"
-            self.__info_string += "Position: ({}, {})".format(math.trunc(self.__info_entity.position.x), math.trunc(self.__info_entity.position.y)) + "\n"
-            self.__info_string += "Speed: ({}, {})".format(math.trunc(self.__info_entity.speed.x), math.trunc(self.__info_entity.speed.y)) + "\n"
-            self.__info_string += "Steering force: ({}, {})".format(math.trunc(self.__info_entity.steering_force.x), math.trunc(self.__info_entity.steering_force.y)) + "\n"
-            if isinstance(self.__info_entity, Circle):
-                self.__info_string += "Radius: {}".format(self.__info_entity.radius) + "\n"
-            self.__info_string += "Steering forces: " + "\n"
-            if self.__info_entity.steering_behaviors is not None:
-                for steering_behavior in self.__info_entity.steering_behaviors:
-                    self.__info_string += "    " + steering_behavior.__class__.__name__ + "\n"
-                    if steering_behavior.target_entities is not None:
-                        for target_entity in steering_behavior.target_entities:
-                            if isinstance(target_entity, Entity):
-                                self.__info_string += "        " + target_entity.name + "\n"
-            elif hasattr(self.__info_entity, 'brain') and self.__info_entity.brain is not None and self.__info_entity.brain.active_behaviors is not None and hasattr(self.__info_entity.brain, 'active_behaviors'):
-                for steering_behavior in self.__info_entity.brain.active_behaviors:
-                    self.__info_string += "    " + steering_behavior.__class__.__name__ + "\n"
-                    if steering_behavior.target_entities is not None:
-                        for target_entity in steering_behavior.target_entities:
-                            if isinstance(target_entity, Entity):
-                                self.__info_string += "        " + target_entity.name + "\n"
-                
-            else:
-                self.__info_string += "    None\n"
-            
-            if hasattr(self.__info_entity, 'eyes') and hasattr(self.__info_entity, 'brain') and self.__info_entity.eyes is not None:
-                self.__info_string += "Eyes: " + "\n"
-                for eye in self.__info_entity.eyes:
-                    self.__info_string += "    " + str(self.__info_entity.eyes.index(eye)) +" (FOV: " + str(math.trunc(eye.fov)) + ", Range: " + str(eye.range) + "): " + "\n"
-                    for seen_entity in self.__info_entity.brain.seen_entities:
-                        self.__info_string += "        " + seen_entity.name + ":" + seen_entity.__class__.__name__ + "\n"
-
-            self.__info_string += "\nClick again to hide info."
-            
-            self.__set_text(self.__info_string)
-        else:
-            self.__set_text("Click on an entity to show it's informations")
-    
-    @info_entity.setter
-    def info_entity(self, entity):
-        self.__info_entity = entity
-        self.update()
+    def border_width(self):
+        return self.__border_width
 
 
-class ViewWindow(ttk.Label, Drawable):
-    def __init__(self, border_color=None, border_width=None, fill_color=None, position=None, size=None):
-        ttk.Label.__init__(self, root=None, text=None, width=size.x)
-        Drawable.__init__(self, border_color, border_width, fill_color, position, size)
-        self.__background = Image.open("tropicalforest.jpg")
-        self.sizex = size.x
-        self.sizey = size.y
-        self.__resized = self.__background.resize((int(size.x), int(size.y)))
-        self.__image_draw = ImageDraw.Draw(self.__resized)
-        self.__image_tk = ImageTk.PhotoImage(self.__resized)
-        self.__image_label = ttk.Label(self, image=self.__image_tk)
-        self.__image_label.grid(row=0, column=0, sticky='ns')
-        self.__image_label.columnconfigure(0, minsize=600, weight=1)
-        self.__speed_is_drawn = False
-        self.__steering_force_is_drawn = False
-        self.__circle_is_drawn = True
-        self.__fov_is_drawn = False
-        self.__crazy_mode = False
-        self.__jungle_background = False
-
-    def update_view(self, simulation):
-            if self.__crazy_mode:
-                i = self.__resized
-                draw = ImageDraw.Draw(i)
-            else:
-                if self.__jungle_background:
-                    self.__newbackground = Image.open("tropicalforest.jpg")
-                else :
-                    self.__newbackground = Image.new('RGBA', (int(self.sizex), int(self.sizey)), (0, 0, 0))
-                i = self.__newbackground.resize((int(self.sizex), int(self.sizey)))
-                draw = ImageDraw.Draw(i)
-            
-            if self.__speed_is_drawn and self.__steering_force_is_drawn and self.__circle_is_drawn and self.__fov_is_drawn:
-                for sprite in simulation.sprites:
-                    if hasattr(sprite, 'draw_fov'):
-                        sprite.draw_fov(draw)                     
-                    sprite.draw(draw)
-                    if hasattr(sprite, "draw_circle_speed"):
-                        sprite.draw_circle_speed(draw)
-                        sprite.draw_circle_steering_force(draw)
-                   
-            elif self.__speed_is_drawn and self.__steering_force_is_drawn and self.__circle_is_drawn and not self.__fov_is_drawn:
-                for sprite in simulation.sprites:
-                    sprite.draw(draw)
-                    if hasattr(sprite, "draw_circle_speed"):
-                        sprite.draw_circle_speed(draw)
-                        sprite.draw_circle_steering_force(draw)
-            elif self.__speed_is_drawn and self.__steering_force_is_drawn and not self.__circle_is_drawn and self.__fov_is_drawn:
-                for sprite in simulation.sprites:
-                    if hasattr(sprite, 'draw_fov'):
-                        sprite.draw_fov(draw)   
-                    if hasattr(sprite, "draw_circle_speed"):
-                        sprite.draw_circle_speed(draw)
-                        sprite.draw_circle_steering_force(draw)                 
-            elif self.__speed_is_drawn and self.__steering_force_is_drawn and not self.__circle_is_drawn and not self.__fov_is_drawn:
-                for sprite in simulation.sprites:
-                    if hasattr(sprite, "draw_circle_speed"):
-                        sprite.draw_circle_speed(draw)
-                        sprite.draw_circle_steering_force(draw)
-            elif self.__speed_is_drawn and not self.__steering_force_is_drawn and self.__circle_is_drawn and self.__fov_is_drawn:
-                for sprite in simulation.sprites:
-                    if hasattr(sprite, 'draw_fov'):
-                        sprite.draw_fov(draw)                         
-                    sprite.draw(draw)
-                    if hasattr(sprite, "draw_circle_speed"):
-                        sprite.draw_circle_speed(draw)
-            elif self.__speed_is_drawn and not self.__steering_force_is_drawn and self.__circle_is_drawn and not self.__fov_is_drawn:
-                for sprite in simulation.sprites:
-                    sprite.draw(draw)
-                    if hasattr(sprite, "draw_circle_speed"):
-                        sprite.draw_circle_speed(draw)
-            elif self.__speed_is_drawn and not self.__steering_force_is_drawn and not self.__circle_is_drawn and self.__fov_is_drawn:
-                for sprite in simulation.sprites:
-                    if hasattr(sprite, 'draw_fov'):
-                        sprite.draw_fov(draw)
-                    if hasattr(sprite, "draw_circle_speed"):
-                        sprite.draw_circle_speed(draw)
-            elif self.__speed_is_drawn and not self.__steering_force_is_drawn and not self.__circle_is_drawn and not self.__fov_is_drawn:
-                for sprite in simulation.sprites:
-                    if hasattr(sprite, "draw_circle_speed"):
-                        sprite.draw_circle_speed(draw)
-            elif not self.__speed_is_drawn and self.__steering_force_is_drawn and self.__circle_is_drawn and self.__fov_is_drawn:
-                for sprite in simulation.sprites:
-                    if hasattr(sprite, 'draw_fov'):
-                        sprite.draw_fov(draw)
-                    sprite.draw(draw)
-                    if hasattr(sprite, "draw_circle_speed"):
-                        sprite.draw_circle_steering_force(draw)
-            elif not self.__speed_is_drawn and self.__steering_force_is_drawn and self.__circle_is_drawn and not self.__fov_is_drawn:
-                for sprite in simulation.sprites:
-                    sprite.draw(draw)
-                    if hasattr(sprite, "draw_circle_speed"):
-                        sprite.draw_circle_steering_force(draw)
-            elif not self.__speed_is_drawn and self.__steering_force_is_drawn and not self.__circle_is_drawn and self.__fov_is_drawn:
-                for sprite in simulation.sprites:
-                    if hasattr(sprite, 'draw_fov'):
-                        sprite.draw_fov(draw) 
-                    if hasattr(sprite, "draw_circle_speed"):                   
-                        sprite.draw_circle_steering_force(draw)
-            elif not self.__speed_is_drawn and self.__steering_force_is_drawn and not self.__circle_is_drawn and not self.__fov_is_drawn:
-                for sprite in simulation.sprites:
-                    if hasattr(sprite, "draw_circle_speed"):
-                        sprite.draw_circle_steering_force(draw)
-            elif not self.__speed_is_drawn and not self.__steering_force_is_drawn and self.__circle_is_drawn and self.__fov_is_drawn:
-                for sprite in simulation.sprites:
-                    if hasattr(sprite, 'draw_fov'):
-                        sprite.draw_fov(draw)
-                    sprite.draw(draw)
-            elif not self.__speed_is_drawn and not self.__steering_force_is_drawn and self.__circle_is_drawn and not self.__fov_is_drawn:
-                for sprite in simulation.sprites:
-                    sprite.draw(draw)
-            elif not self.__speed_is_drawn and not self.__steering_force_is_drawn and not self.__circle_is_drawn and self.__fov_is_drawn:
-                for sprite in simulation.sprites:
-                    if hasattr(sprite, 'draw_fov'):
-                        sprite.draw_fov(draw)   
-                        
-            if simulation.selected_entity:
-                simulation.selected_entity.draw(draw)
-                if hasattr(simulation.selected_entity, "draw_circle_speed"):
-                    simulation.selected_entity.draw_circle_speed(draw)                
-                    simulation.selected_entity.draw_circle_steering_force(draw)    
-                if hasattr(simulation.selected_entity, 'draw_fov'):
-                    simulation.selected_entity.draw_fov(draw)
-        
-            self.__image_tk = ImageTk.PhotoImage(i)
-            self.__image_label["image"] = self.__image_tk 
-            
-    def toggle_draw_fov(self, event):
-        self.__fov_is_drawn = not self.__fov_is_drawn
-    
-    def toggle_draw_circle(self, event):
-        self.__circle_is_drawn = not self.__circle_is_drawn
-            
-    def toggle_draw_steering_force(self, event):
-        self.__steering_force_is_drawn = not self.__steering_force_is_drawn
+class DynamicSpriteSnapshot(SpriteSnapshot):
+    """
+        Copie figée d'un cercle dynamique : ajoute la vitesse, la force de déplacement et, si demandé, les dessins
+        de ses comportements (draw_steering_overlays) enregistrés par un DrawRecorder.
+    """
+    __slots__ = ("__speed", "__steering_force", "__steering_overlays")
 
-    def toggle_draw_speed(self, event):
-        self.__speed_is_drawn = not self.__speed_is_drawn
+    def __init__(self, sprite, steering:bool=False):
+        SpriteSnapshot.__init__(self, sprite)
+        self.__speed = Vect2D(sprite.speed.x, sprite.speed.y)
+        self.__steering_force = Vect2D(sprite.steering_force.x, sprite.steering_force.y)
+        self.__steering_overlays = ()
+        if steering:
+            recorder = DrawRecorder()
+            sprite.draw_steering_overlays(recorder)
+            self.__steering_overlays = recorder.calls
 
-    def toggle_crazy_mode(self, event):
-        self.__crazy_mode = not self.__crazy_mode
+    def draw_circle_speed(self, draw:'ImageDraw.ImageDraw'):
+        """Dessine la vitesse, comme DynamicCircle.draw_circle_speed"""
+        draw.line([self.position.x, self.position.y, self.position.x + self.__speed.x, self.position.y + self.__speed.y], fill="red", width=5)
 
-    def toggle_jungle_background(self, event):
-        self.__jungle_background = not self.__jungle_background
+    def draw_circle_steering_force(self, draw:'ImageDraw.ImageDraw'):
+        """Dessine la force de déplacement et les dessins des comportements, comme DynamicCircle.draw_circle_steering_force"""
+        draw.line([self.position.x, self.position.y, self.position.x + self.__steering_force.x * 10, self.position.y + self.__steering_force.y * 10], fill="darkgoldenrod", width=5)
+        self.draw_steering_overlays(draw)
 
-    @property
-    def canvas(self):
-        return self.__canvas
+    def draw_steering_overlays(self, draw:'ImageDraw.ImageDraw'):
+        """Rejoue les dessins des comportements enregistrés"""
+        DrawRecorder.replay(draw, self.__steering_overlays)
 
     @property
-    def image_draw(self):
-        return self.__image_draw     
+    def speed(self):
+        return self.__speed
 
     @property
-    def image_label(self):
-        return self.__image_label    
+    def steering_force(self):
+        return self.__steering_force
 
-    @canvas.setter
-    def canvas(self, canvas):
-        self.__canvas = canvas
 
+class SentientSpriteSnapshot(DynamicSpriteSnapshot):
+    """
+        Copie figée d'un cercle intelligent : ajoute, si demandé, le dessin de ses yeux et des lignes vers les entités vues.
+    """
+    __slots__ = ("__fov", "__fov_reach")
+
+    def __init__(self, sprite, fov:bool=False, steering:bool=False):
+        DynamicSpriteSnapshot.__init__(self, sprite, steering)
+        self.__fov = ()
+        self.__fov_reach = 0
+        if fov:
+            recorder = DrawRecorder()
+            sprite.draw_fov(recorder)
+            self.__fov = recorder.calls
+            self.__fov_reach = sprite.fov_reach
+
+    def draw_fov(self, draw:'ImageDraw.ImageDraw'):
+        """Rejoue le dessin des yeux et des lignes vers les entités vues"""
+        DrawRecorder.replay(draw, self.__fov)
 
-class ParamPanel(ttk.LabelFrame):
-    def __init__(self, title):
-        ttk.LabelFrame.__init__(self, root=None, text=title)
-        self.__param_selected = tk.StringVar()
-        self.__param_selected.set("Red chasing Green")
-        self.__options_list = Utils.readfile("scenarios.txt")
-        self.__combobox = ttk.Combobox(self, values=self.__options_list, textvariable=self.__param_selected, cursor="hand2", style="TCombobox",state="readonly", width=37)
-    
-        self.__combobox.pack()
-        
-    @property
-    def param_selected(self):
-        return self.__param_selected.get()
-        
     @property
-    def combobox(self):
-        return self.__combobox
+    def fov_reach(self):
+        return self.__fov_reach
 
 
-class VisualParamPanel(ttk.LabelFrame):
-    def __init__(self, title):
-        ttk.LabelFrame.__init__(self, root=None, text=title)
-        self.__width_var = 28
-        self.__speed_var = tk.IntVar()
-        self.__speed_checkbutton = ttk.Checkbutton(self, text="Show Speed", variable=self.__speed_var, onvalue=1, offvalue=0, width=self.__width_var)
-        self.__speed_checkbutton.pack(padx=(50, 0))
-        self.__steering_force_var = tk.IntVar()
-        self.__steering_force_checkbutton = ttk.Checkbutton(self, text="Show Steers", variable=self.__steering_force_var, onvalue=1, offvalue=0, width=self.__width_var)
-        self.__steering_force_checkbutton.pack(padx=(50, 0))
-        self.__show_circle_var = tk.IntVar()
-        self.__show_circle_checkbutton = ttk.Checkbutton(self, text="Show Circles", variable=self.__show_circle_var, onvalue=0, offvalue=1, width=self.__width_var)  
-        self.__show_circle_checkbutton.pack(padx=(50, 0))
-        self.__show_fov_var = tk.IntVar()
-        self.__show_fov_checkbutton = ttk.Checkbutton(self, text="Show F-o-V", variable=self.__show_fov_var, onvalue=1, offvalue=0, width=self.__width_var)
-        self.__show_fov_checkbutton.pack(padx=(50, 0))
-        self.__jungle_background_var = tk.IntVar()
-        self.__jungle_background_checkbutton = ttk.Checkbutton(self, text="Jungle background", variable=self.__jungle_background_var, onvalue=1, offvalue=0, width=self.__width_var)
-        self.__jungle_background_checkbutton.pack(padx=(50, 0))
-        self.__crazy_mode_var = tk.IntVar()
-        self.__crazy_mode_checkbutton = ttk.Checkbutton(self, text="Crazy Mode", variable=self.__crazy_mode_var, onvalue=1, offvalue=0, width=self.__width_var)
-        self.__crazy_mode_checkbutton.pack(padx=(50, 0))
+class SimulationSnapshot():
+    """
+        La classe SimulationSnapshot est l'état dessinable d'une Simulation à la fin d'un tick. Elle est immuable et
+        offre ce que ViewWindow.update_view lit d'une Simulation (sprites, selected_entity, flock, generation), ce qui permet de
+        la dessiner pendant que le thread de simulation calcule le tick suivant.
 
-    @property
-    def show_fov_checkbutton(self):
-        return self.__show_fov_checkbutton
+        Args:
+            - :param simulation: Simulation, la simulation copiée
+            - :param tick: int, le numéro du tick copié
+            - :param overlays: set, les superpositions à copier pour tous les sprites, "fov" et "steering"; l'entité sélectionnée a toujours les deux
+            - :param describe: function, appelée sur l'entité sélectionnée vivante pour en copier la description (InfoPanel.describe)
+
+        Exemples:
+        >>> simulation = Simulation()
+        >>> simulation.initialize_scenario(key="Predator Chasing Prey", boid_count=10)
+        >>> snapshot = SimulationSnapshot(simulation, tick=3, overlays={"fov"})
+        >>> print(len(snapshot.sprites), snapshot.tick, snapshot.selected_entity, snapshot.flock)
+        17 3 None None
+        >>> SimulationSnapshot(simulation).generation == snapshot.generation == simulation.generation
+        True
+        >>> len([sprite for sprite in snapshot.sprites if hasattr(sprite, "draw_fov")])
+        11
+        >>> simulation.selected_entity = simulation.sprites[0]
+        >>> SimulationSnapshot(simulation, describe=lambda entity: entity.name).selected_description == simulation.sprites[0].name
+        True
+    """
+    def __init__(self, simulation:'Simulation', tick:int=0, overlays:set=frozenset(), describe=None):
+        fov = "fov" in overlays
+        steering = "steering" in overlays
+        selected_entity = simulation.selected_entity
+        self.__selected_entity = None
+        sprites = []
+        for sprite in simulation.sprites:
+            if sprite is selected_entity:
+                self.__selected_entity = SpriteSnapshot.capture(sprite, True, True)
+                sprites.append(self.__selected_entity)
+            else:
+                sprites.append(SpriteSnapshot.capture(sprite, fov, steering))
+        self.__sprites = tuple(sprites)
+        self.__selected_description = describe(selected_entity) if describe is not None and selected_entity is not None else None
+        self.__tick = tick
+        self.__generation = simulation.generation
+        self.__is_running = simulation.is_running
 
     @property
-    def show_circle_checkbutton(self):
-        return self.__show_circle_checkbutton
+    def sprites(self):
+        """Retourne les copies des sprites, dans l'ordre de la simulation"""
+        return self.__sprites
 
     @property
-    def steering_force_checkbutton(self):
-        return self.__steering_force_checkbutton
-    
-    @property
-    def speed_checkbutton(self):
-        return self.__speed_checkbutton
+    def selected_entity(self):
+        """Retourne la copie de l'entité sélectionnée, None s'il n'y en a pas"""
+        return self.__selected_entity
 
     @property
-    def crazy_mode_checkbutton(self):
-        return self.__crazy_mode_checkbutton
+    def selected_description(self):
+        """Retourne la description de l'entité sélectionnée copiée avec elle, None s'il n'y en a pas"""
+        return self.__selected_description
 
     @property
-    def jungle_background_checkbutton(self):
-        return self.__jungle_background_checkbutton
-
+    def flock(self):
+        """Retourne None : une copie n'a pas de FlockStore"""
+        return None
 
-class SimParamPanel(ParamPanel):
-    def __init__(self):
-        pass    
-    
-#  __________   ___  _______   ______  __    __  .___________. __    ______   .__   __.
-# |   ____\  \ /  / |   ____| /      ||  |  |  | |           ||  |  /  __  \  |  \ |  |
-# |  |__   \  V  /  |  |__   |  ,----'|  |  |  | `---|  |----`|  | |  |  |  | |   \|  |
-# |   __|   >   <   |   __|  |  |     |  |  |  |     |  |     |  | |  |  |  | |  . `  |
-# |  |____ /  .  \  |  |____ |  `----.|  `--'  |     |  |     |  | |  `--'  | |  |\   |
-# |_______/__/ \__\ |_______| \______| \______/      |__|     |__|  \______/  |__| \__|
-class App(Tk, Updatable):
-    def __init__(self):
-        Tk.__init__(self)
-        self.__size = Vect2D(Tk.winfo_screenwidth(self) * 0.8, Tk.winfo_screenheight(self) * 0.8)
-        self.__gui = GUI(size=Vect2D(self.__size.x, self.__size.y), fill_color=RGBAColor(0 ,0, 0)) 
-        self.title('Boids')
-        self.geometry("{}x{}+{}+{}".format(int(self.width), (int(self.height)), int(Tk.winfo_screenwidth(self) * 0.5 - self.width * 0.5), 0 + int(Tk.winfo_screenwidth(self) * 0.50 - self.height)))
-        self.geometry()
-        self.iconbitmap('boids.ico')
-        self.__simulation = Simulation(size=Vect2D(self.__gui.view_window.width, self.__gui.view_window.height))
-        
-        self.__gui.main_panel.visual_param_panel.speed_checkbutton.bind('<Button-1>', self.__gui.view_window.toggle_draw_speed)
-        self.__gui.main_panel.visual_param_panel.steering_force_checkbutton.bind('<Button-1>', self.__gui.view_window.toggle_draw_steering_force)
-        self.__gui.main_panel.visual_param_panel.show_circle_checkbutton.bind('<Button-1>', self.__gui.view_window.toggle_draw_circle)
-        self.__gui.main_panel.visual_param_panel.show_fov_checkbutton.bind('<Button-1>', self.__gui.view_window.toggle_draw_fov)
-        self.__gui.main_panel.visual_param_panel.crazy_mode_checkbutton.bind('<Button-1>', self.__gui.view_window.toggle_crazy_mode)
-        self.__gui.main_panel.visual_param_panel.jungle_background_checkbutton.bind('<Button-1>', self.__gui.view_window.toggle_jungle_background)
-        self.__gui.view_window.image_label.bind('<Enter>', self.__simulation.mouse_entered)
-        self.__gui.view_window.image_label.bind('<Motion>', self.__simulation.move_mouse)
-        self.__gui.view_window.image_label.bind('<Leave>', self.__simulation.mouse_left)
-        self.__gui.main_panel.control_panel.start_stop_button.bind('<Button-1>', self.toggle_simulation)
-        self.__gui.main_panel.control_panel.next_button.bind('<Button-1>', self.tick_simulation)
-        self.__gui.main_panel.control_panel.next_button.bind('<space>', self.tick_simulation)
-        self.__gui.main_panel.control_panel.reset_button.bind('<Button-1>', self.reset_simulation)
-        self.__gui.main_panel.param_panel.combobox.bind('<<ComboboxSelected>>', self.param_changed)
-        self.__gui.view_window.image_label.bind('<Button-1>', self.mouse_clicked_on_image)
-
-        self.tick()
-                
-        self.mainloop()
+    @property
+    def tick(self):
+        """Retourne le numéro du tick copié"""
+        return self.__tick
 
-    def param_changed(self, event):
-        self.reset_simulation()
+    @property
+    def generation(self):
+        """Retourne la génération des sprites copiés (Simulation.generation) : les copies d'une même génération ont les mêmes sprites, dans le même ordre"""
+        return self.__generation
 
     @property
-    def size(self):
-        return self.__size
-    
-    def mouse_clicked_on_image(self, event):
-        clicked_entity = self.__simulation.check_entity_clicked(event)
-        if clicked_entity is not None:
-            if clicked_entity is self.__gui.main_panel.info_panel.info_entity:
-                self.__gui.main_panel.info_panel.info_entity = None
-                self.__simulation.selected_entity = None
-            else:
-                self.__gui.main_panel.info_panel.info_entity = clicked_entity
-                self.__simulation.selected_entity = clicked_entity
+    def is_running(self):
+        """Retourne True si la simulation était en cours au moment de la copie"""
+        return self.__is_running
 
-    def tick_simulation(self, event=None):
-        self.__simulation.tick(time=0.1)
-        
-    def reset_simulation(self, event=None) -> None:
-        key = self.__gui.main_panel.param_panel.param_selected
-        self.__gui.main_panel.control_panel.start_stop_button.config(text="Stop")
-        self.__gui.main_panel.control_panel.next_button.config(state="disabled")
-        self.__simulation.reset(key)
-        self.__simulation.selected_entity = None
-        self.__gui.main_panel.info_panel.info_entity = None
 
-    def update_info_panel(self):
-        self.__gui.main_panel.info_panel.set_text(self.__info_string)
+class SnapshotBuffer():
+    """
+        La classe SnapshotBuffer est un double tampon de SimulationSnapshot : le producteur écrit dans le tampon
+        arrière puis l'échange avec le tampon avant; le lecteur ne voit donc que la dernière copie complète.
+
+        Exemples:
+        >>> buffer = SnapshotBuffer()
+        >>> print(buffer.latest())
+        None
+        >>> buffer.publish("tick 1")
+        >>> buffer.publish("tick 2")
+        >>> print(buffer.latest())
+        tick 2
+    """
+    def __init__(self):
+        self.__buffers = [None, None]
+        self.__front = 0
+        self.__lock = threading.Lock()
+
+    def publish(self, snapshot) -> None:
+        """Écrit une copie dans le tampon arrière puis en fait le tampon avant"""
+        back = 1 - self.__front
+        self.__buffers[back] = snapshot
+        with self.__lock:
+            self.__front = back
 
-    def tick(self):
-        if self.__simulation.is_running:
-            self.tick_simulation()
-        self.__gui.main_panel.info_panel.update()
-        self.__gui.view_window.update_view(self.__simulation)
-        self.after(10, self.tick)
-        
-    def toggle_simulation(self, event):
-        self.__simulation.toggle_running(event)
-        if self.__simulation.is_running:
-            self.__gui.main_panel.control_panel.start_stop_button.config(text="Stop")
-            self.__gui.main_panel.control_panel.next_button.config(state="disabled")
-        else:
-            self.__gui.main_panel.control_panel.start_stop_button.config(text="Start")
-            self.__gui.main_panel.control_panel.next_button.config(state="normal")
-             
-    @property
-    def width(self):
-        return self.__size.x
+    def latest(self):
+        """Retourne la dernière copie publiée, None s'il n'y en a pas"""
+        with self.__lock:
+            return self.__buffers[self.__front]
 
-    @property
-    def height(self):
-        return self.__size.y
 
+class SimulationWorker():
+    """
+        La classe SimulationWorker exécute une Simulation sur un thread dédié, au rythme d'un FixedStepScheduler dont
+        chaque pas avance la simulation de son step_time, et publie une SimulationSnapshot dans un SnapshotBuffer
+        après chaque groupe de ticks. L'interface ne touche plus la simulation : elle dessine latest() et envoie ses
+        modifications (souris, clic, pause...) avec submit(), qui les exécute sur le thread de simulation entre deux ticks.
 
-def main():
-    App()
+        Args:
+            - :param simulation: Simulation, la simulation à exécuter
+            - :param scheduler: FixedStepScheduler, le rythme des ticks
+            - :param describe: function, copie la description de l'entité sélectionnée dans chaque SimulationSnapshot
+
+        Exemples:
+        >>> simulation = Simulation()
+        >>> simulation.initialize_scenario(key="Red chasing Green")
+        >>> worker = SimulationWorker(simulation, FixedStepScheduler(target_hz=1000))
+        >>> worker.start()
+        >>> worker.submit(lambda simulation: len(simulation.sprites)).result(timeout=5)
+        12
+        >>> worker.stop()
+        >>> worker.latest() is not None
+        True
+    """
+    def __init__(self, simulation:'Simulation', scheduler:FixedStepScheduler=None, describe=None):
+        self.__simulation = simulation
+        self.__describe = describe
+        self.__scheduler = scheduler if scheduler else FixedStepScheduler()
+        self.__commands = queue.SimpleQueue()
+        self.__buffer = SnapshotBuffer()
+        self.__overlays = frozenset()
+        self.__ticks = 0
+        self.__is_stopping = False
+        self.__thread = threading.Thread(target=self.__run, name="simulation", daemon=True)
+
+    def start(self) -> None:
+        """Démarre le thread de simulation"""
+        self.__thread.start()
+
+    def stop(self, timeout:float=None) -> None:
+        """Arrête le thread de simulation après son tick en cours"""
+        self.__is_stopping = True
+        self.__commands.put(None)
+        self.__thread.join(timeout)
+
+    def submit(self, function) -> Future:
+        """Envoie function(simulation) au thread de simulation et retourne le Future de son résultat"""
+        future = Future()
+        self.__commands.put((function, future))
+        return future
+
+    def latest(self) -> SimulationSnapshot:
+        """Retourne la dernière copie complète de la simulation, None avant la première"""
+        return self.__buffer.latest()
+
+    def __run(self) -> None:
+        published_overlays = None
+        while not self.__is_stopping:
+            changed = self.__execute_commands(self.__scheduler.delay(perf_counter()))
+            steps = self.__scheduler.advance(perf_counter(), self.__simulation.is_running)
+            for step in range(steps):
+                if step:
+                    changed = self.__execute_commands(0) or changed
+                self.__simulation.tick(time=self.__scheduler.step_time)
+            self.__ticks += steps
+            overlays = self.__overlays
+            if steps or changed or overlays != published_overlays:
+                self.__buffer.publish(SimulationSnapshot(self.__simulation, self.__ticks, overlays, self.__describe))
+                published_overlays = overlays
+
+    def __execute_commands(self, timeout:float) -> bool:
+        try:
+            command = self.__commands.get(timeout=timeout) if timeout > 0 else self.__commands.get_nowait()
+        except queue.Empty:
+            return False
+        while command is not None:
+            function, future = command
+            if future.set_running_or_notify_cancel():
+                try:
+                    future.set_result(function(self.__simulation))
+                except Exception as exception:
+                    future.set_exception(exception)
+            try:
+                command = self.__commands.get_nowait()
+            except queue.Empty:
+                break
+        return True
+
+    @property
+    def overlays(self):
+        """Retourne les superpositions copiées pour tous les sprites, "fov" et "steering\""""
+        return self.__overlays
+
+    @overlays.setter
+    def overlays(self, overlays):
+        self.__overlays = frozenset(overlays)
+
+    @property
+    def scheduler(self):
+        """Retourne le FixedStepScheduler qui rythme les ticks"""
+        return self.__scheduler
+
+    @property
+    def ticks(self):
+        """Retourne le nombre de ticks exécutés"""
+        return self.__ticks
+
+
+def main(args:list=None):
+    """
+    main() lit la ligne de commande : `run` exécute un scénario sans interface, sinon l'interface graphique s'ouvre.
+    Lancé par `python boids.py`, ce module est __main__ alors que boids_gui importe le module boids : --profile
+    active donc le profileur sur ce dernier, celui que l'interface interroge.
+
+    Exemple :
+        >>> import doctest, runpy, sys, boids_gui
+        >>> saved = (sys.argv, boids_gui.App, doctest.testmod)
+        >>> sys.argv, doctest.testmod = ['boids.py', '--profile'], lambda *args, **kwargs: None
+        >>> boids_gui.App = lambda **options: print(boids_gui.Profiler.active() is not None)
+        >>> _ = runpy.run_path('boids.py', run_name='__main__')
+        True
+        >>> boids_gui.Profiler.active().disable()
+        >>> sys.argv, boids_gui.App, doctest.testmod = saved
+    """
+    parser = argparse.ArgumentParser(prog="boids", description="Simulation de boids. Sans commande, ouvre l'interface graphique.")
+    parser.add_argument("--profile", action="store_true", help="affiche les coûts les plus élevés par image affichée dans le panneau d'information")
+    parser.add_argument("--renderer", choices=["draw", "numpy"], default="draw", help="dessin des corps : ImageDraw (draw) ou tableaux NumPy (numpy)")
+    parser.add_argument("--sim-hz", type=float, default=100.0, help="pas de simulation par seconde, indépendamment de l'affichage; chaque pas avance la simulation de 0.1, comme --time-step de run")
+    parser.add_argument("--fps", type=float, default=60.0, help="images par seconde visées, des images sont sautées en cas de retard")
+    parser.add_argument("--max-catch-up", type=int, default=5, help="nombre maximal de pas de simulation rattrapés par image")
+    parser.add_argument("--threaded", action="store_true", help="exécute la simulation sur un thread dédié, l'interface dessine sa dernière copie")
+    parser.add_argument("--overlay-limit", type=int, default=300, help="au-delà de ce nombre de sprites, les champs de vision et les comportements ne sont dessinés que pour un échantillon")
+    parser.add_argument("--pixel-limit", type=int, default=3000, help="au-delà de ce nombre de sprites, les corps sont dessinés par un seul pixel")
+    commands = parser.add_subparsers(dest="command")
+    run_parser = commands.add_parser("run", help="exécute un scénario sans interface graphique et affiche les ticks/s")
+    run_parser.add_argument("--scenario", default="Red chasing Green")
+    run_parser.add_argument("--ticks", type=int, default=1000)
+    run_parser.add_argument("--boids", type=int, default=None, help="nombre d'entités mobiles, celui du scénario par défaut")
+    run_parser.add_argument("--seed", type=int, default=0)
+    run_parser.add_argument("--time-step", type=float, default=0.1)
+    run_parser.add_argument("--width", type=int, default=1000)
+    run_parser.add_argument("--height", type=int, default=500)
+    run_parser.add_argument("--spatial-index", choices=["grid", "quadtree"], default="grid")
+    run_parser.add_argument("--flock-store", action="store_true", help="stocke les entités dans un FlockStore (NumPy)")
+    run_parser.add_argument("--collisions", action="store_true", help="sépare et fait rebondir les sprites qui se chevauchent, affiche les contacts par tick")
+    run_parser.add_argument("--profile", choices=["table", "json"], default=None, help="affiche le coût de chaque comportement et de Brain.process")
+    run_parser.add_argument("--profile-window", type=int, default=None, help="nombre de ticks sur lesquels le profil est moyenné, tous par défaut")
+    arguments = parser.parse_args(args)
+
+    if arguments.command == "run":
+        runner = HeadlessRunner(arguments.scenario, arguments.ticks, arguments.boids, arguments.seed, arguments.time_step, Vect2D(arguments.width, arguments.height), arguments.spatial_index, arguments.flock_store, arguments.collisions)
+        profiler = None
+        if arguments.profile:
+            profiler = Profiler(window=arguments.profile_window if arguments.profile_window else max(1, arguments.ticks))
+            profiler.enable()
+        runner.run()
+        print(runner.report())
+        if profiler is not None:
+            profiler.disable()
+            print(profiler.table() if arguments.profile == "table" else profiler.to_json())
+    else:
+        __main_doctest()
+        if arguments.profile:
+            import boids
+            boids.Profiler().enable()
+        from boids_gui import App, DetailPolicy
+        App(renderer=arguments.renderer, target_hz=arguments.sim_hz, target_fps=arguments.fps, max_catch_up=arguments.max_catch_up, threaded=arguments.threaded, detail_policy=DetailPolicy(overlay_limit=arguments.overlay_limit, pixel_limit=arguments.pixel_limit))
 
 
-def __main_doctest():
-    if bool(__debug__): # do not work
-        import doctest
-        doctest.testmod()#verbose=True)
 def __main_doctest():
     import doctest
     doctest.testmod()#verbose=True)
 
 if __name__ == '__main__':
-    __main_doctest()
     main()
@@ -0,0 +1,973 @@
+import math
+import tkinter as tk
+from time import perf_counter
+try:
+    import numpy as np
+except ImportError:
+    np = None
+from tkinter import Tk, ttk
+from PIL import Image, ImageDraw, ImageTk
+from vect2d import Vect2D
+from boids import Utils, RGBAColor, Drawable, Updatable, Entity, Circle, Simulation, Profiler, FixedStepScheduler, SimulationWorker
+
+#   _______  __    __   __ 
+#  /  _____||  |  |  | |  |
+# |  |  __  |  |  |  | |  |
+# |  | |_ | |  |  |  | |  |
+# |  |__| | |  `--'  | |  |
+#  \______|  \______/  |__|
+
+class GUI(ttk.Frame, Drawable):
+    def __init__(self, border_color=None, border_width=None, fill_color=None, position=None, size:Vect2D=None, renderer:str="draw", detail_policy:'DetailPolicy'=None):
+        ttk.Frame.__init__(self, root=None, text=None)
+        Drawable.__init__(self, border_color,  border_width, fill_color, position, size)
+        self.__main_panel = ControlBar()
+        self.__view_window = ViewWindow(size=Vect2D(size.x, size.y), fill_color=fill_color, renderer=renderer, detail_policy=detail_policy)
+        self.__main_panel.grid(row=0, column=1)
+        self.__view_window.grid(row=0, column=1, rowspan=4, sticky="ns")
+
+    @property
+    def main_panel(self):
+        return self.__main_panel
+
+    @property
+    def view_window(self):
+        return self.__view_window
+
+
+class ControlBar(ttk.Frame):
+    def __init__(self):
+        ttk.Frame.__init__(self)
+        self.__control_panel = StartStopPanel("Controls")
+        self.__param_panel = ParamPanel("Scenarios")
+        self.__visual_param_panel = VisualParamPanel("Visual Parameters")
+        self.__Info_panel = InfoPanel("Selected Entity Informations")
+        self.__control_panel.grid(row=0, column=0, sticky="N")
+        self.__param_panel.grid(row=1, column=0, sticky="N")
+        self.__visual_param_panel.grid(row=2, column=0, sticky="N")
+        self.__Info_panel.grid(row=3, column=0, sticky="N")
+
+    @property
+    def param_panel(self):
+        return self.__param_panel
+    
+    @property
+    def control_panel(self):
+        return self.__control_panel
+    
+    @property
+    def visual_param_panel(self):
+        return self.__visual_param_panel
+    
+    @property
+    def info_panel(self):
+        return self.__Info_panel
+
+
+class StartStopPanel(ttk.LabelFrame):
+    def __init__(self, text): 
+        ttk.LabelFrame.__init__(self, root=None, text=text)
+        self.__start_stop_button = ttk.Button(self, text="Stop", width = 40)
+        self.__next_button = ttk.Button(self, text="Next Step", state="disabled", width = 40)
+        self.__reset_button = ttk.Button(self, text="Reset", width = 40)
+        self.__start_stop_button.grid(row=0, column=0)
+        self.__next_button.grid(row=1, column=0)
+        self.__reset_button.grid(row=2, column=0)
+        
+    @property
+    def start_stop_button(self):
+        return self.__start_stop_button
+    
+    @property
+    def next_button(self):
+        return self.__next_button
+    
+    @property
+    def reset_button(self):
+        return self.__reset_button
+
+
+class InfoPanel(ttk.LabelFrame):
+    def __init__(self, text):
+        ttk.LabelFrame.__init__(self, root=None, text=text)
+        self.__info_label = tk.Text(self, width=30, height=20)
+        self.__set_text("Click on a boid to show the infomations about it")
+        self.__info_label.grid(row=0, column=0)
+        
+        self.__info_entity = None
+        self.__description = None
+        self.__info_string = ""
+        self.__scheduler = None
+        self.__simulation_scheduler = None
+
+    @property
+    def info_label(self):
+        return self.__info_label
+    
+    def __set_text(self, text):
+        self.__info_label.config(state=tk.NORMAL)
+        self.__info_label.delete(1.0, tk.END)
+        self.__info_label.insert(tk.END, text)
+        self.__info_label.config(state=tk.DISABLED)
+        
+    @property
+    def info_entity(self):
+        return self.__info_entity
+    
+    @property
+    def info_string(self):
+        return self.__info_string
+
+    @staticmethod
+    def describe(entity):
+        """Returns the informations shown about an entity, None for no entity or a plain Circle. It reads the live entity, so a SimulationWorker calls it on its thread"""
+        if entity is None or type(entity) is Circle:
+            return None
+        description = "Name: " + entity.name + "\n"
+        description += "Position: ({}, {})".format(math.trunc(entity.position.x), math.trunc(entity.position.y)) + "\n"
+        description += "Speed: ({}, {})".format(math.trunc(entity.speed.x), math.trunc(entity.speed.y)) + "\n"
+        description += "Steering force: ({}, {})".format(math.trunc(entity.steering_force.x), math.trunc(entity.steering_force.y)) + "\n"
+        if isinstance(entity, Circle):
+            description += "Radius: {}".format(entity.radius) + "\n"
+        description += "Steering forces: " + "\n"
+        if entity.steering_behaviors is not None:
+            for steering_behavior in entity.steering_behaviors:
+                description += "    " + steering_behavior.__class__.__name__ + "\n"
+                if steering_behavior.target_entities is not None:
+                    for target_entity in steering_behavior.target_entities:
+                        if isinstance(target_entity, Entity):
+                            description += "        " + target_entity.name + "\n"
+        elif hasattr(entity, 'brain') and entity.brain is not None and entity.brain.active_behaviors is not None and hasattr(entity.brain, 'active_behaviors'):
+            for steering_behavior in entity.brain.active_behaviors:
+                description += "    " + steering_behavior.__class__.__name__ + "\n"
+                if steering_behavior.target_entities is not None:
+                    for target_entity in steering_behavior.target_entities:
+                        if isinstance(target_entity, Entity):
+                            description += "        " + target_entity.name + "\n"
+            
+        else:
+            description += "    None\n"
+        
+        if hasattr(entity, 'eyes') and hasattr(entity, 'brain') and entity.eyes is not None:
+            description += "Eyes: " + "\n"
+            for eye in entity.eyes:
+                description += "    " + str(entity.eyes.index(eye)) +" (FOV: " + str(math.trunc(eye.fov)) + ", Range: " + str(eye.range) + "): " + "\n"
+                for seen_entity in entity.brain.seen_entities:
+                    description += "        " + seen_entity.name + ":" + seen_entity.__class__.__name__ + "\n"
+
+        description += "\nClick again to hide info."
+        return description
+
+    def update(self):
+        description = InfoPanel.describe(self.__info_entity) if self.__info_entity is not None else self.__description
+        if description is not None:
+            self.__info_string = description
+            self.__set_text(self.__info_string + self.__rates_string() + self.__top_costs_string())
+        else:
+            self.__set_text("Click on an entity to show it's informations" + self.__rates_string() + self.__top_costs_string())
+
+    def __rates_string(self):
+        if self.__scheduler is None:
+            return ""
+        simulation_scheduler = self.__simulation_scheduler if self.__simulation_scheduler is not None else self.__scheduler
+        return "\n\nSimulation: {:.0f} Hz\nRendering: {:.0f} FPS\n".format(simulation_scheduler.sim_hz, self.__scheduler.fps)
+
+    def __top_costs_string(self, count=5):
+        profiler = Profiler.active()
+        if profiler is None:
+            return ""
+        steps = profiler.statistics().get("Simulation.tick", {}).get("calls_per_tick", 0)
+        top_costs = "\n\nTop costs (ms/frame, {:.1f} steps/frame):\n".format(steps)
+        for key, milliseconds, calls in profiler.top(count):
+            top_costs += "    {} {:.2f} ({:.0f} calls)\n".format(key, milliseconds, calls)
+        return top_costs
+    
+    @info_entity.setter
+    def info_entity(self, entity):
+        self.__info_entity = entity
+        self.update()
+
+    @property
+    def description(self):
+        """The informations shown when there is no info_entity, described where the simulation runs (threaded mode)"""
+        return self.__description
+
+    @description.setter
+    def description(self, description):
+        self.__description = description
+
+    @property
+    def scheduler(self):
+        return self.__scheduler
+
+    @scheduler.setter
+    def scheduler(self, scheduler):
+        self.__scheduler = scheduler
+
+    @property
+    def simulation_scheduler(self):
+        """The scheduler whose sim Hz is shown when the simulation is not stepped by `scheduler`"""
+        return self.__simulation_scheduler
+
+    @simulation_scheduler.setter
+    def simulation_scheduler(self, scheduler):
+        self.__simulation_scheduler = scheduler
+
+
+class DetailPolicy():
+    """
+    How much of each layer ViewWindow draws for a given number of sprites. Above overlay_limit sprites, the
+    sampled layers (FOV cones with their sight lines, behavior overlays) are drawn for overlay_sample sprites
+    spread over the list; the selected entity is always drawn in full. Above pixel_limit sprites, bodies are
+    drawn as single pixels. None disables a limit.
+    """
+    def __init__(self, overlay_limit:int=300, overlay_sample:int=50, pixel_limit:int=3000):
+        self.__overlay_limit = overlay_limit
+        self.__overlay_sample = overlay_sample
+        self.__pixel_limit = pixel_limit
+
+    def sample(self, sprites:list) -> list:
+        """Returns the sprites the sampled layers are drawn for: all of them, or every n-th one above overlay_limit"""
+        if self.__overlay_limit is None or len(sprites) <= self.__overlay_limit:
+            return sprites
+        return sprites[::math.ceil(len(sprites) / max(1, self.__overlay_sample))]
+
+    def bodies_as_pixels(self, sprites:list) -> bool:
+        """Returns True when there are too many sprites to draw their bodies as circles"""
+        return self.__pixel_limit is not None and len(sprites) > self.__pixel_limit
+
+    @staticmethod
+    def visible(position, reach:float, width:int, height:int) -> bool:
+        """Returns True when a drawing within reach of position can touch the width x height view"""
+        return -reach <= position.x <= width + reach and -reach <= position.y <= height + reach
+
+    @property
+    def overlay_limit(self):
+        return self.__overlay_limit
+
+    @property
+    def overlay_sample(self):
+        return self.__overlay_sample
+
+    @property
+    def pixel_limit(self):
+        return self.__pixel_limit
+
+
+class DrawLayer():
+    """
+    A pass of the view: calls the same draw method on every sprite that has it.
+    The sprites are filtered by capability (hasattr) once per generation of sprites instead of every frame: prepare()
+    keeps their rows, so what it returns stays valid for every list of the same sprites, like successive snapshots.
+    When the layer knows how far from its position a sprite draws (reach), sprites whose drawing cannot touch
+    the view are culled every frame; a sampled layer is prepared for the DetailPolicy sample of the sprites only.
+    """
+    def __init__(self, name:str, method_name:str, reach=None, sampled:bool=False):
+        self.__name = name
+        self.__method_name = method_name
+        self.__reach = reach
+        self.__sampled = sampled
+
+    def prepare(self, sprites:list, policy:DetailPolicy=None) -> list:
+        """Returns the rows of the sprites able to draw this layer, in the order of the sprites"""
+        rows = range(len(sprites))
+        if self.__sampled and policy is not None:
+            rows = policy.sample(rows)
+        return [row for row in rows if hasattr(sprites[row], self.__method_name)]
+
+    def render(self, image, draw, prepared:list, sprites:list) -> None:
+        """Draws the layer of the sprites on the image with what prepare() returned for them"""
+        method_name = self.__method_name
+        if self.__reach is None:
+            for row in prepared:
+                getattr(sprites[row], method_name)(draw)
+        else:
+            width, height = image.size
+            for row in prepared:
+                sprite = sprites[row]
+                if DetailPolicy.visible(sprite.position, self.__reach(sprite), width, height):
+                    getattr(sprite, method_name)(draw)
+
+    def is_visible(self, sprite, width:int, height:int) -> bool:
+        """Returns False when the drawing of the sprite on this layer is outside the width x height view"""
+        return self.__reach is None or DetailPolicy.visible(sprite.position, self.__reach(sprite), width, height)
+
+    @property
+    def name(self):
+        return self.__name
+
+    @property
+    def method_name(self):
+        return self.__method_name
+
+    @property
+    def sampled(self):
+        return self.__sampled
+
+
+class BodyLayer(DrawLayer):
+    """
+    The bodies pass: every sprite draws itself. When the DetailPolicy says there are too many sprites,
+    every body is a single pixel of its fill color, drawn with one point() call per color: prepare() then
+    returns the rows grouped by fill color instead of a list of rows.
+    """
+    def __init__(self, name:str="bodies"):
+        DrawLayer.__init__(self, name, "draw", reach=lambda sprite: sprite.radius + sprite.border_width)
+
+    def prepare(self, sprites:list, policy:DetailPolicy=None):
+        if policy is not None and policy.bodies_as_pixels(sprites):
+            colors = {}
+            for row, sprite in enumerate(sprites):
+                colors.setdefault(sprite.fill_color, []).append(row)
+            return colors
+        return range(len(sprites))
+
+    def render(self, image, draw, prepared, sprites:list) -> None:
+        if isinstance(prepared, dict):
+            for fill_color, rows in prepared.items():
+                draw.point([(sprites[row].position.x, sprites[row].position.y) for row in rows], fill=fill_color)
+            return
+        width, height = image.size
+        for row in prepared:
+            sprite = sprites[row]
+            if self.is_visible(sprite, width, height):
+                sprite.draw(draw)
+
+DRAW_LAYERS = (DrawLayer("fov", "draw_fov", reach=lambda sprite: sprite.fov_reach, sampled=True),
+               BodyLayer("bodies"),
+               DrawLayer("speed", "draw_circle_speed", reach=lambda sprite: sprite.speed.length + 3),
+               DrawLayer("steering", "draw_circle_steering_force", sampled=True))
+"""Every draw layer of ViewWindow, in drawing order; the selected entity is drawn last, above them"""
+
+
+class NumpyRasterizer():
+    """
+    A renderer that writes the bodies, speed lines and steering lines of every sprite straight into a NumPy
+    framebuffer (height, width, 4) with a few vectorized assignments per frame, instead of one ImageDraw call
+    per shape. Pixels are written as packed 32-bit RGBA values. Bodies are stamped with precomputed disc and
+    ring offsets, grouped by radius, and lines are sampled one pixel apart and thickened along their normal.
+    Colors are drawn opaque, as on the jungle background. Positions come from the FlockStore when the
+    simulation has one. Sprites with a non-finite position or vector are skipped.
+    Stamping writes every pixel of a disc, while ImageDraw.ellipse fills whole spans: above MAX_BODY_RADIUS
+    (mean radius of the bodies), rasterizes_bodies() returns False and the bodies are left to a BodyLayer.
+    Given a DetailPolicy, render() follows it as the draw layers do: bodies become single pixels above its
+    pixel limit, steering lines are drawn for its sample of the sprites only, and off-view shapes are culled.
+    """
+    SPEED_COLOR = (255, 0, 0)
+    STEERING_COLOR = (184, 134, 11)
+    LINE_WIDTH = 5
+    MAX_BODY_RADIUS = 16
+
+    def __init__(self):
+        if np is None:
+            raise ImportError("the numpy renderer requires numpy")
+        self.__stamps = {}
+        self.__background = None
+        self.__background_array = None
+        self.__sprites = None
+        self.__key = None
+        self.__circles = []
+        self.__dynamics = []
+        self.__fill_colors = None
+        self.__border_colors = None
+        self.__border_widths = None
+        self.__flock = None
+        self.__circle_rows = None
+        self.__dynamic_rows = None
+        self.__sampled_dynamics = None
+        self.__bodies_as_pixels = False
+
+    @staticmethod
+    def pack(colors) -> 'np.ndarray':
+        """Returns RGB colors, shape (N, 3), as opaque packed RGBA pixels of the framebuffer"""
+        colors = np.asarray(colors, dtype=np.uint8).reshape(-1, 3)
+        rgba = np.empty((len(colors), 4), dtype=np.uint8)
+        rgba[:, :3] = colors
+        rgba[:, 3] = 255
+        return rgba.view(np.uint32).reshape(-1)
+
+    def frame(self, background, out:'np.ndarray'=None) -> 'np.ndarray':
+        """Returns a framebuffer holding the background image: `out` refilled when it has the right shape, else a new one"""
+        if background is not self.__background:
+            self.__background = background
+            self.__background_array = np.array(background.convert('RGBA'))
+        if out is not None and out.shape == self.__background_array.shape:
+            np.copyto(out, self.__background_array)
+            return out
+        return self.__background_array.copy()
+
+    def rasterizes_bodies(self, simulation, policy:DetailPolicy=None) -> bool:
+        """Returns True when render() should draw the bodies: they are pixels, or small enough for stamping to beat ImageDraw"""
+        self.__prepare(simulation, policy)
+        if not self.__circles or self.__bodies_as_pixels:
+            return True
+        return self.__radii().mean() <= NumpyRasterizer.MAX_BODY_RADIUS
+
+    def render(self, frame, simulation, bodies:bool=True, speed:bool=False, steering:bool=False, policy:DetailPolicy=None) -> None:
+        """Draws the enabled layers of the sprites of the simulation into the framebuffer"""
+        self.__prepare(simulation, policy)
+        pixels = frame.view(np.uint32).reshape(frame.shape[:2])
+        if bodies and self.__circles:
+            positions = self.__vectors(self.__circles, self.__circle_rows, "position")
+            if self.__bodies_as_pixels:
+                self.__draw_pixels(pixels, positions)
+            else:
+                self.__draw_bodies(pixels, positions, self.__radii())
+        if (speed or steering) and self.__dynamics:
+            positions = self.__vectors(self.__dynamics, self.__dynamic_rows, "position")
+            if speed:
+                speeds = self.__vectors(self.__dynamics, self.__dynamic_rows, "speed")
+                reach = np.hypot(speeds[:, 0], speeds[:, 1]) + 3
+                shown = self.__in_view(pixels, positions, reach)
+                self.__draw_lines(pixels, positions[shown], positions[shown] + speeds[shown], NumpyRasterizer.pack(NumpyRasterizer.SPEED_COLOR)[0])
+            if steering:
+                rows = self.__sampled_dynamics
+                self.__draw_lines(pixels, positions[rows], positions[rows] + self.__vectors(self.__dynamics, self.__dynamic_rows, "steering_force")[rows] * 10, NumpyRasterizer.pack(NumpyRasterizer.STEERING_COLOR)[0])
+
+    def __prepare(self, simulation, policy):
+        """Keeps the rows of the circles and dynamic sprites, found again only when the generation or count of the sprites changes"""
+        sprites = self.__sprites = simulation.sprites
+        key = (simulation.generation, len(sprites), simulation.flock, policy)
+        if key == self.__key:
+            return
+        self.__key = key
+        self.__flock = simulation.flock if simulation.flock is not None and simulation.flock.covers(sprites) else None
+        self.__circles = [row for row, sprite in enumerate(sprites) if hasattr(sprite, "radius")]
+        self.__dynamics = [row for row, sprite in enumerate(sprites) if hasattr(sprite, "draw_circle_speed")]
+        self.__circle_rows = np.array([sprites[row].flock_row for row in self.__circles], dtype=int) if self.__flock is not None else None
+        self.__dynamic_rows = np.array([sprites[row].flock_row for row in self.__dynamics], dtype=int) if self.__flock is not None else None
+        self.__fill_colors = NumpyRasterizer.pack([sprites[row].fill_color[:3] for row in self.__circles])
+        self.__border_colors = NumpyRasterizer.pack([sprites[row].border_color[:3] for row in self.__circles])
+        self.__border_widths = np.array([sprites[row].border_width for row in self.__circles], dtype=int)
+        self.__bodies_as_pixels = policy is not None and policy.bodies_as_pixels(sprites)
+        sampled = set(policy.sample(range(len(sprites)))) if policy is not None else None
+        self.__sampled_dynamics = np.array([index for index, row in enumerate(self.__dynamics) if sampled is None or row in sampled], dtype=int)
+
+    def __radii(self):
+        if self.__flock is not None:
+            return self.__flock.radius[self.__circle_rows]
+        return np.array([self.__sprites[row].radius for row in self.__circles])
+
+    def __vectors(self, sprite_rows, flock_rows, name):
+        if self.__flock is not None:
+            return getattr(self.__flock, name)[flock_rows]
+        vectors = [getattr(self.__sprites[row], name) for row in sprite_rows]
+        return np.array([(vector.x, vector.y) for vector in vectors], dtype=float).reshape(-1, 2)
+
+    def __stamp(self, radius:int, border_width:int, width:int):
+        """Returns the (dy, dx, flat offset, is_border) of the pixels ImageDraw.ellipse covers around a center"""
+        key = (radius, border_width, width)
+        stamp = self.__stamps.get(key)
+        if stamp is None:
+            dy, dx = np.mgrid[-radius:radius + 1, -radius:radius + 1]
+            distance_squared = dx * dx + dy * dy
+            inside = distance_squared <= (radius + 0.5) ** 2
+            is_border = distance_squared > (radius - border_width + 0.5) ** 2
+            stamp = (dy[inside], dx[inside], (dy * width + dx)[inside].astype(np.int32), is_border[inside])
+            self.__stamps[key] = stamp
+        return stamp
+
+    @staticmethod
+    def __in_view(pixels, positions, reach):
+        """Returns the mask of the finite positions whose drawing within reach can touch the framebuffer"""
+        height, width = pixels.shape
+        with np.errstate(invalid="ignore"):
+            return ((positions[:, 0] >= -reach) & (positions[:, 0] <= width + reach)
+                    & (positions[:, 1] >= -reach) & (positions[:, 1] <= height + reach))
+
+    def __draw_pixels(self, pixels, positions):
+        """Draws every body as the single pixel of its fill color, as BodyLayer does above the pixel limit"""
+        height, width = pixels.shape
+        shown = np.flatnonzero(self.__in_view(pixels, positions, 0))
+        xs = positions[shown, 0].astype(int)
+        ys = positions[shown, 1].astype(int)
+        visible = (xs < width) & (ys < height)
+        pixels[ys[visible], xs[visible]] = self.__fill_colors[shown[visible]]
+
+    def __draw_bodies(self, pixels, positions, radii):
+        height, width = pixels.shape
+        flat_pixels = pixels.reshape(-1)
+        shown = self.__in_view(pixels, positions, radii + self.__border_widths) & np.isfinite(radii)
+        radii = np.where(shown, radii, 0).astype(int)
+        centers = (np.floor(np.where(shown[:, None], positions, 0) - radii[:, None]) + radii[:, None]).astype(np.int32)
+        inside = (centers[:, 0] >= radii) & (centers[:, 0] + radii < width) & (centers[:, 1] >= radii) & (centers[:, 1] + radii < height)
+        for radius, border_width in sorted(set(zip(radii[shown].tolist(), self.__border_widths[shown].tolist()))):
+            group = shown & (radii == radius) & (self.__border_widths == border_width)
+            dy, dx, offsets, is_border = self.__stamp(radius, border_width, width)
+            rows = np.flatnonzero(group & inside)
+            if len(rows):
+                colors = np.empty((len(rows), len(offsets)), dtype=np.uint32)
+                colors[:] = self.__fill_colors[rows][:, None]
+                colors[:, is_border] = self.__border_colors[rows][:, None]
+                flat_pixels[(centers[rows, 1] * width + centers[rows, 0])[:, None] + offsets[None, :]] = colors
+            rows = np.flatnonzero(group & ~inside)
+            if len(rows):
+                colors = np.where(is_border[None, :], self.__border_colors[rows][:, None], self.__fill_colors[rows][:, None])
+                ys = centers[rows, 1][:, None] + dy[None, :]
+                xs = centers[rows, 0][:, None] + dx[None, :]
+                visible = (ys >= 0) & (ys < height) & (xs >= 0) & (xs < width)
+                pixels[ys[visible], xs[visible]] = colors[visible]
+
+    def __draw_lines(self, pixels, starts, ends, color):
+        """Draws LINE_WIDTH pixel thick lines: one sample per pixel along the major axis, thickened along the minor one"""
+        height, width = pixels.shape
+        finite = np.isfinite(starts).all(axis=1) & np.isfinite(ends).all(axis=1)
+        starts, ends = starts[finite], ends[finite]
+        deltas = ends - starts
+        steps = np.ceil(np.abs(deltas).max(axis=1)).astype(int) + 1
+        line_of_sample = np.repeat(np.arange(len(starts)), steps)
+        sample = np.arange(len(line_of_sample)) - np.repeat(np.cumsum(steps) - steps, steps)
+        t = sample / np.maximum(steps - 1, 1)[line_of_sample]
+        xs = np.rint(starts[line_of_sample, 0] + deltas[line_of_sample, 0] * t).astype(int)
+        ys = np.rint(starts[line_of_sample, 1] + deltas[line_of_sample, 1] * t).astype(int)
+        x_major = (np.abs(deltas[:, 0]) >= np.abs(deltas[:, 1]))[line_of_sample]
+        thickness = np.arange(NumpyRasterizer.LINE_WIDTH) - NumpyRasterizer.LINE_WIDTH // 2
+        xs = xs[:, None] + np.where(x_major[:, None], 0, thickness[None, :])
+        ys = ys[:, None] + np.where(x_major[:, None], thickness[None, :], 0)
+        visible = (xs >= 0) & (xs < width) & (ys >= 0) & (ys < height)
+        pixels[ys[visible], xs[visible]] = color
+
+
+class SteeringOverlayLayer(DrawLayer):
+    """
+    The part of the steering pass a NumpyRasterizer does not draw: the overlays of the steering behaviors
+    (wander circle, center of gravity...), drawn with ImageDraw on top of the rasterized frame.
+    """
+    def __init__(self, name:str="steering"):
+        DrawLayer.__init__(self, name, "draw_steering_overlays", sampled=True)
+
+
+RENDERERS = ("draw", "numpy")
+"""
+The renderers ViewWindow can be started with: "draw" rasterizes every body with ImageDraw and "numpy" draws
+bodies, speed and steering lines with a NumpyRasterizer, over the FOV layer and under the behavior overlays
+"""
+
+
+class ViewWindow(ttk.Label, Drawable):
+    def __init__(self, border_color=None, border_width=None, fill_color=None, position=None, size=None, renderer:str="draw", detail_policy:DetailPolicy=None):
+        if renderer not in RENDERERS:
+            raise ValueError("unknown renderer: {}".format(renderer))
+        ttk.Label.__init__(self, root=None, text=None, width=size.x)
+        Drawable.__init__(self, border_color, border_width, fill_color, position, size)
+        self.__background = Image.open("tropicalforest.jpg")
+        self.sizex = size.x
+        self.sizey = size.y
+        self.__resized = self.__background.resize((int(size.x), int(size.y)))
+        self.__image_draw = ImageDraw.Draw(self.__resized)
+        self.__image_tk = ImageTk.PhotoImage(self.__resized)
+        self.__image_tk_mode = self.__resized.mode
+        self.__image_label = ttk.Label(self, image=self.__image_tk)
+        self.__image_label.grid(row=0, column=0, sticky='ns')
+        self.__image_label.columnconfigure(0, minsize=600, weight=1)
+        self.__speed_is_drawn = False
+        self.__steering_force_is_drawn = False
+        self.__circle_is_drawn = True
+        self.__fov_is_drawn = False
+        self.__crazy_mode = False
+        self.__jungle_background = False
+        self.__background_layer = None
+        self.__background_layer_key = None
+        self.__layers = []
+        self.__rasterizer = NumpyRasterizer() if renderer == "numpy" else None
+        if renderer == "numpy":
+            self.__all_layers = (DRAW_LAYERS[0], DRAW_LAYERS[1], SteeringOverlayLayer("steering"))
+        else:
+            self.__all_layers = DRAW_LAYERS
+        self.__detail_policy = detail_policy if detail_policy else DetailPolicy()
+        self.__raster_frame = None
+        self.__frame = None
+        self.__frame_draw = None
+        self.__prepared_layers = None
+        self.__prepared_layers_key = None
+        self.__build_pipeline()
+
+    def __build_pipeline(self):
+        enabled = {"fov": self.__fov_is_drawn, "bodies": self.__circle_is_drawn, "speed": self.__speed_is_drawn, "steering": self.__steering_force_is_drawn}
+        self.__layers = [layer for layer in self.__all_layers if enabled[layer.name]]
+        self.__prepared_layers = None
+
+    def __prepared_layers_for(self, simulation):
+        """Returns what every enabled layer prepared for the sprites, prepared again only when their generation or count changes"""
+        key = (simulation.generation, len(simulation.sprites))
+        if self.__prepared_layers is None or key != self.__prepared_layers_key:
+            self.__prepared_layers = [layer.prepare(simulation.sprites, self.__detail_policy) for layer in self.__layers]
+            self.__prepared_layers_key = key
+        return self.__prepared_layers
+
+    @property
+    def layers(self):
+        """Returns the enabled draw layers, in drawing order"""
+        return self.__layers
+
+    @property
+    def detail_policy(self):
+        return self.__detail_policy
+
+    def update_view(self, simulation):
+            profiler = Profiler.active()
+            if profiler is not None:
+                profiler.start_lap()
+            layers = list(zip(self.__layers, self.__prepared_layers_for(simulation)))
+            if self.__rasterizer is not None:
+                i, layers = self.__rasterize(simulation, layers, profiler)
+                draw = self.__frame_draw
+            elif self.__crazy_mode:
+                i = self.__resized
+                draw = self.__image_draw
+            else:
+                i = self.__frame_buffer(self.background_layer)
+                draw = self.__frame_draw
+            if profiler is not None:
+                profiler.lap("update_view.background")
+            
+            for layer, prepared in layers:
+                layer.render(i, draw, prepared, simulation.sprites)
+                if profiler is not None:
+                    profiler.lap("update_view." + layer.name)
+
+            if simulation.selected_entity:
+                simulation.selected_entity.draw(draw)
+                if hasattr(simulation.selected_entity, "draw_circle_speed"):
+                    simulation.selected_entity.draw_circle_speed(draw)                
+                    simulation.selected_entity.draw_circle_steering_force(draw)    
+                if hasattr(simulation.selected_entity, 'draw_fov'):
+                    simulation.selected_entity.draw_fov(draw)
+            if profiler is not None:
+                profiler.lap("update_view.selection")
+        
+            self.__show(i)
+            if profiler is not None:
+                profiler.lap("update_view.photo_image")
+            
+    def __rasterize(self, simulation, layers:list, profiler):
+        """
+        Draws the frame with the NumpyRasterizer and returns it with the (layer, prepared) left to draw over it.
+        The FOV layer, and the bodies when ImageDraw is faster for them, are drawn with ImageDraw first, so the
+        rasterized shapes stay above them as with the "draw" renderer.
+        """
+        if not self.__crazy_mode or self.__raster_frame is None:
+            self.__raster_frame = self.__rasterizer.frame(self.__resized if self.__crazy_mode else self.background_layer, self.__raster_frame)
+        if profiler is not None:
+            profiler.lap("update_view.background")
+        rasterized_bodies = self.__circle_is_drawn and self.__rasterizer.rasterizes_bodies(simulation, self.__detail_policy)
+        below = [(layer, prepared) for layer, prepared in layers if layer.name == "fov" or (layer.name == "bodies" and not rasterized_bodies)]
+        if below:
+            image = self.__raster_image()
+            for layer, prepared in below:
+                layer.render(image, self.__frame_draw, prepared, simulation.sprites)
+                if profiler is not None:
+                    profiler.lap("update_view." + layer.name)
+            np.copyto(self.__raster_frame, np.asarray(image))
+        self.__rasterizer.render(self.__raster_frame, simulation, rasterized_bodies, self.__speed_is_drawn, self.__steering_force_is_drawn, self.__detail_policy)
+        if profiler is not None:
+            profiler.lap("update_view.raster")
+        return self.__raster_image(), [(layer, prepared) for layer, prepared in layers if layer.name not in ("fov", "bodies")]
+
+    def __raster_image(self):
+        """Returns the frame image holding the raster framebuffer"""
+        if self.__frame is None or self.__frame.mode != "RGBA" or self.__frame.size != (self.__raster_frame.shape[1], self.__raster_frame.shape[0]):
+            self.__frame = Image.fromarray(self.__raster_frame)
+            self.__frame_draw = ImageDraw.Draw(self.__frame)
+        else:
+            self.__frame.frombytes(self.__raster_frame)
+        return self.__frame
+
+    def __frame_buffer(self, background):
+        """Returns the frame image reused from one frame to the next, refilled with the background"""
+        if self.__frame is None or self.__frame.mode != background.mode or self.__frame.size != background.size:
+            self.__frame = background.copy()
+            self.__frame_draw = ImageDraw.Draw(self.__frame)
+        else:
+            self.__frame.paste(background)
+        return self.__frame
+
+    def __show(self, image):
+        """Pushes the frame into the PhotoImage of the label, a new PhotoImage only when the size or the mode changes"""
+        if (self.__image_tk.width(), self.__image_tk.height(), self.__image_tk_mode) != (image.width, image.height, image.mode):
+            self.__image_tk = ImageTk.PhotoImage(image)
+            self.__image_tk_mode = image.mode
+            self.__image_label["image"] = self.__image_tk
+        else:
+            self.__image_tk.paste(image)
+
+    def toggle_draw_fov(self, event):
+        self.__fov_is_drawn = not self.__fov_is_drawn
+        self.__build_pipeline()
+    
+    def toggle_draw_circle(self, event):
+        self.__circle_is_drawn = not self.__circle_is_drawn
+        self.__build_pipeline()
+            
+    def toggle_draw_steering_force(self, event):
+        self.__steering_force_is_drawn = not self.__steering_force_is_drawn
+        self.__build_pipeline()
+
+    def toggle_draw_speed(self, event):
+        self.__speed_is_drawn = not self.__speed_is_drawn
+        self.__build_pipeline()
+
+    def toggle_crazy_mode(self, event):
+        self.__crazy_mode = not self.__crazy_mode
+        self.__raster_frame = None
+
+    def toggle_jungle_background(self, event):
+        self.__jungle_background = not self.__jungle_background
+        self.__background_layer = None
+
+    @property
+    def background_layer(self):
+        """Returns the background at the window size, decoded and resized once until the size or the jungle toggle changes"""
+        key = (self.__jungle_background, int(self.sizex), int(self.sizey))
+        if self.__background_layer is None or key != self.__background_layer_key:
+            if self.__jungle_background:
+                self.__background_layer = self.__background.resize((int(self.sizex), int(self.sizey)))
+            else:
+                self.__background_layer = Image.new('RGBA', (int(self.sizex), int(self.sizey)), (0, 0, 0))
+            self.__background_layer_key = key
+        return self.__background_layer
+
+    @property
+    def canvas(self):
+        return self.__canvas
+
+    @property
+    def image_draw(self):
+        return self.__image_draw     
+
+    @property
+    def image_label(self):
+        return self.__image_label    
+
+    @canvas.setter
+    def canvas(self, canvas):
+        self.__canvas = canvas
+
+
+class ParamPanel(ttk.LabelFrame):
+    def __init__(self, title):
+        ttk.LabelFrame.__init__(self, root=None, text=title)
+        self.__param_selected = tk.StringVar()
+        self.__param_selected.set("Red chasing Green")
+        self.__options_list = Utils.readfile("scenarios.txt")
+        self.__combobox = ttk.Combobox(self, values=self.__options_list, textvariable=self.__param_selected, cursor="hand2", style="TCombobox",state="readonly", width=37)
+    
+        self.__combobox.pack()
+        
+    @property
+    def param_selected(self):
+        return self.__param_selected.get()
+        
+    @property
+    def combobox(self):
+        return self.__combobox
+
+
+class VisualParamPanel(ttk.LabelFrame):
+    def __init__(self, title):
+        ttk.LabelFrame.__init__(self, root=None, text=title)
+        self.__width_var = 28
+        self.__speed_var = tk.IntVar()
+        self.__speed_checkbutton = ttk.Checkbutton(self, text="Show Speed", variable=self.__speed_var, onvalue=1, offvalue=0, width=self.__width_var)
+        self.__speed_checkbutton.pack(padx=(50, 0))
+        self.__steering_force_var = tk.IntVar()
+        self.__steering_force_checkbutton = ttk.Checkbutton(self, text="Show Steers", variable=self.__steering_force_var, onvalue=1, offvalue=0, width=self.__width_var)
+        self.__steering_force_checkbutton.pack(padx=(50, 0))
+        self.__show_circle_var = tk.IntVar()
+        self.__show_circle_checkbutton = ttk.Checkbutton(self, text="Show Circles", variable=self.__show_circle_var, onvalue=0, offvalue=1, width=self.__width_var)  
+        self.__show_circle_checkbutton.pack(padx=(50, 0))
+        self.__show_fov_var = tk.IntVar()
+        self.__show_fov_checkbutton = ttk.Checkbutton(self, text="Show F-o-V", variable=self.__show_fov_var, onvalue=1, offvalue=0, width=self.__width_var)
+        self.__show_fov_checkbutton.pack(padx=(50, 0))
+        self.__jungle_background_var = tk.IntVar()
+        self.__jungle_background_checkbutton = ttk.Checkbutton(self, text="Jungle background", variable=self.__jungle_background_var, onvalue=1, offvalue=0, width=self.__width_var)
+        self.__jungle_background_checkbutton.pack(padx=(50, 0))
+        self.__crazy_mode_var = tk.IntVar()
+        self.__crazy_mode_checkbutton = ttk.Checkbutton(self, text="Crazy Mode", variable=self.__crazy_mode_var, onvalue=1, offvalue=0, width=self.__width_var)
+        self.__crazy_mode_checkbutton.pack(padx=(50, 0))
+
+    @property
+    def show_fov_checkbutton(self):
+        return self.__show_fov_checkbutton
+
+    @property
+    def show_circle_checkbutton(self):
+        return self.__show_circle_checkbutton
+
+    @property
+    def steering_force_checkbutton(self):
+        return self.__steering_force_checkbutton
+    
+    @property
+    def speed_checkbutton(self):
+        return self.__speed_checkbutton
+
+    @property
+    def crazy_mode_checkbutton(self):
+        return self.__crazy_mode_checkbutton
+
+    @property
+    def jungle_background_checkbutton(self):
+        return self.__jungle_background_checkbutton
+
+
+class SimParamPanel(ParamPanel):
+    def __init__(self):
+        pass    
+    
+#  __________   ___  _______   ______  __    __  .___________. __    ______   .__   __.
+# |   ____\  \ /  / |   ____| /      ||  |  |  | |           ||  |  /  __  \  |  \ |  |
+# |  |__   \  V  /  |  |__   |  ,----'|  |  |  | `---|  |----`|  | |  |  |  | |   \|  |
+# |   __|   >   <   |   __|  |  |     |  |  |  |     |  |     |  | |  |  |  | |  . `  |
+# |  |____ /  .  \  |  |____ |  `----.|  `--'  |     |  |     |  | |  `--'  | |  |\   |
+# |_______/__/ \__\ |_______| \______| \______/      |__|     |__|  \______/  |__| \__|
+class App(Tk, Updatable):
+    def __init__(self, renderer:str="draw", target_hz:float=100.0, target_fps:float=60.0, max_catch_up:int=5, threaded:bool=False, detail_policy:DetailPolicy=None):
+        Tk.__init__(self)
+        self.__size = Vect2D(Tk.winfo_screenwidth(self) * 0.8, Tk.winfo_screenheight(self) * 0.8)
+        self.__gui = GUI(size=Vect2D(self.__size.x, self.__size.y), fill_color=RGBAColor(0 ,0, 0), renderer=renderer, detail_policy=detail_policy) 
+        self.title('Boids')
+        self.geometry("{}x{}+{}+{}".format(int(self.width), (int(self.height)), int(Tk.winfo_screenwidth(self) * 0.5 - self.width * 0.5), 0 + int(Tk.winfo_screenwidth(self) * 0.50 - self.height)))
+        self.geometry()
+        self.iconbitmap('boids.ico')
+        self.__simulation = Simulation(size=Vect2D(self.__gui.view_window.width, self.__gui.view_window.height))
+        self.__scheduler = FixedStepScheduler(target_hz=target_hz, target_fps=target_fps, max_catch_up=max_catch_up)
+        self.__gui.main_panel.info_panel.scheduler = self.__scheduler
+        self.__worker = None
+        self.__pending_calls = []
+        if threaded:
+            self.__worker = SimulationWorker(self.__simulation, FixedStepScheduler(target_hz=target_hz, max_catch_up=max_catch_up), describe=InfoPanel.describe)
+            self.__gui.main_panel.info_panel.simulation_scheduler = self.__worker.scheduler
+        
+        self.__gui.main_panel.visual_param_panel.speed_checkbutton.bind('<Button-1>', self.__gui.view_window.toggle_draw_speed)
+        self.__gui.main_panel.visual_param_panel.steering_force_checkbutton.bind('<Button-1>', self.__gui.view_window.toggle_draw_steering_force)
+        self.__gui.main_panel.visual_param_panel.show_circle_checkbutton.bind('<Button-1>', self.__gui.view_window.toggle_draw_circle)
+        self.__gui.main_panel.visual_param_panel.show_fov_checkbutton.bind('<Button-1>', self.__gui.view_window.toggle_draw_fov)
+        self.__gui.main_panel.visual_param_panel.crazy_mode_checkbutton.bind('<Button-1>', self.__gui.view_window.toggle_crazy_mode)
+        self.__gui.main_panel.visual_param_panel.jungle_background_checkbutton.bind('<Button-1>', self.__gui.view_window.toggle_jungle_background)
+        self.__gui.view_window.image_label.bind('<Enter>', lambda event: self.__call_simulation(lambda simulation: simulation.mouse_entered(event)))
+        self.__gui.view_window.image_label.bind('<Motion>', lambda event: self.__call_simulation(lambda simulation: simulation.move_mouse(event)))
+        self.__gui.view_window.image_label.bind('<Leave>', lambda event: self.__call_simulation(lambda simulation: simulation.mouse_left(event)))
+        self.__gui.main_panel.control_panel.start_stop_button.bind('<Button-1>', self.toggle_simulation)
+        self.__gui.main_panel.control_panel.next_button.bind('<Button-1>', self.tick_simulation)
+        self.__gui.main_panel.control_panel.next_button.bind('<space>', self.tick_simulation)
+        self.__gui.main_panel.control_panel.reset_button.bind('<Button-1>', self.reset_simulation)
+        self.__gui.main_panel.param_panel.combobox.bind('<<ComboboxSelected>>', self.param_changed)
+        self.__gui.view_window.image_label.bind('<Button-1>', self.mouse_clicked_on_image)
+
+        if self.__worker is not None:
+            self.__worker.start()
+        self.tick()
+                
+        self.mainloop()
+        if self.__worker is not None:
+            self.__worker.stop()
+
+    def __call_simulation(self, function, callback=None):
+        """Runs function(simulation), on the simulation thread when there is one; callback gets the result on the Tk thread"""
+        if self.__worker is None:
+            result = function(self.__simulation)
+            if callback is not None:
+                callback(result)
+        else:
+            self.__pending_calls.append((self.__worker.submit(function), callback))
+
+    def __complete_calls(self):
+        pending_calls = []
+        for future, callback in self.__pending_calls:
+            if not future.done():
+                pending_calls.append((future, callback))
+            elif callback is not None:
+                callback(future.result())
+            else:
+                future.result()
+        self.__pending_calls = pending_calls
+
+    def param_changed(self, event):
+        self.reset_simulation()
+
+    @property
+    def size(self):
+        return self.__size
+    
+    def mouse_clicked_on_image(self, event):
+        self.__call_simulation(lambda simulation: App.__select_clicked_entity(simulation, event), self.__show_clicked_entity if self.__worker is None else None)
+
+    @staticmethod
+    def __select_clicked_entity(simulation, event):
+        clicked_entity = simulation.check_entity_clicked(event)
+        if clicked_entity is not None:
+            simulation.selected_entity = None if clicked_entity is simulation.selected_entity else clicked_entity
+        return clicked_entity
+
+    def __show_clicked_entity(self, clicked_entity):
+        if clicked_entity is not None:
+            if clicked_entity is self.__gui.main_panel.info_panel.info_entity:
+                self.__gui.main_panel.info_panel.info_entity = None
+            else:
+                self.__gui.main_panel.info_panel.info_entity = clicked_entity
+
+    def tick_simulation(self, event=None):
+        step_time = self.__scheduler.step_time
+        self.__call_simulation(lambda simulation: simulation.tick(time=step_time))
+        
+    def reset_simulation(self, event=None) -> None:
+        key = self.__gui.main_panel.param_panel.param_selected
+        self.__gui.main_panel.control_panel.start_stop_button.config(text="Stop")
+        self.__gui.main_panel.control_panel.next_button.config(state="disabled")
+        self.__call_simulation(lambda simulation: App.__reset(simulation, key))
+        self.__gui.main_panel.info_panel.info_entity = None
+
+    @staticmethod
+    def __reset(simulation, key):
+        simulation.reset(key)
+        simulation.selected_entity = None
+
+    def update_info_panel(self):
+        self.__gui.main_panel.info_panel.set_text(self.__info_string)
+
+    def tick(self):
+        self.__complete_calls()
+        if self.__worker is None:
+            for _ in range(self.__scheduler.advance(perf_counter(), self.__simulation.is_running)):
+                self.tick_simulation()
+            view_source = self.__simulation
+        else:
+            self.__scheduler.advance(perf_counter(), running=False)
+            self.__worker.overlays = [layer.name for layer in self.__gui.view_window.layers]
+            view_source = self.__worker.latest()
+            self.__gui.main_panel.info_panel.description = view_source.selected_description if view_source is not None else None
+        if view_source is not None and self.__scheduler.frame_due(perf_counter()):
+            self.__gui.main_panel.info_panel.update()
+            self.__gui.view_window.update_view(view_source)
+            if Profiler.active() is not None:
+                Profiler.active().end_tick()
+        self.after(max(1, int(self.__scheduler.delay(perf_counter()) * 1000)), self.tick)
+        
+    def toggle_simulation(self, event):
+        self.__call_simulation(lambda simulation: simulation.toggle_running(event) or simulation.is_running, self.__show_running_state)
+
+    def __show_running_state(self, is_running):
+        if is_running:
+            self.__gui.main_panel.control_panel.start_stop_button.config(text="Stop")
+            self.__gui.main_panel.control_panel.next_button.config(state="disabled")
+        else:
+            self.__gui.main_panel.control_panel.start_stop_button.config(text="Start")
+            self.__gui.main_panel.control_panel.next_button.config(state="normal")
+             
+    @property
+    def width(self):
+        return self.__size.x
+
+    @property
+    def height(self):
+        return self.__size.y
+
+
+
+def main():
+    App()
+
+
+if __name__ == '__main__':
+    main()
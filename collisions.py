@@ -0,0 +1,175 @@
+import math
+from vect2d import Vect2D
+
+
+class CollisionDetector():
+    """
+    This class finds and resolves the overlaps between circular bodies, the balls of ball_gravity.Game as well
+    as the sprites of boids.Simulation. A body only needs a position (Vect2D) and a radius. Bodies with a speed
+    are moved and bounced; bodies without one (the Circle obstacles) are static. The mass of a body is its
+    masse when it has one, its area otherwise.
+
+    The broad phase is a sort-and-sweep: the bodies are sorted by the left edge of their bounding box along the
+    axis where they are the most spread out, then swept while keeping the bodies whose box is still open. Only
+    those pairs reach the narrow phase, an exact circle-circle test, so the cost follows the number of nearby
+    pairs instead of N². The sort order is kept from one tick to the next, and since bodies move little between
+    ticks the sort runs on an almost sorted list.
+
+    resolve() pushes each overlapping pair apart along the line between the centers, in proportion to the
+    inverse masses, and applies an impulse with the given restitution when the bodies are moving towards each
+    other. A body with a max_speed, like the boids, leaves the bounce no faster than it, as after steering.
+    The contact pairs of the last call and the running totals are kept for instrumentation.
+
+    Example:
+        >>> class Body():
+        ...     def __init__(self, x, y, radius, speed=None):
+        ...         self.position, self.radius = Vect2D(x, y), radius
+        ...         if speed is not None:
+        ...             self.speed = speed
+        >>> bodies = [Body(0, 0, 10, Vect2D(5, 0)), Body(15, 0, 10, Vect2D(-5, 0)), Body(100, 0, 10), Body(112, 5, 5)]
+        >>> detector = CollisionDetector(restitution=1.0)
+        >>> detector.find_contacts(bodies)
+        [(0, 1), (2, 3)]
+        >>> detector.resolve(bodies)
+        [(0, 1), (2, 3)]
+        >>> print(bodies[0].position, bodies[1].position, bodies[0].speed, bodies[1].speed)
+        (-2.50E+00, 0.00E+00) (1.75E+01, 0.00E+00) (-5.00E+00, 0.00E+00) (5.00E+00, 0.00E+00)
+        >>> print(bodies[2].position, bodies[3].position)
+        (1.00E+02, 0.00E+00) (1.12E+02, 5.00E+00)
+        >>> detector.find_contacts(bodies), detector.total_contacts, detector.ticks
+        ([(2, 3)], 2, 1)
+        >>> capped = [Body(0, 0, 10, Vect2D(5, 0)), Body(15, 0, 10, Vect2D(-5, 0))]
+        >>> capped[0].max_speed = 3
+        >>> CollisionDetector(restitution=1.0).resolve(capped)
+        [(0, 1)]
+        >>> print(round(capped[0].speed), capped[1].speed)
+        (-3.00E+00, 0.00E+00) (5.00E+00, 0.00E+00)
+    """
+    def __init__(self, restitution:float=0.9):
+        self.__restitution = restitution
+        self.__order = []
+        self.__contacts = []
+        self.__candidate_count = 0
+        self.__total_contacts = 0
+        self.__ticks = 0
+
+    def find_contacts(self, bodies:list) -> list:
+        """find_contacts() returns the (i, j) index pairs, i < j, of the overlapping bodies, in order."""
+        count = len(bodies)
+        xs = [body.position.x for body in bodies]
+        ys = [body.position.y for body in bodies]
+        radii = [body.radius for body in bodies]
+        if count < 2:
+            self.__candidate_count = 0
+            return []
+        if max(ys) - min(ys) > max(xs) - min(xs):
+            xs, ys = ys, xs
+        if len(self.__order) != count:
+            self.__order = list(range(count))
+        self.__order.sort(key=lambda index: xs[index] - radii[index])
+        contacts = []
+        candidate_count = 0
+        active = []
+        for index in self.__order:
+            x, y, radius = xs[index], ys[index], radii[index]
+            left = x - radius
+            active = [other for other in active if xs[other] + radii[other] >= left]
+            for other in active:
+                candidate_count += 1
+                reach = radius + radii[other]
+                dy = y - ys[other]
+                if -reach < dy < reach:
+                    dx = x - xs[other]
+                    if dx * dx + dy * dy < reach * reach:
+                        contacts.append((other, index) if other < index else (index, other))
+            active.append(index)
+        self.__candidate_count = candidate_count
+        contacts.sort()
+        return contacts
+
+    def resolve(self, bodies:list) -> list:
+        """resolve() returns the contact pairs found by find_contacts(), after separating and bouncing them."""
+        contacts = self.find_contacts(bodies)
+        for first, second in contacts:
+            self.__resolve_pair(bodies[first], bodies[second])
+        self.__contacts = contacts
+        self.__total_contacts += len(contacts)
+        self.__ticks += 1
+        return contacts
+
+    def __resolve_pair(self, first, second):
+        inverse_first = CollisionDetector.inverse_mass(first)
+        inverse_second = CollisionDetector.inverse_mass(second)
+        inverse_sum = inverse_first + inverse_second
+        if not inverse_sum:
+            return
+        dx = second.position.x - first.position.x
+        dy = second.position.y - first.position.y
+        reach = first.radius + second.radius
+        distance_squared = dx * dx + dy * dy
+        if distance_squared >= reach * reach:
+            return
+        distance = math.sqrt(distance_squared)
+        normal_x, normal_y = (dx / distance, dy / distance) if distance else (1.0, 0.0)
+        correction = (reach - distance) / inverse_sum
+        first.position.x -= normal_x * correction * inverse_first
+        first.position.y -= normal_y * correction * inverse_first
+        second.position.x += normal_x * correction * inverse_second
+        second.position.y += normal_y * correction * inverse_second
+        first_speed = first.speed if inverse_first else None
+        second_speed = second.speed if inverse_second else None
+        closing_speed = ((second_speed.x if second_speed else 0.0) - (first_speed.x if first_speed else 0.0)) * normal_x + ((second_speed.y if second_speed else 0.0) - (first_speed.y if first_speed else 0.0)) * normal_y
+        if closing_speed >= 0:
+            return
+        impulse = -(1 + self.__restitution) * closing_speed / inverse_sum
+        if first_speed is not None:
+            first_speed.x -= normal_x * impulse * inverse_first
+            first_speed.y -= normal_y * impulse * inverse_first
+            CollisionDetector.__limit_speed(first, first_speed)
+        if second_speed is not None:
+            second_speed.x += normal_x * impulse * inverse_second
+            second_speed.y += normal_y * impulse * inverse_second
+            CollisionDetector.__limit_speed(second, second_speed)
+
+    @staticmethod
+    def __limit_speed(body, speed:Vect2D) -> None:
+        max_speed = getattr(body, "max_speed", None)
+        if max_speed:
+            speed.limit_length(max_speed)
+
+    @staticmethod
+    def inverse_mass(body) -> float:
+        """inverse_mass() returns 0 for a static body (without speed), else 1 / its masse or 1 / its area."""
+        if not hasattr(body, "speed"):
+            return 0.0
+        return 1.0 / (getattr(body, "masse", 0) or math.pi * body.radius ** 2)
+
+    @property
+    def restitution(self):
+        """restitution is a property that returns the part of the closing speed kept after a bounce."""
+        return self.__restitution
+
+    @property
+    def contacts(self):
+        """contacts is a property that returns the contact pairs of the last resolve()."""
+        return self.__contacts
+
+    @property
+    def candidate_count(self):
+        """candidate_count is a property that returns the pairs the last broad phase passed to the narrow phase."""
+        return self.__candidate_count
+
+    @property
+    def total_contacts(self):
+        """total_contacts is a property that returns the contacts resolved since the detector was created."""
+        return self.__total_contacts
+
+    @property
+    def ticks(self):
+        """ticks is a property that returns the number of resolve() calls."""
+        return self.__ticks
+
+    @property
+    def contacts_per_tick(self):
+        """contacts_per_tick is a property that returns the average number of contacts per resolve()."""
+        return self.__total_contacts / self.__ticks if self.__ticks else 0.0
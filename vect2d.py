@@ -1,7 +1,14 @@
 from typing import Optional
 from math import (sqrt, tau, sin, cos, acos, atan2, degrees, radians,
                     isclose, trunc, ceil, floor)
-from random import uniform
+from random import uniform, getrandbits
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+_SCALAR_TYPES = (int, float) if np is None else (int, float, np.number)
+"""Les types de réels acceptés par les opérateurs de `Vect2D`; les autres opérandes leur font retourner `NotImplemented`"""
 
 
 
@@ -1345,8 +1352,10 @@ class Vect2D:
             True
             >>> round(degrees(v1.angle_between(v2)), 1)
             22.5
+            >>> Vect2D(0.1, 0.7).angle_between(Vect2D(0.1, 0.7) * 3)  # cosinus arrondi au-dessus de 1
+            0.0
         """
-        return acos(self.dot(other) / sqrt(self.length_squared * other.length_squared))
+        return acos(max(-1.0, min(1.0, self.dot(other) / sqrt(self.length_squared * other.length_squared))))
 
     def angle_between_degrees(self, other : 'Vect2D') -> float:
         """Retourne l'angle créé avec le vecteur passé en argument.
@@ -1539,7 +1548,12 @@ class Vect2D:
         >>> v2 == v3
         True
         """
-        return isclose(self.x, other.x) and isclose(self.y, other.y)
+        if other.__class__ is Vect2DArray:
+            return NotImplemented
+        try:
+            return isclose(self.x, other.x) and isclose(self.y, other.y)
+        except (AttributeError, TypeError):
+            return NotImplemented
     
     def __ne__(self, other : 'Vect2D') -> bool: # self != other
         """
@@ -1551,7 +1565,12 @@ class Vect2D:
         >>> v2 != v3
         False
         """
-        return not (isclose(self.x, other.x) and isclose(self.y, other.y))
+        if other.__class__ is Vect2DArray:
+            return NotImplemented
+        try:
+            return not (isclose(self.x, other.x) and isclose(self.y, other.y))
+        except (AttributeError, TypeError):
+            return NotImplemented
         
     def __neg__(self) -> 'Vect2D': # -self
         """
@@ -1568,7 +1587,12 @@ class Vect2D:
         >>> print(v1 + v2)
         (-1.00E+00, -5.00E-01)
         """
-        return Vect2D(self.x + other.x, self.y + other.y)
+        if other.__class__ is Vect2DArray:
+            return NotImplemented
+        try:
+            return Vect2D(self.x + other.x, self.y + other.y)
+        except (AttributeError, TypeError):
+            return NotImplemented
 
     def __iadd__(self, other : 'Vect2D') -> 'Vect2D': # self += other
         """
@@ -1577,8 +1601,14 @@ class Vect2D:
         >>> print(v1)
         (-1.00E+00, -5.00E-01)
         """
-        self.x += other.x
-        self.y += other.y
+        if other.__class__ is Vect2DArray:
+            return NotImplemented
+        try:
+            x, y = self.x + other.x, self.y + other.y
+        except (AttributeError, TypeError):
+            return NotImplemented
+        self.x = x
+        self.y = y
         return self
 
     def __sub__(self, other : 'Vect2D') -> 'Vect2D': # self - other
@@ -1588,7 +1618,12 @@ class Vect2D:
         >>> print(v1 - v2)
         (3.00E+00, -2.50E+00)
         """
-        return Vect2D(self.x - other.x, self.y - other.y)
+        if other.__class__ is Vect2DArray:
+            return NotImplemented
+        try:
+            return Vect2D(self.x - other.x, self.y - other.y)
+        except (AttributeError, TypeError):
+            return NotImplemented
 
     def __isub__(self, other : 'Vect2D') -> 'Vect2D': # self -= other
         """
@@ -1597,8 +1632,14 @@ class Vect2D:
         >>> print(v1)
         (3.00E+00, -2.50E+00)
         """
-        self.x -= other.x
-        self.y -= other.y
+        if other.__class__ is Vect2DArray:
+            return NotImplemented
+        try:
+            x, y = self.x - other.x, self.y - other.y
+        except (AttributeError, TypeError):
+            return NotImplemented
+        self.x = x
+        self.y = y
         return self
 
     def __mul__(self, other : float) -> 'Vect2D': # self * other
@@ -1607,6 +1648,8 @@ class Vect2D:
         >>> print(v1 * 5.0)
         (5.00E+00, -7.50E+00)
         """
+        if other.__class__ is not float and not isinstance(other, _SCALAR_TYPES):
+            return NotImplemented
         return Vect2D(self.x * other, self.y * other)
 
     def __rmul__(self, other : float) -> 'Vect2D': # other * self
@@ -1615,6 +1658,8 @@ class Vect2D:
         >>> print(5.0 * v1)
         (5.00E+00, -7.50E+00)
         """
+        if other.__class__ is not float and not isinstance(other, _SCALAR_TYPES):
+            return NotImplemented
         return Vect2D(self.x * other, self.y * other)
 
     def __imul__(self, other : float) -> 'Vect2D': # self *= other
@@ -1624,6 +1669,8 @@ class Vect2D:
         >>> print(v1)
         (5.00E+00, -7.50E+00)
         """
+        if other.__class__ is not float and not isinstance(other, _SCALAR_TYPES):
+            return NotImplemented
         self.x *= other
         self.y *= other
         return self
@@ -1634,6 +1681,8 @@ class Vect2D:
         >>> print(v1 / 2.0)
         (5.00E-01, -7.50E-01)
         """
+        if other.__class__ is not float and not isinstance(other, _SCALAR_TYPES):
+            return NotImplemented
         return Vect2D(self.x / other, self.y / other)
 
     def __rtruediv__(self, other: float) -> 'Vect2D': # other / self
@@ -1642,6 +1691,8 @@ class Vect2D:
         >>> print(2.0 / v1)
         (2.00E+00, -1.33E+00)
         """
+        if other.__class__ is not float and not isinstance(other, _SCALAR_TYPES):
+            return NotImplemented
         return Vect2D(other / self.x, other / self.y)
 
     def __itruediv__(self, other : float) -> 'Vect2D': # self /= other
@@ -1651,6 +1702,8 @@ class Vect2D:
         >>> print(v1)
         (5.00E-01, -7.50E-01)
         """
+        if other.__class__ is not float and not isinstance(other, _SCALAR_TYPES):
+            return NotImplemented
         self.x /= other
         self.y /= other
         return self
@@ -1848,6 +1901,750 @@ Vect2D.UNDEFINED = Vect2D()
 
 
 
+class Vect2DView(Vect2D):
+    """La classe Vect2DView est un `Vect2D` dont les coordonnées sont stockées
+    dans une ligne d'un tableau `numpy` de forme (N, 2), contigu et de type
+    `float64`.
+
+    La vue ne copie rien : lire `x` ou `y` lit le tableau et les modifier
+    écrit dans le tableau. Toutes les fonctionnalités de `Vect2D` restent
+    disponibles. Les opérations qui créent un nouveau vecteur (`v1 + v2`,
+    `copy`, `normalized`, ...) retournent un `Vect2D` détaché du tableau.
+
+    Args:
+        array (numpy.ndarray): Le tableau de forme (N, 2).
+        row (int): L'index de la ligne représentée par la vue.
+
+    Exemples:
+        >>> import numpy
+        >>> positions = numpy.zeros((3, 2))
+        >>> v1 = Vect2DView(positions, 1)
+        >>> v1.set(2.0, -1.5)
+        >>> positions[1].tolist()
+        [2.0, -1.5]
+        >>> positions[1, 0] = 5.0
+        >>> print(v1)
+        (5.00E+00, -1.50E+00)
+        >>> print(v1 + Vect2D(1.0, 1.0))
+        (6.00E+00, -5.00E-01)
+    """
+
+    __slots__ = ('__array', '__buffer', '__row')
+
+    def __init__(self, array, row : int) -> None:
+        self.__array = array
+        # the memoryview reads and writes Python floats faster than numpy indexing
+        self.__buffer = memoryview(array)
+        self.__row = row
+
+    @property
+    def x(self) -> float:
+        return self.__buffer[self.__row, 0]
+
+    @x.setter
+    def x(self, value : float) -> None:
+        self.__buffer[self.__row, 0] = value
+
+    @property
+    def y(self) -> float:
+        return self.__buffer[self.__row, 1]
+
+    @y.setter
+    def y(self, value : float) -> None:
+        self.__buffer[self.__row, 1] = value
+
+    @property
+    def array(self):
+        """`Read only`
+
+        Le tableau dans lequel la vue lit et écrit ses coordonnées.
+        """
+        return self.__array
+
+    @property
+    def row(self) -> int:
+        """`Read only`
+
+        L'index de la ligne représentée par la vue.
+        """
+        return self.__row
+
+
+
+class Vect2DArray:
+    """La classe Vect2DArray est le pendant vectorisé de `Vect2D` : elle
+    encapsule N vecteurs dans un tableau `numpy` de forme (N, 2), contigu et
+    de type `float64`.
+
+    Les méthodes et propriétés portent les mêmes noms que celles de `Vect2D`
+    et s'appliquent à chaque ligne d'un coup :
+
+    - ce qui retourne un `float` pour un `Vect2D` (`length`, `dot`,
+      `angle_between`, ...) retourne un tableau `numpy` de N réels
+    - ce qui retourne un `bool` (`is_defined`, `is_normalized`,
+      `is_parallel_to`, ...) retourne un tableau `numpy` de N booléens
+    - ce qui retourne un `Vect2D` (`normalized`, `vector_projection`, `v1 + v2`,
+      ...) retourne un nouveau `Vect2DArray`
+    - ce qui modifie le `Vect2D` (`normalize`, `limit_length`, `v1 += v2`, ...)
+      modifie toutes les lignes
+
+    L'autre opérande peut être un `Vect2DArray` de même longueur, un tableau
+    de forme (N, 2) ou un seul `Vect2D`, appliqué à toutes les lignes. Les
+    scalaires (`limit_length`, `v * s`, ...) peuvent être un réel ou un
+    tableau de N réels, un par ligne. Les opérateurs de `Vect2D` laissent la
+    main à ceux de `Vect2DArray` : `v + a`, `v - a` et `v == a` marchent comme
+    `a + v`, `-(a - v)` et `a == v`. Comme pour un `Vect2D`, multiplier ou
+    diviser par un vecteur lève `TypeError`.
+
+    Indexer avec un entier retourne un `Vect2DView` de la ligne, qui lit et
+    écrit dans le tableau; indexer avec une tranche, un masque ou une liste
+    d'index retourne un `Vect2DArray` (une vue pour une tranche, une copie
+    sinon, comme `numpy`). Itérer retourne les vues de chaque ligne.
+
+    Il existe plusieurs façons de **créer** un `Vect2DArray` :
+
+    - `Vect2DArray(array)` : sans copie si le tableau est déjà (N, 2), contigu et `float64`
+    - `Vect2DArray.zeros`
+    - `Vect2DArray.from_vect2ds`
+    - `Vect2DArray.from_polar`
+    - `Vect2DArray.from_polar_degrees`
+    - `Vect2DArray.from_random_normalized`
+    - `Vect2DArray.from_random_cartesian`
+    - `Vect2DArray.from_random_polar`
+    - `Vect2DArray.from_random_polar_degrees`
+
+    Les tirages aléatoires sont faits par `numpy`, à partir d'une graine tirée
+    du module `random` : `random.seed` les rend reproductibles, comme ceux de
+    `Vect2D`.
+
+    Args:
+        array (numpy.ndarray | list): Les coordonnées, de forme (N, 2); toute autre forme lève `ValueError`.
+
+    Exemples:
+        >>> positions = Vect2DArray([[0.0, 0.0], [3.0, 4.0], [-6.0, 8.0]])
+        >>> len(positions)
+        3
+        >>> positions.length.tolist()
+        [0.0, 5.0, 10.0]
+        >>> print(positions[1])
+        (3.00E+00, 4.00E+00)
+        >>> positions[1].x = 6.0
+        >>> positions.x.tolist()
+        [0.0, 6.0, -6.0]
+        >>> speeds = Vect2DArray([[10.0, 0.0], [0.0, 2.0], [0.0, -30.0]])
+        >>> speeds.limit_length(5.0)
+        >>> print(speeds)
+        [(5.00E+00, 0.00E+00), (0.00E+00, 2.00E+00), (0.00E+00, -5.00E+00)]
+        >>> print(positions + Vect2D(1.0, 1.0))
+        [(1.00E+00, 1.00E+00), (7.00E+00, 5.00E+00), (-5.00E+00, 9.00E+00)]
+        >>> [round(degrees(angle)) for angle in speeds.angle_between(Vect2D(0.0, 1.0))]
+        [90, 0, 180]
+        >>> print(Vect2D(1.0, 1.0) - positions)
+        [(1.00E+00, 1.00E+00), (-5.00E+00, -3.00E+00), (7.00E+00, -7.00E+00)]
+        >>> (Vect2D(6.0, 4.0) == positions).tolist()
+        [False, True, False]
+        >>> speeds * Vect2D(2.0, 3.0)
+        Traceback (most recent call last):
+        ...
+        TypeError: unsupported operand type(s) for *: 'Vect2DArray' and 'Vect2D'
+        >>> Vect2DArray([1.0, 2.0, 3.0, 4.0])
+        Traceback (most recent call last):
+        ...
+        ValueError: expected an array of shape (N, 2), got (4,)
+    """
+
+    __slots__ = ('__array',)
+    __array_ufunc__ = None  # numpy laisse la main aux opérateurs de la classe : tableau * Vect2DArray appelle __rmul__
+    __hash__ = None
+
+    def __init__(self, array) -> None:
+        if np is None:
+            raise ImportError('Vect2DArray requires numpy')
+        array = np.ascontiguousarray(array, dtype=float)
+        if array.ndim != 2 or array.shape[1] != 2:
+            raise ValueError('expected an array of shape (N, 2), got {}'.format(array.shape))
+        self.__array = array
+
+    @classmethod
+    def zeros(cls, count : int) -> 'Vect2DArray':
+        """Crée `count` vecteurs indéfinis (0.0, 0.0).
+
+        Exemples:
+            >>> print(Vect2DArray.zeros(2))
+            [(0.00E+00, 0.00E+00), (0.00E+00, 0.00E+00)]
+        """
+        return cls(np.zeros((count, 2)))
+
+    @classmethod
+    def from_vect2ds(cls, vectors : list) -> 'Vect2DArray':
+        """Crée un `Vect2DArray` à partir d'une liste de `Vect2D`, copiés dans l'ordre.
+
+        Exemples:
+            >>> print(Vect2DArray.from_vect2ds([Vect2D(1.0, 2.0), Vect2D(3.0, 4.0)]))
+            [(1.00E+00, 2.00E+00), (3.00E+00, 4.00E+00)]
+        """
+        return cls(np.array([(vector.x, vector.y) for vector in vectors], dtype=float).reshape(-1, 2))
+
+    @classmethod
+    def from_polar(cls, length, orientation) -> 'Vect2DArray':
+        """Crée un vecteur par paire longueur et orientation (en radians), réels ou tableaux de N réels.
+
+        Exemples:
+            >>> from math import pi
+            >>> print(round(Vect2DArray.from_polar([1.0, 2.0], [0.0, pi / 2.0])))
+            [(1.00E+00, 0.00E+00), (0.00E+00, 2.00E+00)]
+        """
+        length, orientation = np.broadcast_arrays(np.atleast_1d(np.asarray(length, dtype=float)), np.atleast_1d(np.asarray(orientation, dtype=float)))
+        return cls(np.stack((np.cos(orientation) * length, np.sin(orientation) * length), axis=-1))
+
+    @classmethod
+    def from_polar_degrees(cls, length, orientation) -> 'Vect2DArray':
+        """Crée un vecteur par paire longueur et orientation (en degrées), réels ou tableaux de N réels."""
+        return cls.from_polar(length, np.radians(orientation))
+
+    def set_polar(self, length, orientation) -> None:
+        """Détermine tous les vecteurs par leurs longueurs et leurs orientations en radians."""
+        self.__array[:] = Vect2DArray.from_polar(length, orientation).array
+
+    @staticmethod
+    def __uniform(low, high, count : int):
+        return np.random.default_rng(getrandbits(64)).uniform(low, high, count)
+
+    @classmethod
+    def from_random_normalized(cls, count : int) -> 'Vect2DArray':
+        """Crée `count` vecteurs unitaires aléatoires.
+
+        Exemples:
+            >>> bool(Vect2DArray.from_random_normalized(4).is_normalized.all())
+            True
+        """
+        return cls.from_polar(1.0, cls.__uniform(0., tau, count))
+
+    @classmethod
+    def from_random_cartesian(cls, count : int, x_min : float, x_max : float, y_min : float, y_max : float) -> 'Vect2DArray':
+        """Crée `count` vecteurs aléatoires dans le système de coordonnées cartésiennes.
+
+        Exemples:
+            >>> random_positions = Vect2DArray.from_random_cartesian(100, 0., 10., -5., 0.)
+            >>> bool((random_positions.x >= 0.).all() and (random_positions.y <= 0.).all())
+            True
+        """
+        return cls(np.stack((cls.__uniform(x_min, x_max, count), cls.__uniform(y_min, y_max, count)), axis=-1))
+
+    @classmethod
+    def from_random_polar(cls, count : int, length_min : float, length_max : float, orientation_half_span : float = tau, orientation_reference : float = 0.) -> 'Vect2DArray':
+        """Crée `count` vecteurs aléatoires dans le système de coordonnées polaires, l'orientation en radians.
+
+        Exemples:
+            >>> import random
+            >>> random.seed(1)
+            >>> first = Vect2DArray.from_random_polar(3, 1., 2.)
+            >>> random.seed(1)
+            >>> bool((Vect2DArray.from_random_polar(3, 1., 2.) == first).all())
+            True
+            >>> bool(((first.length >= 1.) & (first.length <= 2.)).all())
+            True
+        """
+        return cls.from_polar(cls.__uniform(length_min, length_max, count), cls.__uniform(-orientation_half_span, orientation_half_span, count) + orientation_reference)
+
+    @classmethod
+    def from_random_polar_degrees(cls, count : int, length_min : float, length_max : float, orientation_half_span : float = 360., orientation_reference : float = 0.) -> 'Vect2DArray':
+        """Crée `count` vecteurs aléatoires dans le système de coordonnées polaires, l'orientation en degrées."""
+        return cls.from_random_polar(count, length_min, length_max, radians(orientation_half_span), radians(orientation_reference))
+
+    def randomize_normalized(self) -> None:
+        """Remplace chaque vecteur par un vecteur unitaire aléatoire."""
+        self.__array[:] = Vect2DArray.from_random_normalized(len(self)).array
+
+    def randomize_cartesian(self, x_min : float, x_max : float, y_min : float, y_max : float) -> None:
+        """Remplace chaque vecteur par un vecteur aléatoire dans le système de coordonnées cartésiennes."""
+        self.__array[:] = Vect2DArray.from_random_cartesian(len(self), x_min, x_max, y_min, y_max).array
+
+    def randomize_polar(self, length_min : float, length_max : float, orientation_half_span : float = tau, orientation_reference : float = 0.) -> None:
+        """Remplace chaque vecteur par un vecteur aléatoire dans le système de coordonnées polaires, en radians."""
+        self.__array[:] = Vect2DArray.from_random_polar(len(self), length_min, length_max, orientation_half_span, orientation_reference).array
+
+    def randomize_polar_degrees(self, length_min : float, length_max : float, orientation_half_span : float = 360., orientation_reference : float = 0.) -> None:
+        """Remplace chaque vecteur par un vecteur aléatoire dans le système de coordonnées polaires, en degrées."""
+        self.randomize_polar(length_min, length_max, radians(orientation_half_span), radians(orientation_reference))
+
+    @staticmethod
+    def __operand(other):
+        """Retourne les coordonnées de l'autre opérande : (N, 2) pour un Vect2DArray ou un tableau, (2,) pour un Vect2D"""
+        if isinstance(other, Vect2DArray):
+            return other.array
+        if isinstance(other, Vect2D):
+            return np.array((other.x, other.y))
+        return np.asarray(other, dtype=float)
+
+    @staticmethod
+    def __length_squared(coordinates):
+        """Retourne les longueurs au carré de coordonnées retournées par __operand"""
+        return coordinates[..., 0] ** 2 + coordinates[..., 1] ** 2
+
+    @staticmethod
+    def __scalars(values):
+        """Retourne un réel, ou une colonne (N, 1) pour un tableau de N réels"""
+        values = np.asarray(values, dtype=float)
+        return values[:, None] if values.ndim == 1 else values
+
+    @property
+    def array(self):
+        """`Read only`
+
+        Le tableau (N, 2) des coordonnées, partagé avec les vues retournées par l'indexation.
+        """
+        return self.__array
+
+    @property
+    def x(self):
+        """`Read & Write`
+
+        Les abscisses, une vue de la première colonne du tableau.
+        """
+        return self.__array[:, 0]
+
+    @x.setter
+    def x(self, value) -> None:
+        self.__array[:, 0] = value
+
+    @property
+    def y(self):
+        """`Read & Write`
+
+        Les ordonnées, une vue de la deuxième colonne du tableau.
+        """
+        return self.__array[:, 1]
+
+    @y.setter
+    def y(self, value) -> None:
+        self.__array[:, 1] = value
+
+    def __len__(self) -> int:
+        return len(self.__array)
+
+    def __getitem__(self, key):
+        if isinstance(key, (int, np.integer)):
+            return Vect2DView(self.__array, range(len(self.__array))[key])
+        return Vect2DArray(self.__array[key])
+
+    def __setitem__(self, key, value) -> None:
+        self.__array[key] = Vect2DArray.__operand(value)
+
+    def __iter__(self):
+        return (Vect2DView(self.__array, row) for row in range(len(self.__array)))
+
+    def __repr__(self) -> str:
+        """
+        >>> print(repr(Vect2DArray([[2.0, -2.0]])))
+        vect2d.Vect2DArray([[2.0, -2.0]])
+        """
+        return f'vect2d.Vect2DArray({self.__array.tolist()})'
+
+    def __str__(self) -> str:
+        return '[' + ', '.join(str(vector) for vector in self) + ']'
+
+    def copy(self) -> 'Vect2DArray':
+        """Retourne une copie des vecteurs, détachée du tableau courant."""
+        return Vect2DArray(self.__array.copy())
+
+    def copy_from(self, other) -> None:
+        """Copie les coordonnées d'un `Vect2DArray`, d'un tableau (N, 2) ou d'un `Vect2D` dans toutes les lignes."""
+        self.__array[:] = Vect2DArray.__operand(other)
+
+    def copy_to(self, other : 'Vect2DArray') -> None:
+        """Copie les coordonnées courantes vers un autre `Vect2DArray` de même longueur."""
+        other.array[:] = self.__array
+
+    def set(self, x, y) -> None:
+        """Détermine les abscisses et les ordonnées, réels ou tableaux de N réels."""
+        self.__array[:, 0] = x
+        self.__array[:, 1] = y
+
+    def reset(self) -> None:
+        """Réinitialise tous les vecteurs à (0.0, 0.0)."""
+        self.__array[:] = 0.
+
+    @property
+    def is_defined(self):
+        """`Read only`
+
+        Pour chaque vecteur, `True` s'il n'est pas de longueur 0.
+        """
+        return ~(np.isclose(self.__array[:, 0], 0.) & np.isclose(self.__array[:, 1], 0.))
+
+    def clamp_x(self, x_min, x_max) -> None:
+        """Borne les abscisses entre deux limites."""
+        np.clip(self.__array[:, 0], x_min, x_max, out=self.__array[:, 0])
+
+    def clamp_y(self, y_min, y_max) -> None:
+        """Borne les ordonnées entre deux limites."""
+        np.clip(self.__array[:, 1], y_min, y_max, out=self.__array[:, 1])
+
+    @property
+    def manhattan_length(self):
+        """`Read only`
+
+        Les distances de Manhattan : | x | + | y |.
+        """
+        return np.abs(self.__array).sum(axis=1)
+
+    @property
+    def chebyshev_length(self):
+        """`Read only`
+
+        Les distances de Chebyshev : la plus grande de | x | et | y |.
+        """
+        return np.abs(self.__array).max(axis=1)
+
+    def minkowski_length(self, order : float = 2.):
+        """Retourne les distances de Minkowski pour le coefficient de puissance `order`."""
+        return (np.abs(self.__array) ** order).sum(axis=1) ** (1. / order)
+
+    @property
+    def right_perpendicular(self) -> 'Vect2DArray':
+        """`Read only`
+
+        Les vecteurs tournés de 90° vers la droite.
+        """
+        return Vect2DArray(np.stack((self.__array[:, 1], -self.__array[:, 0]), axis=-1))
+
+    @property
+    def left_perpendicular(self) -> 'Vect2DArray':
+        """`Read only`
+
+        Les vecteurs tournés de 90° vers la gauche.
+        """
+        return Vect2DArray(np.stack((-self.__array[:, 1], self.__array[:, 0]), axis=-1))
+
+    @property
+    def flipped(self) -> 'Vect2DArray':
+        """`Read only`
+
+        Les vecteurs aux coordonnées permutées.
+        """
+        return Vect2DArray(self.__array[:, ::-1])
+
+    def flip(self) -> None:
+        """Permute les valeurs x et y de chaque vecteur."""
+        self.__array[:] = self.__array[:, ::-1].copy()
+
+    @property
+    def length_squared(self):
+        """`Read & Write`
+
+        Les longueurs des vecteurs au carré.
+        """
+        return np.einsum('ij,ij->i', self.__array, self.__array)
+
+    @length_squared.setter
+    def length_squared(self, value) -> None:
+        self.length = np.sqrt(value)
+
+    @property
+    def length(self):
+        """`Read & Write`
+
+        Les longueurs des vecteurs. Modifier la longueur garde l'orientation.
+        """
+        return np.sqrt(self.length_squared)
+
+    @length.setter
+    def length(self, value) -> None:
+        self.set_polar(value, self.orientation)
+
+    @property
+    def orientation(self):
+        """`Read & Write`
+
+        Les orientations des vecteurs, en radians. Modifier l'orientation garde la longueur.
+        """
+        return np.arctan2(self.__array[:, 1], self.__array[:, 0])
+
+    @orientation.setter
+    def orientation(self, value) -> None:
+        self.set_polar(self.length, value)
+
+    @property
+    def orientation_degrees(self):
+        """`Read & Write`
+
+        Les orientations des vecteurs, en degrées.
+        """
+        return np.degrees(self.orientation)
+
+    @orientation_degrees.setter
+    def orientation_degrees(self, value) -> None:
+        self.set_polar(self.length, np.radians(value))
+
+    def __set_lengths(self, lengths, rows) -> None:
+        """Donne aux lignes sélectionnées par le masque `rows` les longueurs `lengths` (une par ligne), en gardant leur orientation"""
+        if rows.any():
+            lengths = lengths[rows]
+            current = np.sqrt(self.length_squared[rows])
+            defined = current > 0.
+            vectors = self.__array[rows] * np.where(defined, lengths / np.where(defined, current, 1.), 0.)[:, None]
+            vectors[:, 0] += np.where(defined, 0., lengths)
+            self.__array[rows] = vectors
+
+    def limit_length_squared(self, max_length_squared) -> None:
+        """Limite la longueur au carré de chaque vecteur; les vecteurs plus courts restent inchangés."""
+        self.limit_length(np.sqrt(max_length_squared))
+
+    def limit_length(self, max_length) -> None:
+        """Limite la longueur de chaque vecteur; les vecteurs plus courts restent inchangés.
+
+        Exemples:
+            >>> speeds = Vect2DArray([[3.0, 4.0], [0.3, 0.4]])
+            >>> speeds.limit_length([1.0, 1.0])
+            >>> speeds.length.round(6).tolist()
+            [1.0, 0.5]
+        """
+        max_length = np.broadcast_to(np.asarray(max_length, dtype=float), (len(self),))
+        self.__set_lengths(max_length, self.length_squared > max_length * max_length)
+
+    def clamp_length_squared(self, min_length_squared, max_length_squared) -> None:
+        """Borne la longueur au carré de chaque vecteur."""
+        self.clamp_length(np.sqrt(min_length_squared), np.sqrt(max_length_squared))
+
+    def clamp_length(self, min_length, max_length) -> None:
+        """Borne la longueur de chaque vecteur. Un vecteur indéfini trop court prend l'orientation 0.
+
+        Exemples:
+            >>> speeds = Vect2DArray([[5.0, 0.0], [0.0, 1.0], [0.0, 3.5]])
+            >>> speeds.clamp_length(3.0, 4.0)
+            >>> print(speeds)
+            [(4.00E+00, 0.00E+00), (0.00E+00, 3.00E+00), (0.00E+00, 3.50E+00)]
+        """
+        lengths_squared = self.length_squared
+        min_length = np.broadcast_to(np.asarray(min_length, dtype=float), (len(self),))
+        max_length = np.broadcast_to(np.asarray(max_length, dtype=float), (len(self),))
+        too_short = lengths_squared < min_length * min_length
+        self.__set_lengths(min_length, too_short)
+        self.__set_lengths(max_length, ~too_short & (lengths_squared > max_length * max_length))
+
+    @property
+    def is_normalized(self):
+        """`Read only`
+
+        Pour chaque vecteur, `True` s'il est unitaire.
+        """
+        return np.isclose(self.length_squared, 1.0)
+
+    @property
+    def normalized(self) -> 'Vect2DArray':
+        """`Read only`
+
+        Retourne un nouveau `Vect2DArray` des vecteurs unitaires. Tous les vecteurs doivent être définis.
+        """
+        vectors = self.copy()
+        vectors.normalize()
+        return vectors
+
+    def normalize(self) -> None:
+        """Rend chaque vecteur unitaire en gardant son orientation. Tous les vecteurs doivent être définis.
+
+        Exemples:
+            >>> directions = Vect2DArray([[2.0, 0.0], [0.0, -0.5]])
+            >>> directions.normalize()
+            >>> print(directions)
+            [(1.00E+00, 0.00E+00), (0.00E+00, -1.00E+00)]
+            >>> Vect2DArray([[1.0, 0.0], [0.0, 0.0]]).normalize()
+            Traceback (most recent call last):
+            ...
+            RuntimeError: cannot normalize a non defined vector
+        """
+        if not self.is_defined.all():
+            raise RuntimeError('cannot normalize a non defined vector')
+        self.__array /= self.length[:, None]
+
+    def distance_squared_from(self, other):
+        """Retourne les distances au carré entre chaque vecteur et l'autre opérande."""
+        delta = self.__array - Vect2DArray.__operand(other)
+        return np.einsum('ij,ij->i', delta, delta)
+
+    def distance_from(self, other):
+        """Retourne les distances entre chaque vecteur et l'autre opérande.
+
+        Exemples:
+            >>> Vect2DArray([[8.0, -2.0], [12.0, -5.0]]).distance_from(Vect2D(12.0, -5.0)).tolist()
+            [5.0, 0.0]
+        """
+        return np.sqrt(self.distance_squared_from(other))
+
+    def is_perpendicular_to(self, other):
+        """Pour chaque vecteur, `True` s'il est perpendiculaire à l'autre opérande."""
+        return np.isclose(self.dot(other), 0.0)
+
+    def is_parallel_to(self, other):
+        """Pour chaque vecteur, `True` s'il est parallèle à l'autre opérande."""
+        return np.isclose(self.cross(other), 0.0)
+
+    def is_forming_accute_angle_with(self, other):
+        """Pour chaque vecteur, `True` s'il forme un angle aigu avec l'autre opérande."""
+        return self.dot(other) > 0.0
+
+    def is_forming_obtuse_angle_with(self, other):
+        """Pour chaque vecteur, `True` s'il forme un angle obtus avec l'autre opérande."""
+        return self.dot(other) < 0.0
+
+    def dot(self, other):
+        """Retourne les produits scalaires de chaque vecteur avec l'autre opérande.
+
+        Exemples:
+            >>> Vect2DArray([[2.0, -5.0], [1.0, 1.0]]).dot(Vect2D(-3.0, 2.0)).tolist()
+            [-16.0, -1.0]
+        """
+        other = Vect2DArray.__operand(other)
+        return self.__array[:, 0] * other[..., 0] + self.__array[:, 1] * other[..., 1]
+
+    def cross(self, other):
+        """Retourne les produits vectoriels de chaque vecteur avec l'autre opérande."""
+        other = Vect2DArray.__operand(other)
+        return self.__array[:, 0] * other[..., 1] - self.__array[:, 1] * other[..., 0]
+
+    def angle_between(self, other):
+        """Retourne les angles, en radians et sans direction, entre chaque vecteur et l'autre opérande."""
+        other = Vect2DArray.__operand(other)
+        return np.arccos(np.clip(self.dot(other) / np.sqrt(self.length_squared * Vect2DArray.__length_squared(other)), -1.0, 1.0))
+
+    def angle_between_degrees(self, other):
+        """Retourne les angles, en degrées et sans direction, entre chaque vecteur et l'autre opérande."""
+        return np.degrees(self.angle_between(other))
+
+    def angle_disparity(self, other):
+        """Retourne les angles, en radians et avec direction, de chaque vecteur vers l'autre opérande.
+
+        Exemples:
+            >>> Vect2DArray([[1.0, 0.0], [0.0, 1.0]]).angle_disparity_degrees(Vect2D(1.0, 1.0)).round(6).tolist()
+            [45.0, -45.0]
+        """
+        return np.arctan2(self.cross(other), self.dot(other))
+
+    def angle_disparity_degrees(self, other):
+        """Retourne les angles, en degrées et avec direction, de chaque vecteur vers l'autre opérande."""
+        return np.degrees(self.angle_disparity(other))
+
+    def scalar_projection(self, other):
+        """Retourne les projections scalaires de chaque vecteur sur l'autre opérande."""
+        other = Vect2DArray.__operand(other)
+        return self.dot(other) / np.sqrt(Vect2DArray.__length_squared(other))
+
+    def vector_projection(self, other) -> 'Vect2DArray':
+        """Retourne les projections vectorielles de chaque vecteur sur l'autre opérande."""
+        other = Vect2DArray.__operand(other)
+        return Vect2DArray((self.dot(other) / Vect2DArray.__length_squared(other))[:, None] * other)
+
+    def scalar_rejection(self, other):
+        """Retourne les réjections scalaires de chaque vecteur sur l'autre opérande."""
+        other = Vect2DArray.__operand(other)
+        return (self.__array[:, 1] * other[..., 0] - self.__array[:, 0] * other[..., 1]) / np.sqrt(Vect2DArray.__length_squared(other))
+
+    def vector_rejection(self, other) -> 'Vect2DArray':
+        """Retourne les réjections vectorielles de chaque vecteur sur l'autre opérande."""
+        return self - self.vector_projection(other)
+
+    def projection_analysis(self, other) -> tuple:
+        """Retourne, comme `Vect2D.projection_analysis`, les projections et les réjections scalaires et vectorielles.
+
+        Exemples:
+            >>> analysis = Vect2DArray([[3.0, 1.0], [2.0, -4.0]]).projection_analysis(Vect2D(5.0, 0.0))
+            >>> print(analysis[0].tolist(), analysis[1])
+            [3.0, 2.0] [(3.00E+00, 0.00E+00), (2.00E+00, 0.00E+00)]
+            >>> print(analysis[2].tolist(), analysis[3])
+            [1.0, -4.0] [(0.00E+00, 1.00E+00), (0.00E+00, -4.00E+00)]
+        """
+        scalar_proj = self.scalar_projection(other)
+        vector_proj = self.vector_projection(other)
+        scalar_rej = self.scalar_rejection(other)
+        vector_rej = self - vector_proj
+        return (scalar_proj, vector_proj, scalar_rej, vector_rej)
+
+    def __eq__(self, other):
+        """Pour chaque vecteur, `True` si ses coordonnées sont proches de celles de l'autre opérande."""
+        return np.isclose(self.__array, Vect2DArray.__operand(other)).all(axis=-1)
+
+    def __ne__(self, other):
+        return ~self.__eq__(other)
+
+    def __neg__(self) -> 'Vect2DArray':
+        return Vect2DArray(-self.__array)
+
+    def __add__(self, other) -> 'Vect2DArray':
+        return Vect2DArray(self.__array + Vect2DArray.__operand(other))
+
+    __radd__ = __add__
+
+    def __iadd__(self, other) -> 'Vect2DArray':
+        self.__array += Vect2DArray.__operand(other)
+        return self
+
+    def __sub__(self, other) -> 'Vect2DArray':
+        return Vect2DArray(self.__array - Vect2DArray.__operand(other))
+
+    def __rsub__(self, other) -> 'Vect2DArray':
+        return Vect2DArray(Vect2DArray.__operand(other) - self.__array)
+
+    def __isub__(self, other) -> 'Vect2DArray':
+        self.__array -= Vect2DArray.__operand(other)
+        return self
+
+    def __mul__(self, other) -> 'Vect2DArray':
+        if isinstance(other, (Vect2D, Vect2DArray)):
+            return NotImplemented
+        return Vect2DArray(self.__array * Vect2DArray.__scalars(other))
+
+    __rmul__ = __mul__
+
+    def __imul__(self, other) -> 'Vect2DArray':
+        if isinstance(other, (Vect2D, Vect2DArray)):
+            return NotImplemented
+        self.__array *= Vect2DArray.__scalars(other)
+        return self
+
+    def __truediv__(self, other) -> 'Vect2DArray':
+        if isinstance(other, (Vect2D, Vect2DArray)):
+            return NotImplemented
+        return Vect2DArray(self.__array / Vect2DArray.__scalars(other))
+
+    def __rtruediv__(self, other) -> 'Vect2DArray':
+        if isinstance(other, (Vect2D, Vect2DArray)):
+            return NotImplemented
+        return Vect2DArray(Vect2DArray.__scalars(other) / self.__array)
+
+    def __itruediv__(self, other) -> 'Vect2DArray':
+        if isinstance(other, (Vect2D, Vect2DArray)):
+            return NotImplemented
+        self.__array /= Vect2DArray.__scalars(other)
+        return self
+
+    def __abs__(self) -> 'Vect2DArray':
+        return Vect2DArray(np.abs(self.__array))
+
+    def __round__(self, ndigits=None) -> 'Vect2DArray':
+        return Vect2DArray(np.round(self.__array, ndigits or 0))
+
+    def __trunc__(self) -> 'Vect2DArray':
+        return Vect2DArray(np.trunc(self.__array))
+
+    def __floor__(self) -> 'Vect2DArray':
+        return Vect2DArray(np.floor(self.__array))
+
+    def __ceil__(self) -> 'Vect2DArray':
+        return Vect2DArray(np.ceil(self.__array))
+
+    @property
+    def as_list(self) -> list:
+        """Crée et retourne une liste de listes de deux réels, une par vecteur."""
+        return self.__array.tolist()
+
+    @property
+    def as_tuple(self) -> tuple:
+        """Crée et retourne un tuple de tuples de deux réels, un par vecteur."""
+        return tuple(map(tuple, self.__array.tolist()))
+
+
+
 def __main_doctest():
     if bool(__debug__): # do not work
         import doctest